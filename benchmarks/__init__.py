@@ -0,0 +1,9 @@
+"""
+The performance benchmarks of chemml, in the asv (airspeed velocity) format. The benchmarks use the bundled datasets
+at several scales and report the run time (time_*), the peak memory (peakmem_*) and the throughput (track_*, samples
+per second) of the featurizers, including their scaling with n_jobs.
+
+    asv run                     # benchmark the current commit (see asv.conf.json)
+    asv continuous master HEAD  # compare two commits
+    python -m benchmarks.run    # without asv: writes benchmark_results.json
+"""
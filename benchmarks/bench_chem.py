@@ -0,0 +1,79 @@
+"""
+benchmarks of the molecular featurizers of chemml.chem.
+"""
+import os
+
+from .common import _Benchmark, xyz_molecules, smiles_molecules
+
+# tensorflow is imported by chemml.chem.local_features
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+
+class CoulombMatrix(_Benchmark):
+    unit = "molecules/s"
+    params = ([50, 500], ['SC', 'E', 'RC'], [1, 4])
+    param_names = ['n_molecules', 'cm_type', 'n_jobs']
+
+    def setup(self, n, cm_type, n_jobs):
+        self.molecules = xyz_molecules(n)
+
+    def run(self, n, cm_type, n_jobs):
+        from chemml.chem import CoulombMatrix
+        CoulombMatrix(cm_type=cm_type, n_jobs=n_jobs, verbose=False).represent(self.molecules)
+
+
+class PackedCoulombMatrix(_Benchmark):
+    """
+    the coulomb matrix of the packed geometries (chemml.initialization.PackedGeometries), without openbabel.
+    """
+    unit = "molecules/s"
+    params = ([50, 500], [1, 4])
+    param_names = ['n_molecules', 'n_jobs']
+
+    def setup(self, n, n_jobs):
+        from chemml.datasets import load_xyz_polarizability
+        packed = load_xyz_polarizability(packed=True)[0]
+        self.packed = packed[[i % len(packed) for i in range(n)]]
+
+    def run(self, n, n_jobs):
+        from chemml.chem import CoulombMatrix
+        CoulombMatrix(n_jobs=n_jobs, verbose=False).represent(self.packed)
+
+
+class BagofBonds(_Benchmark):
+    unit = "molecules/s"
+    params = ([50, 500], [1, 4])
+    param_names = ['n_molecules', 'n_jobs']
+
+    def setup(self, n, n_jobs):
+        self.molecules = xyz_molecules(n)
+
+    def run(self, n, n_jobs):
+        from chemml.chem import BagofBonds
+        BagofBonds(n_jobs=n_jobs, verbose=False).represent(self.molecules)
+
+
+class RDKitFingerprint(_Benchmark):
+    unit = "molecules/s"
+    params = ([500, 5000], ['Morgan', 'MACCS'])
+    param_names = ['n_molecules', 'fingerprint_type']
+
+    def setup(self, n, fingerprint_type):
+        self.molecules = smiles_molecules(n)
+
+    def run(self, n, fingerprint_type):
+        from chemml.chem import RDKitFingerprint
+        RDKitFingerprint(fingerprint_type=fingerprint_type).represent(self.molecules)
+
+
+class TensoriseMolecules(_Benchmark):
+    unit = "molecules/s"
+    params = ([500, 5000], [1, 4])
+    param_names = ['n_molecules', 'n_jobs']
+
+    def setup(self, n, n_jobs):
+        self.molecules = smiles_molecules(n)
+
+    def run(self, n, n_jobs):
+        from chemml.chem import tensorise_molecules
+        tensorise_molecules(self.molecules, n_jobs=n_jobs, batch_size=500, verbose=False)
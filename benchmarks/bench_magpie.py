@@ -0,0 +1,33 @@
+"""
+benchmarks of the magpie attribute generators and of the Voronoi tessellation (chemml.chem.magpie_python).
+"""
+from .common import _Benchmark, composition_entries, crystal_structures
+
+
+class CompositionAttributes(_Benchmark):
+    unit = "entries/s"
+    params = ([630, 6300],
+              ['StoichiometricAttributeGenerator', 'ElementalPropertyAttributeGenerator', 'MeredigAttributeGenerator',
+               'ValenceShellAttributeGenerator', 'IonicityAttributeGenerator'])
+    param_names = ['n_entries', 'generator']
+
+    def setup(self, n, generator):
+        self.entries = composition_entries(n)
+
+    def run(self, n, generator):
+        from chemml.chem import magpie_python
+        getattr(magpie_python, generator)().generate_features(self.entries)
+
+
+class VoronoiTessellation(_Benchmark):
+    unit = "structures/s"
+    params = ([18, 54],)
+    param_names = ['n_structures']
+
+    def setup(self, n):
+        self.structures = crystal_structures(n)
+
+    def run(self, n):
+        from chemml.chem.magpie_python.vassal.analysis.VoronoiCellBasedAnalysis import VoronoiCellBasedAnalysis
+        for structure in self.structures:
+            VoronoiCellBasedAnalysis(radical=False).analyze_structure(structure)
@@ -0,0 +1,91 @@
+"""
+shared inputs of the benchmarks: the bundled datasets, replicated to the requested number of samples.
+"""
+import os
+import time
+
+import pkg_resources
+
+MAGPIE_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets', 'data', 'magpie_python_test'))
+
+_cache = {}
+
+
+def replicate(items, n):
+    """
+    returns a list of n items, repeating the input items as many times as needed.
+    """
+    items = list(items)
+    return [items[i % len(items)] for i in range(n)]
+
+
+def xyz_molecules(n):
+    """
+    n xyz geometries (chemml.chem.XYZ objects) from the polarizability dataset (50 unique molecules).
+    The geometries are used instead of the Molecule objects, which can't be sent to the worker processes.
+    """
+    if 'xyz' not in _cache:
+        from chemml.datasets import load_xyz_polarizability
+        _cache['xyz'] = [molecule.xyz for molecule in load_xyz_polarizability()[0]]
+    return replicate(_cache['xyz'], n)
+
+
+def smiles_molecules(n):
+    """
+    n chemml.chem.Molecule objects with the SMILES representation, from the CEP HOMO dataset (500 unique molecules).
+    """
+    if 'smiles' not in _cache:
+        from chemml.chem import Molecule
+        from chemml.datasets import load_cep_homo
+        smiles = load_cep_homo()[0]['smiles']
+        _cache['smiles'] = [Molecule(s, 'smiles') for s in smiles]
+    return replicate(_cache['smiles'], n)
+
+
+def composition_entries(n):
+    """
+    n magpie composition entries, from the formation energy dataset (630 unique compositions).
+    """
+    if 'compositions' not in _cache:
+        from chemml.datasets import load_comp_energy
+        _cache['compositions'] = load_comp_energy()[0]
+    return replicate(_cache['compositions'], n)
+
+
+def crystal_structures(n):
+    """
+    n crystal structures (vassal Cell objects) parsed from the magpie test files (18 unique structures).
+    """
+    if 'structures' not in _cache:
+        from chemml.chem.magpie_python.vassal.io.VASP5IO import VASP5IO
+        io = VASP5IO()
+        files = sorted(f for f in os.listdir(MAGPIE_PATH) if f.endswith('.vasp'))
+        _cache['structures'] = [io.parse_file(os.path.join(MAGPIE_PATH, f)) for f in files]
+    return replicate(_cache['structures'], n)
+
+
+class _Benchmark(object):
+    """
+    the base class of the benchmarks (asv conventions): the subclasses define `params`, `param_names`, `setup` and
+    the `run(*params)` method that processes `n_samples(*params)` samples.
+    The time, peak memory and throughput (samples per second) of `run` are reported.
+    """
+    unit = "samples/s"
+    timeout = 600
+
+    def n_samples(self, n, *args):
+        return n
+
+    def run(self, *params):
+        raise NotImplementedError
+
+    def time_run(self, *params):
+        self.run(*params)
+
+    def peakmem_run(self, *params):
+        self.run(*params)
+
+    def track_throughput(self, *params):
+        start = time.perf_counter()
+        self.run(*params)
+        return self.n_samples(*params) / (time.perf_counter() - start)
@@ -0,0 +1,159 @@
+"""
+a standalone runner of the benchmarks, for the environments without asv. Each benchmark runs in a fresh process and
+the wall time, peak resident memory (and its increase over the peak after the setup) and throughput are written to a
+json file.
+
+    python -m benchmarks.run                       # all the benchmarks
+    python -m benchmarks.run -b CoulombMatrix -q   # the smallest scale of the matching benchmarks
+    python -m benchmarks.run -o results.json
+"""
+from __future__ import print_function
+import argparse
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+MODULES = ['benchmarks.bench_chem', 'benchmarks.bench_magpie']
+
+
+def discover(pattern=None):
+    """
+    returns the (module name, class name, params) of the benchmarks that match the regular expression pattern.
+    """
+    from benchmarks.common import _Benchmark
+    found = []
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for name in sorted(vars(module)):
+            cls = getattr(module, name)
+            if not isinstance(cls, type) or not issubclass(cls, _Benchmark) or cls is _Benchmark:
+                continue
+            if pattern is not None and not re.search(pattern, name):
+                continue
+            for params in itertools.product(*cls.params):
+                found.append((module_name, name, params))
+    return found
+
+
+def _peak_rss():
+    """
+    the peak resident memory of the current process so far (MB).
+    """
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on linux
+    return rss / 2.0 ** 20 if sys.platform == 'darwin' else rss / 2.0 ** 10
+
+
+def _failure(error):
+    return {'time_s': None, 'peak_rss_mb': None, 'setup_rss_mb': None, 'run_rss_mb': None, 'throughput': None,
+            'unit': None, 'error': error}
+
+
+def _measure(module_name, class_name, params, queue):
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        bench = cls()
+        bench.setup(*params)
+        setup_rss = _peak_rss()
+        start = time.perf_counter()
+        bench.run(*params)
+        elapsed = time.perf_counter() - start
+        rss = _peak_rss()
+        # the peak memory of the inputs (setup) is reported apart from the increase of the peak during the run
+        queue.put({'time_s': elapsed, 'peak_rss_mb': rss, 'setup_rss_mb': setup_rss, 'run_rss_mb': rss - setup_rss,
+                   'throughput': bench.n_samples(*params) / elapsed, 'unit': cls.unit, 'error': None})
+    except Exception as err:
+        queue.put(_failure('%s: %s' % (type(err).__name__, err)))
+
+
+def run_benchmark(module_name, class_name, params, timeout=None):
+    """
+    runs a benchmark in a fresh process and returns its measurements.
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(module_name, class_name, params, queue))
+    process.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        process.terminate()
+        result = _failure('timeout')
+    process.join()
+    return result
+
+
+def machine_info():
+    """
+    the description of the machine and of the code, stored with the results.
+    """
+    import chemml
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        commit = None
+    return {'chemml': chemml.__version__, 'commit': commit, 'python': platform.python_version(),
+            'platform': platform.platform(), 'processor': platform.processor(), 'cpu_count': os.cpu_count(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def add_speedup(results):
+    """
+    adds the speedup with respect to n_jobs=1 (with all the other parameters fixed) to the results of the benchmarks
+    with an n_jobs parameter.
+    """
+    serial = {}
+    for r in results:
+        names = r['param_names']
+        if 'n_jobs' in names and r['params'][names.index('n_jobs')] == 1 and r['time_s']:
+            key = (r['benchmark'], tuple(p for n, p in zip(names, r['params']) if n != 'n_jobs'))
+            serial[key] = r['time_s']
+    for r in results:
+        names = r['param_names']
+        if 'n_jobs' in names and r['time_s']:
+            key = (r['benchmark'], tuple(p for n, p in zip(names, r['params']) if n != 'n_jobs'))
+            if key in serial:
+                r['speedup'] = serial[key] / r['time_s']
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="run the chemml benchmarks")
+    parser.add_argument('-b', '--bench', default=None, help="regular expression of the benchmark names")
+    parser.add_argument('-q', '--quick', action='store_true', help="only the smallest scale of each benchmark")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="the json file of the results")
+    parser.add_argument('--timeout', type=float, default=600, help="the timeout of each benchmark (seconds)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for module_name, class_name, params in discover(args.bench):
+        cls = getattr(importlib.import_module(module_name), class_name)
+        if args.quick and params[0] != min(cls.params[0]):
+            continue
+        result = run_benchmark(module_name, class_name, params, args.timeout)
+        result.update({'benchmark': '%s.%s' % (module_name.split('.')[-1], class_name),
+                       'param_names': list(cls.param_names), 'params': list(params)})
+        results.append(result)
+        if result['error'] is None:
+            print('%-45s %-35s %9.3f s %9.1f MB (+%.1f MB) %12.1f %s' % (
+                result['benchmark'], params, result['time_s'], result['peak_rss_mb'], result['run_rss_mb'],
+                result['throughput'], result['unit']))
+        else:
+            print('%-45s %-35s failed: %s' % (result['benchmark'], params, result['error'].splitlines()[0]))
+
+    with open(args.output, 'w') as f:
+        json.dump({'machine': machine_info(), 'results': add_speedup(results)}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
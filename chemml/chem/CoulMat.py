@@ -8,7 +8,19 @@ from multiprocessing import cpu_count, Pool
 from tensorflow.keras.utils import Progbar
 
 from chemml.chem import Molecule
+from chemml.chem import XYZ
 from chemml.utils import padaxis
+from chemml.utils import profiling
+
+
+def _packed_to_xyz(molecules):
+    """
+    converts the packed geometries (chemml.initialization.PackedGeometries) to a list of chemml.chem.XYZ objects.
+    """
+    from chemml.initialization import PackedGeometries
+    if isinstance(molecules, PackedGeometries):
+        return molecules.to_xyz()
+    return molecules
 
 
 class CoulombMatrix(object):
@@ -93,11 +105,14 @@ class CoulombMatrix(object):
             if mol.xyz is None:
                 msg = "The molecule must be a chemml.chem.Molecule object with xyz information."
                 raise ValueError(msg)
+            xyz = mol.xyz
+        elif isinstance(mol, XYZ):
+            xyz = mol
         else:
-            msg = "The molecule must be a chemml.chem.Molecule object."
+            msg = "The molecule must be a chemml.chem.Molecule or chemml.chem.XYZ object."
             raise ValueError(msg)
 
-        mol = np.append(mol.xyz.atomic_numbers,mol.xyz.geometry, axis=1)
+        mol = np.append(xyz.atomic_numbers,xyz.geometry, axis=1)
         cm = []
         for i in range(len(mol)):
             vect = []
@@ -117,6 +132,7 @@ class CoulombMatrix(object):
             cm = padaxis(np.array(cm), self.max_n_atoms_, 0, 0)
         return np.array(cm)[:self.max_n_atoms_, :self.max_n_atoms_] #shape nAtoms*nAtoms
 
+    @profiling.profiled()
     def represent(self, molecules):
         """
         provides coulomb matrix representation for input molecules.
@@ -127,6 +143,8 @@ class CoulombMatrix(object):
             If list, it must be a list of chemml.chem.Molecule objects, otherwise we raise a ValueError.
             In addition, all the molecule objects must provide the XYZ information. Please make sure the XYZ geometry has been
             stored or optimized in advance.
+            The chemml.chem.XYZ objects and the packed geometries (chemml.initialization.PackedGeometries, e.g., loaded
+            from a packed geometry archive) are also accepted.
 
         Returns
         -------
@@ -140,9 +158,10 @@ class CoulombMatrix(object):
                 - shape of Random_Coulomb (RC): (n_molecules, nPerm * max_n_atoms * (max_n_atoms+1)/2)
         """
         # check input molecules
+        molecules = _packed_to_xyz(molecules)
         if isinstance(molecules, (list,np.ndarray)):
             molecules = np.array(molecules)
-        elif isinstance(molecules, Molecule):
+        elif isinstance(molecules, (Molecule, XYZ)):
             molecules = np.array([molecules])
         else:
             msg = "The molecule must be a chemml.chem.Molecule object or a list of objets."
@@ -157,7 +176,7 @@ class CoulombMatrix(object):
         # max number of atoms based on the list of molecules
         if self.max_n_atoms_ == 'auto':
             try:
-                self.max_n_atoms_ = max([m.xyz.atomic_numbers.shape[0] for m in molecules])
+                self.max_n_atoms_ = max([(m if isinstance(m, XYZ) else m.xyz).atomic_numbers.shape[0] for m in molecules])
             except:
                 msg = "The xyz representation of molecules is not available."
                 raise ValueError(msg)
@@ -183,23 +202,26 @@ class CoulombMatrix(object):
 
         # MAP: CM in parallel
         map_function = partial(self._represent)
-        if self.verbose:
-            print('featurizing molecules in batches of %i ...' % batch_size)
-            pbar = Progbar(len(molecules), width=50)
-            tensor_list = []
-            for tensors in pool.imap(map_function, molecule_chunks):
-                pbar.add(len(tensors[0]))
-                tensor_list.append(tensors)
-            print('Merging batch features ...    ', end='')
-        else:
-            tensor_list = pool.map(map_function, molecule_chunks)
-        if self.verbose:
-            print('[DONE]')
+        with profiling.timer('CoulombMatrix.map', n_molecules=len(molecules), n_jobs=self.n_jobs):
+            if self.verbose:
+                print('featurizing molecules in batches of %i ...' % batch_size)
+                pbar = Progbar(len(molecules), width=50)
+                tensor_list = []
+                for tensors in pool.imap(map_function, molecule_chunks):
+                    pbar.add(len(tensors[0]))
+                    tensor_list.append(tensors)
+                print('Merging batch features ...    ', end='')
+            else:
+                tensor_list = pool.map(map_function, molecule_chunks)
+            if self.verbose:
+                print('[DONE]')
 
         # REDUCE: Concatenate the obtained tensors
         pool.close()
         pool.join()
-        return pd.concat(tensor_list, axis=0, ignore_index=True)
+        profiling.count('CoulombMatrix.molecules', len(molecules))
+        with profiling.timer('CoulombMatrix.reduce'):
+            return pd.concat(tensor_list, axis=0, ignore_index=True)
 
     def _represent(self, molecules):
 
@@ -328,6 +350,7 @@ class BagofBonds(object):
         self.n_jobs = n_jobs
         self.verbose = verbose
 
+    @profiling.profiled()
     def represent(self, molecules):
         """
         provides bag of bonds representation for input molecules.
@@ -338,6 +361,8 @@ class BagofBonds(object):
             If list, it must be a list of chemml.chem.Molecule objects, otherwise we raise a ValueError.
             In addition, all the molecule objects must provide the XYZ information. Please make sure the XYZ geometry has been
             stored or optimized in advance.
+            The chemml.chem.XYZ objects and the packed geometries (chemml.initialization.PackedGeometries, e.g., loaded
+            from a packed geometry archive) are also accepted.
 
         Returns
         -------
@@ -345,9 +370,10 @@ class BagofBonds(object):
             The bag of bond features.
 
         """
+        molecules = _packed_to_xyz(molecules)
         if isinstance(molecules, (list,np.ndarray)):
             molecules = np.array(molecules)
-        elif isinstance(molecules, Molecule):
+        elif isinstance(molecules, (Molecule, XYZ)):
             molecules = np.array([molecules])
         else:
             msg = "The input molecules must be a chemml.chem.Molecule object or a list of objects."
@@ -378,35 +404,42 @@ class BagofBonds(object):
 
         # MAP: CM in parallel
         map_function = partial(self._represent)
-        if self.verbose:
-            print('featurizing molecules in batches of %i ...' % batch_size)
-            pbar = Progbar(len(molecules), width=50)
-            bbs_info = []
-            for tensors in pool.imap(map_function, molecule_chunks):
-                pbar.add(len(tensors[0]))
-                bbs_info.append(tensors)
-            print('Merging batch features ...    ', end='')
-        else:
-            bbs_info = pool.map(map_function, molecule_chunks)
-        if self.verbose:
-            print('[DONE]')
+        with profiling.timer('BagofBonds.map', n_molecules=len(molecules), n_jobs=self.n_jobs):
+            if self.verbose:
+                print('featurizing molecules in batches of %i ...' % batch_size)
+                pbar = Progbar(len(molecules), width=50)
+                bbs_info = []
+                for tensors in pool.imap(map_function, molecule_chunks):
+                    pbar.add(len(tensors[0]))
+                    bbs_info.append(tensors)
+                print('Merging batch features ...    ', end='')
+            else:
+                bbs_info = pool.map(map_function, molecule_chunks)
+            if self.verbose:
+                print('[DONE]')
 
         # REDUCE: Concatenate the obtained tensors
         pool.close()
         pool.join()
-        return self.concat_mol_features(bbs_info)
+        profiling.count('BagofBonds.molecules', len(molecules))
+        with profiling.timer('BagofBonds.reduce'):
+            return self.concat_mol_features(bbs_info)
 
     def _represent(self, molecules):
         BBs_matrix = [] # list of dictionaries for each molecule
         all_keys = {}   # dictionary of unique keys and their maximum length
         for nmol, mol in enumerate(molecules):
             # check molecules
-            if not isinstance(mol, Molecule):
+            if isinstance(mol, XYZ):
+                xyz = mol
+            elif isinstance(mol, Molecule):
+                xyz = mol.xyz
+            else:
                 msg = "The input molecules must be chemml.chem.Molecule object with xyz information."
                 raise ValueError(msg)
 
             bags = {}
-            mol = np.append(mol.xyz.atomic_numbers, mol.xyz.geometry, axis=1)
+            mol = np.append(xyz.atomic_numbers, xyz.geometry, axis=1)
             for i in range(len(mol)):
                 for j in range(i,len(mol)):
                     if i==j:
@@ -7,12 +7,22 @@ from builtins import range
 import warnings
 import os
 import time
+import copy
+import subprocess
+import concurrent.futures
+import numpy as np
 import pandas as pd
 from lxml import objectify, etree
 
 from chemml.utils import std_datetime_str
 from chemml.utils import bool_formatter
 from chemml.utils import tot_exec_time_str
+from chemml.utils import profiling
+
+# the file extensions of the molecule formats that can be sharded (one molecule per line, or delimited records)
+SMILES_EXTENSIONS = ['.smi', '.smiles']
+SDF_EXTENSIONS = ['.sdf', '.sd', '.mol', '.mdl']
+MOL2_EXTENSIONS = ['.mol2', '.ml2']
 
 class Dragon(object):
     """
@@ -57,6 +67,12 @@ class Dragon(object):
         >>> drg.run()
         >>> df = drg.convert_to_csv(remove=True)
         >>> df = df.drop(['No.','NAME'], axis=1)
+
+        The molecules can also be split into shards that are processed by concurrent Dragon jobs:
+        >>> drg = Dragon(molFile='molecules.smi')
+        >>> drg.script_wizard(script='new', output_directory='./')
+        >>> drg.run_shards(n_shards=4)
+        >>> df = drg.convert_to_csv(remove=True)
     """
 
     def __init__(self,
@@ -528,6 +544,7 @@ class Dragon(object):
         etree.cleanup_namespaces(self.dragon)
         print(objectify.dump(self.dragon))
 
+    @profiling.profiled()
     def run(self):
         t0 = time.time()
         print("running Dragon%i ..." % self.version)
@@ -544,26 +561,197 @@ class Dragon(object):
 
         # print subprocess.check_output(['nohup dragon%sshell -s %s'%(self.version,self.drs)])
 
-    def convert_to_csv(self, remove=True):
+    def _molFile_records(self):
+        """
+        reads the molFile and splits it into the records of the molecules: one line per molecule for the SMILES files,
+        and the '$$$$' and '@<TRIPOS>MOLECULE' delimited blocks for the SDF/MDL and MOL2 files.
+        """
+        extension = os.path.splitext(self.molFile)[1].lower()
+        if extension not in SMILES_EXTENSIONS + SDF_EXTENSIONS + MOL2_EXTENSIONS:
+            msg = "The molFile can only be sharded for the SMILES (%s), SDF/MDL (%s) and MOL2 (%s) formats." % (
+                ', '.join(SMILES_EXTENSIONS), ', '.join(SDF_EXTENSIONS), ', '.join(MOL2_EXTENSIONS))
+            raise ValueError(msg)
+        with open(self.molFile) as f:
+            lines = f.readlines()
+        if extension in SMILES_EXTENSIONS:
+            return [line for line in lines if line.strip()]
+        records, record = [], []
+        for line in lines:
+            if extension in MOL2_EXTENSIONS and line.startswith('@<TRIPOS>MOLECULE') and \
+                    any(l.startswith('@<TRIPOS>MOLECULE') for l in record):
+                records.append(''.join(record))
+                record = []
+            record.append(line)
+            if extension in SDF_EXTENSIONS and line.strip() == '$$$$':
+                records.append(''.join(record))
+                record = []
+        if ''.join(record).strip():
+            records.append(''.join(record))
+        return records
+
+    def _shard_molFile(self, n_shards, output_directory):
+        """
+        splits the molFile (a SMILES, SDF/MDL or MOL2 file, or a dictionary of file paths) into n_shards contiguous
+        parts, without splitting the records of the molecules. The empty parts (n_shards larger than the number of
+        molecules) are skipped.
+        """
+        if isinstance(self.molFile, dict):
+            files = [self.molFile[f] for f in range(1, len(self.molFile) + 1)]
+            bounds = np.linspace(0, len(files), n_shards + 1).astype(int)
+            parts = [{j + 1: f for j, f in enumerate(files[bounds[i]:bounds[i + 1]])} for i in range(n_shards)
+                     if bounds[i + 1] > bounds[i]]
+        elif isinstance(self.molFile, str):
+            records = self._molFile_records()
+            bounds = np.linspace(0, len(records), n_shards + 1).astype(int)
+            parts = []
+            for i in range(n_shards):
+                if bounds[i + 1] == bounds[i]:
+                    continue
+                # the shards are numbered as in run_shards
+                shard_file = os.path.join(output_directory, 'shard%i' % len(parts),
+                                          'molecules' + os.path.splitext(self.molFile)[1])
+                if not os.path.exists(os.path.dirname(shard_file)):
+                    os.makedirs(os.path.dirname(shard_file))
+                with open(shard_file, 'w') as f:
+                    f.writelines(records[bounds[i]:bounds[i + 1]])
+                parts.append(shard_file)
+        else:
+            msg = 'Variable molFile can be either a string or a dictionary'
+            raise ValueError(msg)
+        return parts
+
+    @profiling.profiled()
+    def run_shards(self, n_shards=4, n_jobs=None, output_directory=None):
+        """
+        splits the molecules into n_shards parts, creates a Dragon script (with the script_wizard) for each part and runs
+        them as concurrent Dragon jobs. The output files of the shards are stored in the data_path attribute as a list,
+        which is read by the convert_to_csv method.
+
+        Parameters
+        ----------
+        n_shards: int, optional (default = 4)
+            The number of parts to split the molecules (molFile parameter) into.
+
+        n_jobs: int, optional (default = None)
+            The maximum number of concurrent Dragon jobs. If None, all the shards are run at once.
+
+        output_directory: string, optional (default = None)
+            The path to the working directory. The files of each shard are stored in a 'shard#' subdirectory.
+            If None, the output_directory of the script_wizard (or './') is used.
+        """
+        t0 = time.time()
+        if output_directory is None:
+            output_directory = getattr(self, 'output_directory', './')
+        shards = []
+        for i, molFile in enumerate(self._shard_molFile(n_shards, output_directory)):
+            shard = copy.copy(self)
+            shard.molFile = molFile
+            # the output_directory is concatenated with the file names of the script
+            shard.script_wizard(script='new', output_directory=os.path.join(output_directory, 'shard%i' % i, ''))
+            shards.append(shard)
+        print("running %i Dragon%i jobs ..." % (len(shards), self.version))
+
+        def run_shard(shard):
+            with open(os.path.join(shard.output_directory, 'Dragon_stdout.txt'), 'w') as log, \
+                    profiling.timer('Dragon.shard', output_directory=shard.output_directory):
+                try:
+                    return subprocess.call(['dragon%ishell' % self.version, '-s',
+                                            os.path.join(shard.output_directory, shard.drs_name)],
+                                           stdout=log, stderr=subprocess.STDOUT)
+                except OSError:
+                    return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_jobs or max(1, len(shards))) as executor:
+            returncodes = list(executor.map(run_shard, shards))
+        if None in returncodes:
+            msg = "Oops, dragon%ishell command didn't work! Are you sure Dragon%i software is installed on your machine?" % (
+                self.version, self.version)
+            raise ImportError(msg)
+        failed = [i for i, code in enumerate(returncodes) if code != 0]
+        if failed:
+            msg = "The Dragon jobs of the shards %s failed. Look at the Dragon_stdout.txt file of the shards." % str(failed)
+            raise RuntimeError(msg)
+        self.data_path = [shard.data_path for shard in shards]
+
+        # execution time
+        tmp_str = tot_exec_time_str(t0)
+        print("... Dragon jobs completed in %s"%tmp_str)
+
+    def _read_chunks(self, path, dtype, chunksize):
+        """
+        streams the tab-delimited output of Dragon with the C parser and explicit data types.
+        """
+        columns = pd.read_csv(path, sep='\t', nrows=0).columns
+        dtypes = {c: dtype for c in columns if c not in ('No.', 'NAME')}
+        dtypes['NAME'] = str
+        return pd.read_csv(path, sep='\t', engine='c', dtype=dtypes, na_values=['na', 'NaN', self.Missing_String],
+                           chunksize=chunksize)
+
+    def convert_to_csv(self, remove=True, dtype=None, chunksize=100000, store=None):
         """
         This function converts the tab-delimited txt file from Dragon to pandas dataframe.
         Note that this process might require large memory based on the number of data points and features.
+        The output files of all the shards (run_shards method) are concatenated in order.
 
         Parameters
         ----------
         remove: bool, optional (default = True)
             if True, the original descriptors file (Dragon_descriptors.txt) will be removed.
 
+        dtype: str or numpy dtype, optional (default = None)
+            The data type of the descriptors. If None, float64 is used. 'float32' halves the memory of the descriptors.
+
+        chunksize: int, optional (default = 100000)
+            The number of rows to parse at once.
+
+        store: str, optional (default = None)
+            The path to an HDF5 file to stream the descriptors to, instead of creating a dataframe in memory. The file
+            contains the 'descriptors' dataset (n_molecules, n_descriptors), stored in chunks of columns, with the
+            descriptor names in its 'columns' attribute, and the 'No.' and 'NAME' datasets.
+
         Returns
         -------
-        pandas.DataFrame
+        pandas.DataFrame or str
             The 2D dataframe of the descriptors. Note that the first two columns are 'No.' and 'NAME'.
+            If store is given, the path to the HDF5 file is returned.
 
         """
         # convert to csv file
         t0 = time.time()
         print("converting output file to csv format ...")
-        df = pd.read_csv(self.data_path, sep=None, engine='python')
+        if dtype is None:
+            dtype = np.float64
+        paths = self.data_path if isinstance(self.data_path, list) else [self.data_path]
+        n_rows, frames, h5 = 0, [], None
+        try:
+            for path in paths:
+                for chunk in self._read_chunks(path, dtype, chunksize):
+                    # the molecules of all the shards are numbered continuously
+                    chunk['No.'] = np.arange(n_rows + 1, n_rows + 1 + len(chunk))
+                    n_rows += len(chunk)
+                    if store is None:
+                        frames.append(chunk)
+                        continue
+                    import h5py
+                    values = chunk.drop(['No.', 'NAME'], axis=1)
+                    if h5 is None:
+                        h5 = h5py.File(store, 'w')
+                        h5.create_dataset('descriptors', shape=(0, values.shape[1]), maxshape=(None, values.shape[1]),
+                                          dtype=dtype, chunks=(min(chunksize, 4096), min(values.shape[1], 64)))
+                        h5['descriptors'].attrs['columns'] = np.array(values.columns, dtype=h5py.string_dtype())
+                        h5.create_dataset('No.', shape=(0,), maxshape=(None,), dtype=np.int64)
+                        h5.create_dataset('NAME', shape=(0,), maxshape=(None,), dtype=h5py.string_dtype())
+                    for name, data in (('descriptors', values.values), ('No.', chunk['No.'].values),
+                                       ('NAME', chunk['NAME'].astype(str).values.astype(object))):
+                        h5[name].resize(n_rows, axis=0)
+                        h5[name][n_rows - len(chunk):] = data
+        finally:
+            if h5 is not None:
+                h5.close()
+        if store is None:
+            df = pd.concat(frames, axis=0, ignore_index=True)
+        else:
+            df = store
         # df = df.drop(['No.', 'NAME'], axis=1)
 
         # execution time
@@ -571,11 +759,10 @@ class Dragon(object):
 
         # remove original tab delimited file
         if remove:
-            os.remove(self.data_path)
+            for path in paths:
+                os.remove(path)
             self.data_path = None
 
         print("... conversion completed in %s"%tmp_str)
 
         return df
-
-
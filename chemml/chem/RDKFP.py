@@ -6,6 +6,7 @@ import scipy.sparse
 
 
 from chemml.chem import Molecule
+from chemml.utils import profiling
 
 class RDKitFingerprint(object):
     """
@@ -66,6 +67,7 @@ class RDKitFingerprint(object):
         else:
             self.vector = vector.lower()
 
+    @profiling.profiled()
     def represent(self, molecules):
         """
         The main function to provide fingerprint representation of input molecule(s).
@@ -97,6 +99,7 @@ class RDKitFingerprint(object):
             raise ValueError(msg)
 
         self.n_molecules_ = molecules.shape[0]
+        profiling.count('RDKitFingerprint.molecules', self.n_molecules_)
 
         if self.fingerprint_type.lower() == 'hashed_atom_pair' or self.fingerprint_type.lower() == 'hap':
             return self._hap(molecules)
@@ -23,6 +23,7 @@ import rdkit
 from rdkit import Chem
 from chemml.chem import Molecule
 from chemml.utils import padaxis
+from chemml.utils import profiling
 
 from tensorflow.keras.utils import Progbar
 
@@ -317,6 +318,7 @@ def concat_mol_tensors(mol_tensors_list, match_degree=True, match_max_atoms=Fals
     return atoms, bonds, edges
 
 
+@profiling.profiled()
 def tensorise_molecules(molecules, max_degree=5, max_atoms=None, n_jobs=-1, batch_size=3000, verbose=True):
     """
     Takes a list of molecules and provides tensor representation of atom and bond features.
@@ -397,20 +399,23 @@ def tensorise_molecules(molecules, max_degree=5, max_atoms=None, n_jobs=-1, batc
 
     # MAP: Tensorise in parallel
     map_function = partial(tensorise_molecules_singlecore, max_degree=max_degree, max_atoms=max_atoms)
-    if verbose:
-        print('Tensorising molecules in batches of %i ...'%batch_size)
-        pbar = Progbar(len(molecules), width=50)
-        tensor_list = []
-        for tensors in pool.imap(map_function, molecule_chunks):
-            pbar.add(tensors[0].shape[0])
-            tensor_list.append(tensors)
-        print('Merging batch tensors ...    ', end='')
-    else:
-        tensor_list = pool.map(map_function, molecule_chunks)
-    if verbose:
-        print('[DONE]')
+    with profiling.timer('tensorise_molecules.map', n_molecules=len(molecules), n_jobs=n_jobs):
+        if verbose:
+            print('Tensorising molecules in batches of %i ...'%batch_size)
+            pbar = Progbar(len(molecules), width=50)
+            tensor_list = []
+            for tensors in pool.imap(map_function, molecule_chunks):
+                pbar.add(tensors[0].shape[0])
+                tensor_list.append(tensors)
+            print('Merging batch tensors ...    ', end='')
+        else:
+            tensor_list = pool.map(map_function, molecule_chunks)
+        if verbose:
+            print('[DONE]')
 
     # REDUCE: Concatenate the obtained tensors
     pool.close()
     pool.join()
-    return concat_mol_tensors(tensor_list, match_degree=max_degree!=None, match_max_atoms=max_atoms!=None)
+    profiling.count('tensorise_molecules.molecules', len(molecules))
+    with profiling.timer('tensorise_molecules.reduce'):
+        return concat_mol_tensors(tensor_list, match_degree=max_degree!=None, match_max_atoms=max_atoms!=None)
@@ -8,6 +8,7 @@ from ....data.materials.util.LookUpData import LookUpData
 from ....data.utilities.filters.CompositionDistanceFilter import \
     CompositionDistanceFilter
 from ....utility.EqualSumCombinations import EqualSumCombinations
+from chemml.utils import profiling
 
 
 class APEAttributeGenerator:
@@ -536,6 +537,7 @@ class APEAttributeGenerator:
 
         return output
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
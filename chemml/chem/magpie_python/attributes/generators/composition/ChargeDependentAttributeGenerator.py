@@ -6,6 +6,7 @@ import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
 from ....utility.tools.OxidationStateGuesser import OxidationStateGuesser
+from chemml.utils import profiling
 
 class ChargeDependentAttributeGenerator:
     """Class to generate attributes derived from the oxidation states of
@@ -31,6 +32,7 @@ class ChargeDependentAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """
         Function to generate features as mentioned in the class description.
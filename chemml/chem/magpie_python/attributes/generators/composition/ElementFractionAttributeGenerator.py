@@ -2,11 +2,13 @@ import types
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from chemml.utils import profiling
 
 class ElementFractionAttributeGenerator:
     """Class to set the element fractions as the features of materials.
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """
         Function to generate features as mentioned in the class description.
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from chemml.utils import profiling
 
 class ElementPairPropertyAttributeGenerator:
     """Class to generate attributes based on the properties of constituent
@@ -94,6 +95,7 @@ class ElementPairPropertyAttributeGenerator:
         for prop in properties:
             self.remove_elemental_pair_property(prop)
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
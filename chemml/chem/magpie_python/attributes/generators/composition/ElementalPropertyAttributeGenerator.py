@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from ....data.materials.util.CompositionMatrix import CompositionMatrix
+from chemml.utils import profiling
 
 class ElementalPropertyAttributeGenerator:
     """Class to set up and generate descriptors based on elemental property
@@ -61,6 +63,7 @@ class ElementalPropertyAttributeGenerator:
         self.lookup_data = LookUpData.load_properties(
             self.elemental_properties)
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -85,8 +88,7 @@ class ElementalPropertyAttributeGenerator:
 
         """
 
-        # Initialize lists of feature values and headers for pandas data frame.
-        feat_values = []
+        # Initialize list of headers for pandas data frame.
         feat_headers = []
 
         # Make sure that there is at least one elemental property provided.
@@ -118,51 +120,31 @@ class ElementalPropertyAttributeGenerator:
             feat_headers.append("min_" + prop)
             feat_headers.append("most_" + prop)
 
+        # Compute the statistics of all the entries at once, and overwrite
+        # the entries with missing data with NaN.
+        matrix = CompositionMatrix(entries)
+        feat_values = np.empty((len(entries), n_statistics * len(
+            self.elemental_properties)))
         missing_data = {}
-        # Generate features for each entry.
-        for entry in entries:
-            elem_ids = entry.get_element_ids()
-            elem_fractions = entry.get_element_fractions()
-            max_f = max(elem_fractions)
-            tmp_list = []
-            # Look up values for each property.
-            for prop in self.elemental_properties:
-                tmp_prop = []
-                for elem_id in elem_ids:
-                    tmp_prop_value = self.lookup_data[prop][elem_id]
-                    # If data is missing, make a note of it so that we can
-                    # inform the user later.
-                    if np.isnan(tmp_prop_value):
-                        if not prop in missing_data:
-                            missing_data[prop] = []
-                        if elem_id not in missing_data[prop]:
-                            missing_data[prop].append(elem_id)
-                    tmp_prop.append(tmp_prop_value)
-
-                # If there is no missing data, compute statistics.
-                if not np.isnan(tmp_prop).any():
-                    mean_ = np.average(tmp_prop, weights=elem_fractions)
-                    max_ = max(tmp_prop)
-                    min_= min(tmp_prop)
-                    max_diff_ = max_ - min_
-                    avg_dev_ = np.average([abs(x - mean_) for x in tmp_prop],
-                                          weights=elem_fractions)
-
-                    indices = [i for i,f in enumerate(elem_fractions) if f >=
-                               max_f]
-                    most_ = sum(tmp_prop[i] for i in indices)/len(indices)
-
-                    tmp_list.append(mean_)
-                    tmp_list.append(max_diff_)
-                    tmp_list.append(avg_dev_)
-                    tmp_list.append(max_)
-                    tmp_list.append(min_)
-                    tmp_list.append(most_)
-                else:
-                    # Handle nan descriptors here from missing data.
-                    for i in range(n_statistics):
-                        tmp_list.append(np.nan)
-            feat_values.append(tmp_list)
+        for i, prop in enumerate(self.elemental_properties):
+            values = self.lookup_data[prop]
+            mean_ = matrix.mean(values)
+            max_ = matrix.maximum(values)
+            min_ = matrix.minimum(values)
+            stats = feat_values[:, i * n_statistics:(i + 1) * n_statistics]
+            stats[:, 0] = mean_
+            stats[:, 1] = max_ - min_
+            stats[:, 2] = matrix.deviation(values, mean_)
+            stats[:, 3] = max_
+            stats[:, 4] = min_
+            stats[:, 5] = matrix.most(values)
+
+            # If data is missing, make a note of it so that we can inform
+            # the user later.
+            rows, elements = matrix.missing(values)
+            stats[rows] = np.nan
+            if len(elements) > 0:
+                missing_data[prop] = elements
 
         # Issue warning to user about missing data here if it exists.
         if len(missing_data) > 0:
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.GCLPCalculator import GCLPCalculator
+from chemml.utils import profiling
 
 class GCLPAttributeGenerator:
     """Class to compute features based on the T=0K ground state.
@@ -66,6 +67,7 @@ class GCLPAttributeGenerator:
 
         self.count_phases = count_phases
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
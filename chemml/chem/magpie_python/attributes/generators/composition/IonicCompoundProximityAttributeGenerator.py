@@ -4,6 +4,7 @@ from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.utilities.filters.CompositionDistanceFilter import \
     CompositionDistanceFilter
 from ....utility.tools.IonicCompoundFinder import IonicCompoundFinder
+from chemml.utils import profiling
 
 class IonicCompoundProximityAttributeGenerator:
     """Class to generate attributes based on the distance of a composition from
@@ -45,6 +46,7 @@ class IonicCompoundProximityAttributeGenerator:
 
         self.max_formula_unit = size
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -4,6 +4,7 @@ import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
 from ....utility.tools.OxidationStateGuesser import OxidationStateGuesser
+from chemml.utils import profiling
 
 class IonicityAttributeGenerator:
     """Class to generate the attributes based on the ionicity of a compound.
@@ -27,6 +28,7 @@ class IonicityAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from ....data.materials.util.CompositionMatrix import CompositionMatrix
+from chemml.utils import profiling
 
 class MeredigAttributeGenerator:
     """Class to generate attributes as described by Meredig et al. [1].
@@ -22,6 +24,7 @@ class MeredigAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -45,8 +48,7 @@ class MeredigAttributeGenerator:
 
         """
 
-        # Initialize lists of feature values and headers for pandas data frame.
-        feat_values = []
+        # Initialize list of headers for pandas data frame.
         feat_headers = []
 
         # Raise exception if input argument is not of type list of
@@ -85,47 +87,22 @@ class MeredigAttributeGenerator:
         d = LookUpData.load_property("NdValence")
         f = LookUpData.load_property("NfValence")
 
-        for entry in entries:
-            tmp_list = []
-            elem_fractions = entry.get_element_fractions()
-            elem_ids = entry.get_element_ids()
-            tmp_mass = []
-            tmp_column = []
-            tmp_row = []
-            tmp_number = []
-            tmp_radius = []
-            tmp_en = []
-            tmp_s = []
-            tmp_p = []
-            tmp_d = []
-            tmp_f = []
-            for elem_id in elem_ids:
-                tmp_mass.append(mass[elem_id])
-                tmp_column.append(column[elem_id])
-                tmp_row.append(row[elem_id])
-                tmp_number.append(number[elem_id])
-                tmp_radius.append(radius[elem_id])
-                tmp_en.append(en[elem_id])
-                tmp_s.append(s[elem_id])
-                tmp_p.append(p[elem_id])
-                tmp_d.append(d[elem_id])
-                tmp_f.append(f[elem_id])
-
-            tmp_list.append(np.average(tmp_mass, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_column, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_row, weights=elem_fractions))
-            tmp_list.append(max(tmp_number) - min(tmp_number))
-            tmp_list.append(np.average(tmp_number, weights=elem_fractions))
-            tmp_list.append(max(tmp_radius) - min(tmp_radius))
-            tmp_list.append(np.average(tmp_radius, weights=elem_fractions))
-            tmp_list.append(max(tmp_en) - min(tmp_en))
-            tmp_list.append(np.average(tmp_en, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_s, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_p, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_d, weights=elem_fractions))
-            tmp_list.append(np.average(tmp_f, weights=elem_fractions))
-
-            feat_values.append(tmp_list)
+        # Compute features for all the entries at once.
+        matrix = CompositionMatrix(entries)
+        feat_values = np.column_stack([
+            matrix.mean(mass),
+            matrix.mean(column),
+            matrix.mean(row),
+            matrix.maximum(number) - matrix.minimum(number),
+            matrix.mean(number),
+            matrix.maximum(radius) - matrix.minimum(radius),
+            matrix.mean(radius),
+            matrix.maximum(en) - matrix.minimum(en),
+            matrix.mean(en),
+            matrix.mean(s),
+            matrix.mean(p),
+            matrix.mean(d),
+            matrix.mean(f)]).reshape(len(entries), len(feat_headers))
 
         features = pd.DataFrame(feat_values, columns=feat_headers)
         return features
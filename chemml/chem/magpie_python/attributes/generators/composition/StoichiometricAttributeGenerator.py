@@ -1,7 +1,10 @@
 from __future__ import print_function
 import types
+import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
+from ....data.materials.util.CompositionMatrix import CompositionMatrix
+from chemml.utils import profiling
 
 class StoichiometricAttributeGenerator:
     """Class to set up and generate descriptors based on the stoichiometry of a
@@ -72,6 +75,7 @@ class StoichiometricAttributeGenerator:
         for norm in norms:
             self.add_p_norm(norm)
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate the stoichiometric features.
 
@@ -97,8 +101,7 @@ class StoichiometricAttributeGenerator:
 
         """
 
-        # Initialize lists of feature values and headers for pandas data frame.
-        feat_values = []
+        # Initialize list of headers for pandas data frame.
         feat_headers = []
 
         # Raise exception if input argument is not of type list of
@@ -119,25 +122,18 @@ class StoichiometricAttributeGenerator:
         for p in self.p_norms:
             feat_headers.append("Comp_L"+str(p)+"Norm")
 
-        # Compute features.
-        for entry in entries:
-            fracs = entry.get_element_fractions()
-            tmp_list = []
-            n_comp = 0
-            for f in fracs:
-                if (f > 0):
-                    n_comp += 1
-            # Number of components.
-            tmp_list.append(n_comp)
-
-            # Lp norms.
-            for p in self.p_norms:
-                tmp = 0.0
-                for f in fracs:
-                    tmp += f**p
-                tmp_list.append(tmp**(1.0/p))
-            feat_values.append(tmp_list)
+        # Compute features for all the entries at once.
+        matrix = CompositionMatrix(entries)
+        feat_values = np.empty((len(entries), len(feat_headers)))
+
+        # Number of components.
+        feat_values[:, 0] = matrix.n_components()
+
+        # Lp norms.
+        for i, p in enumerate(self.p_norms):
+            feat_values[:, i + 1] = matrix.norm(p)
 
         # features as a pandas data frame.
         features = pd.DataFrame(feat_values, columns=feat_headers)
+        features["NComp"] = features["NComp"].astype(np.int64)
         return features
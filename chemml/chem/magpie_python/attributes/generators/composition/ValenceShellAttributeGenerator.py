@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from ....data.materials.util.CompositionMatrix import CompositionMatrix
+from chemml.utils import profiling
 
 class ValenceShellAttributeGenerator:
     """Class that generates attributes based on fraction of electrons in
@@ -18,6 +20,7 @@ class ValenceShellAttributeGenerator:
     B, vol. 89, no. 9, Mar. 2014.
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -41,8 +44,7 @@ class ValenceShellAttributeGenerator:
 
         """
 
-        # Initialize lists of feature values and headers for pandas data frame.
-        feat_values = []
+        # Initialize list of headers for pandas data frame.
         feat_headers = []
 
         # Raise exception if input argument is not of type list of
@@ -63,25 +65,10 @@ class ValenceShellAttributeGenerator:
             feat_headers.append("frac_"+s+"Valence")
             n_valence[i] = LookUpData.load_property("N"+s+"Valence")
 
-        for entry in entries:
-            elems = entry.get_element_ids()
-            fracs = entry.get_element_fractions()
-            sum_e = 0.0
-            total_e = []
-            for i in range(len(shell)):
-                tmp_valence = []
-                for elem_id in elems:
-                    tmp_valence.append(n_valence[i][elem_id])
-
-                # Fraction weighted average # of electrons in this shell.
-                x = np.average(tmp_valence, weights=fracs)
-                sum_e += x
-                total_e.append(x)
-
-            for i in range(len(total_e)):
-                total_e[i] /= sum_e
-
-            feat_values.append(total_e)
+        # Fraction weighted average # of electrons in each shell, divided by
+        # the average # of valence electrons.
+        total_e = CompositionMatrix(entries).means(n_valence.T)
+        feat_values = total_e / total_e.sum(axis=1)[:, np.newaxis]
 
         features = pd.DataFrame(feat_values, columns=feat_headers)
         return features
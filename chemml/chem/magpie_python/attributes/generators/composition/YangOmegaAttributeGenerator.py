@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 from ....data.materials.CompositionEntry import CompositionEntry
 from ....data.materials.util.LookUpData import LookUpData
+from chemml.utils import profiling
 
 class YangOmegaAttributeGenerator:
     """Class to compute the attributes :math:`\Omega` and :math:`\delta`
@@ -51,6 +52,7 @@ class YangOmegaAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -4,6 +4,7 @@ import pandas as pd
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
 from ....data.materials.util.LookUpData import LookUpData
 from ....vassal.analysis.APRDFAnalysis import APRDFAnalysis
+from chemml.utils import profiling
 
 class APRDFAttributeGenerator:
     """Class to generate attributes based on the Atomic Property Weighted
@@ -125,6 +126,7 @@ class APRDFAttributeGenerator:
 
         self.elemental_properties = []
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class ChemicalOrderingAttributeGenerator:
     """Class to compute attributes based on chemical ordering of structure.
@@ -80,6 +81,7 @@ class ChemicalOrderingAttributeGenerator:
 
         self.weighted = weighted
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -1,12 +1,14 @@
 import types
 import pandas as pd
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class CoordinationNumberAttributeGenerator:
     """Class to compute attributes based on the coordination number. Uses the
     Voronoi tessellation to define the coordination network.
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
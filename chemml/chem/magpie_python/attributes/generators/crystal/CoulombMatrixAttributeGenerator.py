@@ -4,6 +4,7 @@ import pandas as pd
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
 from ....models.regression.crystal.CoulombSineMatrixRegression import \
     CoulombSineMatrixRegression
+from chemml.utils import profiling
 
 class CoulombMatrixAttributeGenerator:
     """Class to compute attributes using the Coulomb Sine Matrix
@@ -61,6 +62,7 @@ class CoulombMatrixAttributeGenerator:
 
         self.n_eigenvalues = x
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
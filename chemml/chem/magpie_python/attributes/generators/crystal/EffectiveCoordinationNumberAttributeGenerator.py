@@ -2,6 +2,7 @@ import types
 import pandas as pd
 import numpy as np
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class EffectiveCoordinationNumberAttributeGenerator:
     """Compute attributes based on the effective coordination number.
@@ -61,6 +62,7 @@ class EffectiveCoordinationNumberAttributeGenerator:
         output = sum(diff) / n
         return output
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
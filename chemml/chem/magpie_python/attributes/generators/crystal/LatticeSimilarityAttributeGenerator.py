@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import types
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class LatticeSimilarityAttributeGenerator:
     """Compute similarity of structure to several simple lattices.
@@ -25,6 +26,7 @@ class LatticeSimilarityAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
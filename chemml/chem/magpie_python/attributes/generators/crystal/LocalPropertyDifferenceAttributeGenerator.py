@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
 from ....data.materials.util.LookUpData import LookUpData
+from chemml.utils import profiling
 
 class LocalPropertyDifferenceAttributeGenerator:
     """Class to compute attributes based on the difference in elemental
@@ -171,6 +172,7 @@ class LocalPropertyDifferenceAttributeGenerator:
 
         self.elemental_properties = []
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
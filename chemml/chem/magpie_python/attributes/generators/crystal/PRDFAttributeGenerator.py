@@ -5,6 +5,7 @@ import types
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
 from ....data.materials.util.LookUpData import LookUpData
 from ....models.regression.crystal.PRDFRegression import PRDFRegression
+from chemml.utils import profiling
 
 class PRDFAttributeGenerator:
     """Class to compute attributes based on the Pair Radial Distribution
@@ -119,6 +120,7 @@ class PRDFAttributeGenerator:
         else:
             self.element_list.append(LookUpData.element_names.index(name))
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
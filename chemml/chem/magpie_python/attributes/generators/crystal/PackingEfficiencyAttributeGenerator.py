@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import types
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class PackingEfficiencyAttributeGenerator:
     """Class to compute attributes based on packing efficiency.
@@ -18,6 +19,7 @@ class PackingEfficiencyAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import types
 from ....data.materials.CrystalStructureEntry import CrystalStructureEntry
+from chemml.utils import profiling
 
 class StructuralHeterogeneityAttributeGenerator:
     """Class to compute attributes based on heterogeneity in structure.
@@ -32,6 +33,7 @@ class StructuralHeterogeneityAttributeGenerator:
 
     """
 
+    @profiling.profiled()
     def generate_features(self, entries):
         """Function to generate features as mentioned in the class description.
 
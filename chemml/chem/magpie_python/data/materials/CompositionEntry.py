@@ -3,10 +3,19 @@ from builtins import zip
 from functools import total_ordering
 from future.utils import iteritems
 
+import concurrent.futures
+import functools
+import os
 import re
 # from itertools import izip
 from ...data.materials.util.LookUpData import LookUpData
 
+# Patterns of the composition parser, compiled once.
+_component_pattern = re.compile(r"[A-Z][^A-Z]*")
+_element_pattern = re.compile(r"[A-Z][a-z]?")
+_fraction_pattern = re.compile(r"[.0-9]+")
+_multiplier_pattern = re.compile(r"[.0-9]*")
+
 # Todo: add all the rich comparisons, using total_ordering comes with the cost of slower execution
 # check this link for more info: https://portingguide.readthedocs.io/en/latest/comparisons.html
 @total_ordering
@@ -19,6 +28,8 @@ class CompositionEntry(object):
     ----------
     lp_element_names : array-like
         Names of each element. A list of string values.
+    lp_element_ids : dict
+        Id of each element name.
     lp_sorting_order : array-like
         Rank of each element (used in display order). A list of int values.
     element_ids : array-like
@@ -35,6 +46,9 @@ class CompositionEntry(object):
     # Names of each element.
     lp_element_names = LookUpData.element_names
 
+    # Id of each element name.
+    lp_element_ids = LookUpData.element_ids
+
     # Rank of each element (used in display order).
     lp_sorting_order = LookUpData.sorting_order
 
@@ -125,8 +139,8 @@ class CompositionEntry(object):
         """
 
         # Check for a guest structure (ex: Al2O3-2H20).
-        start_guest = -1 if "-" not in composition else composition.index("-")
-        pos = -1 if chr(183) not in composition else composition.index(chr(183))
+        start_guest = composition.find("-")
+        pos = composition.find(chr(183))
 
         if pos != -1 and (pos < start_guest or start_guest == -1):
             start_guest = pos
@@ -135,14 +149,11 @@ class CompositionEntry(object):
         if start_guest == -1:
 
             # Check for ({['s
-            start_paren = -1 if '(' not in composition else composition.index(
-                '(')
-            pos = -1 if '{' not in composition else composition.index(
-                '{')
+            start_paren = composition.find('(')
+            pos = composition.find('{')
             if pos != -1 and (pos < start_paren or start_paren == -1):
                 start_paren = pos
-            pos = -1 if '[' not in composition else composition.index(
-                '[')
+            pos = composition.find('[')
             if pos != -1 and (pos < start_paren or start_paren == -1):
                 start_paren = pos
 
@@ -189,12 +200,8 @@ class CompositionEntry(object):
 
             # Get the multiplier of the composition inside the parens.
             end_paren = pos
-            pos += 1
-            mult = ""
-            while pos < len(composition) and (composition[pos].isdigit() or
-                                                  composition[pos] == "."):
-                mult += composition[pos]
-                pos += 1
+            mult = _multiplier_pattern.match(composition, pos + 1).group()
+            pos += 1 + len(mult)
 
             paren_mult = 1.0 if not mult else float(mult)
 
@@ -215,13 +222,9 @@ class CompositionEntry(object):
         else:
             # Find how many guests.
             end_host = start_guest
-            pos = start_guest + 1
-            mult = ""
-            while pos < len(composition) and (composition[pos].isdigit() or
-                                                  composition[pos] == "."):
-                mult += composition[pos]
-                pos += 1
-            start_guest = pos
+            mult = _multiplier_pattern.match(composition,
+                                             start_guest + 1).group()
+            start_guest += 1 + len(mult)
             guest_mult = 1.0 if not mult else float(mult)
 
             # Split compound.
@@ -317,25 +320,22 @@ class CompositionEntry(object):
         tmp_entry = {}
 
         # Add up all the constituents.
-        comp_iter = re.compile(r"[A-Z][^A-Z]*").finditer(composition)
-        elem_pattern = re.compile(r"[A-Z][a-z]?")
-        fraction_pattern = re.compile(r"[.0-9]+")
-        for comp in comp_iter:
+        for comp in _component_pattern.finditer(composition):
             component = comp.group()
 
             # Get the element information.
-            elem_matcher = elem_pattern.match(component)
+            elem_matcher = _element_pattern.match(component)
             if not elem_matcher:
                 raise ValueError("Something has gone horribly wrong!")
             element = elem_matcher.group()
             if element == "D" or element == "T":
                 element = "H"
-            if element not in self.lp_element_names:
+            element_id = self.lp_element_ids.get(element)
+            if element_id is None:
                 raise ValueError("Element "+element+" not recognized")
-            element_id = self.lp_element_names.index(element)
 
             # Get the amount of this element.
-            fraction_matcher = fraction_pattern.search(component)
+            fraction_matcher = _fraction_pattern.search(component)
             fraction = 1.0
             if fraction_matcher:
                 try:
@@ -654,12 +654,72 @@ class CompositionEntry(object):
             A list of CompositionEntry's corresponding to the file contents.
 
         """
-        composition_list = []
         with open(file_path, 'r') as f:
-            for line in f.readlines():
-                words = line.strip()
-                entry = CompositionEntry(composition=words)
-                composition_list.append(entry)
+            formulas = [line.strip() for line in f]
+
+        return CompositionEntry.from_formulas(formulas)
+
+    @classmethod
+    def from_formulas(self, formulas, n_jobs=1, batch_size=10000):
+        """Function to create CompositionEntry's from many chemical formulas.
+
+        Each distinct formula is parsed only once, and the parsed formulas are
+        kept in a process-wide LRU cache, since the datasets usually repeat
+        the same compositions.
+
+        Parameters
+        ----------
+        formulas : array-like
+            A list (or any iterable) of chemical formulas (str).
+        n_jobs : int
+            The number of worker processes to parse the distinct formulas
+            with. If -1, all the cores are used. With more than one process,
+            the formulas are parsed (and cached) in the worker processes only,
+            thus the LRU cache of the calling process is not filled.
+        batch_size : int
+            The number of formulas that are parsed by a worker process at
+            once.
+
+        Returns
+        -------
+        composition_list : array-like
+            A list of CompositionEntry's corresponding to the formulas.
+
+        Raises
+        ------
+        RuntimeError
+            If composition parsing was unsuccessful.
+        ValueError
+            If an element or an amount is not recognized.
+
+        """
+
+        formulas = list(formulas)
+        unique = list(dict.fromkeys(formulas))
+        batches = [unique[i:i + batch_size] for i in range(0, len(unique),
+                                                            batch_size)]
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs > 1 and len(batches) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=n_jobs) as executor:
+                results = list(executor.map(_parse_formulas, batches))
+        else:
+            results = [_parse_formulas(batch) for batch in batches]
+        parsed = {}
+        for batch, result in zip(batches, results):
+            parsed.update(zip(batch, result))
+
+        composition_list = []
+        for formula in formulas:
+            element_ids, element_names, fractions, number_in_cell = \
+                parsed[formula]
+            entry = CompositionEntry()
+            entry.element_ids = list(element_ids)
+            entry.element_names = list(element_names)
+            entry.fractions = list(fractions)
+            entry.number_in_cell = number_in_cell
+            composition_list.append(entry)
 
         return composition_list
 
@@ -688,3 +748,27 @@ class CompositionEntry(object):
                 property_list.append(float(line.strip()))
 
         return property_list
+
+
+@functools.lru_cache(maxsize=2 ** 17)
+def _parse_formula(composition):
+    """Function to parse a chemical formula, with a cache of the results.
+
+    Returns
+    -------
+    output : tuple
+        The element ids, names and fractions (as tuples, so that the cached
+        results can't be modified) and the number of atoms in cell.
+
+    """
+
+    entry = CompositionEntry(composition=composition)
+    return (tuple(entry.element_ids), tuple(entry.element_names),
+            tuple(entry.fractions), entry.number_in_cell)
+
+
+def _parse_formulas(formulas):
+    """Function to parse a batch of chemical formulas (in a worker process).
+    """
+
+    return [_parse_formula(formula) for formula in formulas]
@@ -0,0 +1,284 @@
+import numpy as np
+from scipy import sparse
+
+from .LookUpData import LookUpData
+
+class CompositionMatrix:
+    """Class to compute the fraction-weighted statistics of elemental
+    properties for many compositions at once.
+
+    The compositions are stored once as a sparse (n_entries, n_elements)
+    matrix of element fractions, in the CSR format. The statistics of a
+    property are then computed with a sparse matrix-vector product (mean) and
+    with reductions over the elements stored in each row (maximum, minimum,
+    etc.), instead of a Python loop over the entries.
+
+    The elements of an entry are the stored elements of its row, even if
+    their fraction is zero, as in CompositionEntry.get_element_ids. The
+    statistics are NaN for the entries without any element.
+
+    Parameters
+    ----------
+    entries : array-like
+        A list of CompositionEntry's.
+
+    Attributes
+    ----------
+    fractions : scipy.sparse.csr_matrix
+        The element fractions of the entries, shape: (n_entries, n_elements).
+    n_entries : int
+        Number of entries.
+
+    """
+
+    def __init__(self, entries):
+        """Function to create instance and build the fraction matrix.
+
+        Parameters
+        ----------
+        entries : array-like
+            A list of CompositionEntry's.
+
+        """
+
+        n_elements = [len(entry.get_element_ids()) for entry in entries]
+        indptr = np.zeros(len(entries) + 1, dtype=np.int64)
+        np.cumsum(n_elements, out=indptr[1:])
+        indices = np.fromiter((elem for entry in entries for elem in
+                               entry.get_element_ids()), dtype=np.int64,
+                              count=indptr[-1])
+        data = np.fromiter((f for entry in entries for f in
+                            entry.get_element_fractions()), dtype=float,
+                           count=indptr[-1])
+        self.fractions = sparse.csr_matrix(
+            (data, indices, indptr),
+            shape=(len(entries), len(LookUpData.element_names)))
+        self.n_entries = len(entries)
+
+        # Row of each stored element, and the entries with elements (the
+        # reductions are only defined for non-empty segments).
+        self._rows = np.repeat(np.arange(self.n_entries), n_elements)
+        self._nonempty = np.diff(indptr) > 0
+        self._starts = indptr[:-1][self._nonempty]
+        self._weights = self._reduce(np.add, data)
+
+    def _reduce(self, ufunc, values):
+        """Function to reduce the per-element values of each entry.
+
+        Parameters
+        ----------
+        ufunc : numpy.ufunc
+            The reduction, e.g. np.add or np.maximum.
+        values : array-like
+            The values of the stored elements, in the order of the fraction
+            matrix data.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the reduced values of each entry (NaN for the
+            empty entries).
+
+        """
+
+        output = np.full(self.n_entries, np.nan)
+        if len(self._starts) > 0:
+            output[self._nonempty] = ufunc.reduceat(values, self._starts)
+        return output
+
+    def element_values(self, values):
+        """Function to look up a property for each stored element.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements (e.g. from
+            LookUpData.load_property).
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the property values of the stored elements, in the
+            order of the fraction matrix data.
+
+        """
+
+        return np.asarray(values, dtype=float)[self.fractions.indices]
+
+    def n_components(self):
+        """Function to count the elements with a non-zero fraction.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array (int) of the number of components of each entry.
+
+        """
+
+        return np.bincount(self._rows[self.fractions.data > 0],
+                           minlength=self.n_entries)
+
+    def norm(self, p):
+        """Function to compute the Lp norm of the fractions.
+
+        Parameters
+        ----------
+        p : int
+            The exponent of the norm.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the norm of each entry.
+
+        """
+
+        powers = self.fractions.copy()
+        powers.data = powers.data ** p
+        return np.asarray(powers.sum(axis=1)).ravel() ** (1.0 / p)
+
+    def mean(self, values):
+        """Function to compute the fraction-weighted mean of a property.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the mean of each entry (NaN if any of its
+            elements is missing the property).
+
+        """
+
+        # The product only involves the stored elements, so a missing value
+        # of an element absent from an entry doesn't propagate to it.
+        return self.fractions.dot(np.asarray(values, dtype=float)) / \
+            self._weights
+
+    def means(self, values):
+        """Function to compute the fraction-weighted means of several
+        properties with a single sparse matrix product.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements, shape:
+            (n_elements, n_properties).
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the means, shape: (n_entries, n_properties).
+
+        """
+
+        values = np.asarray(values, dtype=float)
+        return np.asarray(self.fractions.dot(values)) / \
+            self._weights[:, np.newaxis]
+
+    def deviation(self, values, mean=None):
+        """Function to compute the fraction-weighted mean absolute deviation
+        of a property.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+        mean : array-like
+            The means of the entries, if already computed.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the mean absolute deviation of each entry.
+
+        """
+
+        if mean is None:
+            mean = self.mean(values)
+        dev = np.abs(self.element_values(values) - mean[self._rows])
+        return self._reduce(np.add, self.fractions.data * dev) / self._weights
+
+    def maximum(self, values):
+        """Function to compute the maximum of a property.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the maximum of each entry.
+
+        """
+
+        return self._reduce(np.maximum, self.element_values(values))
+
+    def minimum(self, values):
+        """Function to compute the minimum of a property.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the minimum of each entry.
+
+        """
+
+        return self._reduce(np.minimum, self.element_values(values))
+
+    def most(self, values):
+        """Function to compute the mean property value of the elements with
+        the largest fraction.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+
+        Returns
+        -------
+        output : array-like
+            A numpy array of the property of the most common element of each
+            entry.
+
+        """
+
+        data = self.fractions.data
+        is_most = data >= self._reduce(np.maximum, data)[self._rows]
+        elem_values = np.where(is_most, self.element_values(values), 0)
+        return self._reduce(np.add, elem_values) / self._reduce(
+            np.add, is_most.astype(float))
+
+    def missing(self, values):
+        """Function to find the entries with elements missing a property.
+
+        Parameters
+        ----------
+        values : array-like
+            Property values of all the elements.
+
+        Returns
+        -------
+        rows : array-like
+            A boolean numpy array, True for the entries with a missing value.
+        elements : array-like
+            The ids of the elements with a missing value, in the order of their
+            first appearance.
+
+        """
+
+        is_nan = np.isnan(self.element_values(values))
+        rows = self._reduce(np.logical_or, is_nan) == 1
+        ids = self.fractions.indices[is_nan]
+        _, first = np.unique(ids, return_index=True)
+        return rows, ids[np.sort(first)]
@@ -1,10 +1,11 @@
 from __future__ import print_function
-from builtins import range
 
-import numpy as np
-import sys
 import os
 
+import numpy as np
+
+from .PropertyStore import PropertyStore
+
 class LookUpData:
     """Class to look up properties of elements stored in files.
 
@@ -154,32 +155,10 @@ class LookUpData:
 
         # IonizationEnergies and OxidationStates are 2-D arrays. So treat
         # them differently.
-        if property == "IonizationEnergies" or property == "OxidationStates":
+        if property in PropertyStore.special_properties:
             return self.load_special_property(property)
-
-        # Initialize the numpy array.
-        values = np.zeros(len(self.element_ids), dtype=np.float)
-        values.fill(np.nan)
-
-        # Property file name.
-        file = self.abs_path + property + ".table"
-        try:
-            prop_file = open(file, 'r')
-        except IOError:
-            raise IOError("File {} doesn't exist!!! Please make sure you " \
-                  "specify the correct file name".format(file))
-
-        else:
-            for i in range(values.size):
-                line = prop_file.readline().strip()
-                try:
-                    values[i] = float(line)
-                except ValueError:
-                    # Line is a string, which implies that data is missing.
-                    # So we let the value of NaN stay.
-                    continue
-            prop_file.close()
-        return values
+        # A copy of the read-only array of the process-wide store.
+        return np.array(PropertyStore.get().property(property))
 
     @classmethod
     def load_pair_property(self, property):
@@ -194,7 +173,8 @@ class LookUpData:
         -------
         values : array-like
             A 2-D numpy array containing the property values for all the
-            elements.
+            elements. The values of a pair are stored in
+            values[max(elemA, elemB)][min(elemA, elemB)].
 
         Raises
         ------
@@ -203,35 +183,11 @@ class LookUpData:
 
         """
 
-        # Initialize the 2-D numpy array.
+        # The lower triangle of the symmetric table of the store.
+        table = PropertyStore.get().pair_property(property)
         values = np.zeros(len(self.element_ids), dtype=object)
         for i in range(len(self.element_ids)):
-            values[i] = np.zeros(i, dtype=float)
-
-        # Property file name.
-        file = self.pair_abs_path + property + ".table"
-
-        try:
-            prop_file = open(file, 'r')
-        except IOError:
-            raise IOError("File {} doesn't exist!!! Please make sure you " \
-                  "specify the correct file name".format(file))
-        else:
-            for line in prop_file.readlines():
-                words = line.strip().split()
-                if len(words) < 3:
-                    continue
-                else:
-                    if words[0] not in self.element_ids or words[1] not in \
-                            self.element_ids:
-                        continue
-                    elemA = self.element_ids[words[0]]
-                    elemB = self.element_ids[words[1]]
-                    if words[2].endswith("\n"):
-                        print(line)
-                        sys.exit(1)
-                    values[max(elemA,elemB)][min(elemA,elemB)] = float(words[2])
-            prop_file.close()
+            values[i] = np.array(table[i, :i])
         return values
 
     @classmethod
@@ -306,28 +262,8 @@ class LookUpData:
             If property table doesn't exist.
 
         """
-        # Property file name.
-        file = self.abs_path + property + ".table"
-
-        # Initialize the list.
-        tmp_values = []
-
-        try:
-            prop_file = open(file, 'r')
-        except IOError:
-            print ("File {} doesn't exist!!! Please make sure you " \
-                  "specify the correct file name".format(file))
-            sys.exit(1)
-        else:
-            for line in prop_file.readlines():
-                words = line.strip().split()
-                tmp_list = []
-                for word in words:
-                    tmp_list.append(float(word))
-                tmp_values.append(tmp_list)
-            prop_file.close()
-
-        values = np.zeros(len(tmp_values), dtype=object)
-        for i in range(len(tmp_values)):
-            values[i] = np.asarray(tmp_values[i], dtype=float)
-        return values
\ No newline at end of file
+        special = PropertyStore.get().special_property(property)
+        values = np.zeros(len(special), dtype=object)
+        for i in range(len(special)):
+            values[i] = np.array(special[i])
+        return values
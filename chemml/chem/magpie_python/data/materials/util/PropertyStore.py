@@ -0,0 +1,294 @@
+import glob
+import os
+import threading
+
+import numpy as np
+
+from chemml.utils import memmap_npz
+
+
+class PropertyStore:
+    """Class to access all the elemental and pair property lookup tables,
+    compiled once into a single binary file.
+
+    The text tables of magpie_python/lookup-data/ are parsed once per process
+    on the first use, and all the lookups return shared read-only views (the
+    public LookUpData methods return copies). If use_cache is True, the
+    parsed tables are also stored as one uncompressed numpy archive in the
+    user cache directory (chemml.datasets.get_cache_dir, which can be set with
+    the CHEMML_CACHE_DIR environment variable), validated by a hash of the
+    tables, and the archive is memory-mapped afterwards, thus the tables are
+    only parsed once and their memory is shared by all the processes.
+
+    Parameters
+    ----------
+    arrays : dict
+        The arrays of the store, as created by the compile_arrays method:
+            - 'properties': the names of the elemental properties
+            - 'elemental': the values of the elemental properties, shape:
+              (n_properties, n_elements)
+            - 'pair_properties': the names of the pair properties
+            - 'pair': the symmetric tables of the pair properties, shape:
+              (n_pair_properties, n_elements, n_elements)
+            - '<special>_values' and '<special>_offsets': the concatenated
+              rows of the ragged special properties and their boundaries
+
+    Attributes
+    ----------
+    lookup_dir : str
+        Absolute path to the lookup-data directory.
+    special_properties : array-like
+        The properties with a variable number of values per element.
+    use_cache : bool
+        If True, the compiled store is written to (and memory-mapped from) the
+        user cache directory. False by default, so no file is written; set it
+        before the first lookup, e.g. PropertyStore.use_cache = True.
+    """
+
+    lookup_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "..", "..", "..", "lookup-data")
+    special_properties = ["IonizationEnergies", "OxidationStates"]
+    use_cache = False
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        for array in arrays.values():
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        self.property_index = {name: i for i, name in
+                               enumerate(arrays['properties'])}
+        self.pair_property_index = {name: i for i, name in
+                                    enumerate(arrays['pair_properties'])}
+        self._special = {}
+
+    @classmethod
+    def get(cls):
+        """Function to get the process-wide store, which is compiled on the
+        first call (or memory-mapped from the cache, if use_cache is True).
+
+        Returns
+        -------
+        store : PropertyStore
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls._open()
+        return cls._instance
+
+    @classmethod
+    def _open(cls):
+        if not cls.use_cache:
+            return cls(cls.compile_arrays())
+        # imported here, as chemml.datasets imports chemml.chem
+        from chemml.datasets.cache import cache_path, write_cached
+        path = cache_path('magpie_lookup', cls.source_files(), '.npz')
+        if not os.path.exists(path):
+            arrays = cls.compile_arrays()
+            write_cached(path, lambda f: np.savez(f, **arrays))
+            if not os.path.exists(path):
+                # the cache directory is not writable
+                return cls(arrays)
+        return cls.load(path)
+
+    @classmethod
+    def source_files(cls, lookup_dir=None):
+        """Function to list the text tables of the lookup-data directory.
+        """
+        lookup_dir = lookup_dir or cls.lookup_dir
+        return sorted(glob.glob(os.path.join(lookup_dir, "*.table")) +
+                      glob.glob(os.path.join(lookup_dir, "pair", "*.table")))
+
+    @classmethod
+    def load(cls, filename):
+        """Function to memory-map a compiled store.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the archive created with the compile method.
+
+        Returns
+        -------
+        store : PropertyStore
+        """
+        with np.load(filename) as archive:
+            names = archive.files
+        arrays = {name: memmap_npz(filename, name) for name in names}
+        arrays['properties'] = [str(p) for p in arrays['properties']]
+        arrays['pair_properties'] = [str(p) for p in
+                                     arrays['pair_properties']]
+        return cls(arrays)
+
+    @classmethod
+    def compile(cls, filename, lookup_dir=None):
+        """Function to parse all the lookup tables and store them in a single
+        uncompressed numpy archive.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the archive file.
+        lookup_dir : str
+            Path to the lookup-data directory (the one of the package by
+            default).
+        """
+        np.savez(filename, **cls.compile_arrays(lookup_dir))
+
+    @classmethod
+    def compile_arrays(cls, lookup_dir=None):
+        """Function to parse all the lookup tables.
+
+        Parameters
+        ----------
+        lookup_dir : str
+            Path to the lookup-data directory (the one of the package by
+            default).
+
+        Returns
+        -------
+        arrays : dict
+            The arrays of the store, as described in the class docstring.
+        """
+        from .LookUpData import LookUpData
+        lookup_dir = lookup_dir or cls.lookup_dir
+        element_ids = LookUpData.element_ids
+        n_elements = len(LookUpData.element_names)
+        arrays = {}
+
+        names = []
+        elemental = []
+        pair_names = []
+        pair = []
+        for path in cls.source_files(lookup_dir):
+            name = os.path.basename(path)[:-len(".table")]
+            with open(path, 'r') as f:
+                lines = f.read().splitlines()
+            if os.path.basename(os.path.dirname(path)) == "pair":
+                # Symmetric table, zero for the missing pairs.
+                values = np.zeros((n_elements, n_elements))
+                for line in lines:
+                    words = line.split()
+                    if len(words) < 3 or words[0] not in element_ids or \
+                            words[1] not in element_ids:
+                        continue
+                    a, b = element_ids[words[0]], element_ids[words[1]]
+                    values[a, b] = values[b, a] = float(words[2])
+                pair_names.append(name)
+                pair.append(values)
+            elif name in cls.special_properties:
+                rows = [[float(word) for word in line.split()] for line in
+                        lines]
+                arrays[name + "_values"] = np.array(
+                    [value for row in rows for value in row], dtype=float)
+                arrays[name + "_offsets"] = np.cumsum(
+                    [0] + [len(row) for row in rows]).astype(np.int64)
+            else:
+                # Missing (non-numeric) values are NaN.
+                values = np.full(n_elements, np.nan)
+                for i, line in enumerate(lines[:n_elements]):
+                    try:
+                        values[i] = float(line.strip())
+                    except ValueError:
+                        continue
+                names.append(name)
+                elemental.append(values)
+
+        arrays['properties'] = np.array(names)
+        arrays['elemental'] = np.array(elemental, dtype=float).reshape(
+            len(names), n_elements)
+        arrays['pair_properties'] = np.array(pair_names)
+        arrays['pair'] = np.array(pair, dtype=float).reshape(
+            len(pair_names), n_elements, n_elements)
+        return arrays
+
+    def property(self, name):
+        """Function to look up the values of an elemental property.
+
+        Parameters
+        ----------
+        name : str
+            Property name (the name of its table).
+
+        Returns
+        -------
+        values : array-like
+            A read-only numpy array of the property values of all the
+            elements (NaN for the missing values), or an array of read-only
+            arrays for the special properties.
+
+        Raises
+        ------
+        IOError
+            If the property table doesn't exist.
+        """
+        if name in self.special_properties:
+            return self.special_property(name)
+        if name not in self.property_index:
+            raise IOError("File {} doesn't exist!!! Please make sure you "
+                          "specify the correct file name".format(
+                              os.path.join(self.lookup_dir, name + ".table")))
+        return self.arrays['elemental'][self.property_index[name]]
+
+    def pair_property(self, name):
+        """Function to look up the values of a pair property.
+
+        Parameters
+        ----------
+        name : str
+            Property name (the name of its table).
+
+        Returns
+        -------
+        values : array-like
+            A read-only symmetric 2-D numpy array of the property values of
+            all the pairs of elements (zero for the missing pairs).
+
+        Raises
+        ------
+        IOError
+            If the property table doesn't exist.
+        """
+        if name not in self.pair_property_index:
+            raise IOError("File {} doesn't exist!!! Please make sure you "
+                          "specify the correct file name".format(
+                              os.path.join(self.lookup_dir, "pair",
+                                           name + ".table")))
+        return self.arrays['pair'][self.pair_property_index[name]]
+
+    def special_property(self, name):
+        """Function to look up the values of IonizationEnergies or
+        OxidationStates, which have a variable number of values per element.
+
+        Parameters
+        ----------
+        name : str
+            Property name.
+
+        Returns
+        -------
+        values : array-like
+            A read-only numpy array of objects, containing one read-only
+            array of values per element.
+
+        Raises
+        ------
+        IOError
+            If the property table doesn't exist.
+        """
+        if name + "_values" not in self.arrays:
+            raise IOError("File {} doesn't exist!!! Please make sure you "
+                          "specify the correct file name".format(
+                              os.path.join(self.lookup_dir, name + ".table")))
+        if name not in self._special:
+            flat = self.arrays[name + "_values"]
+            offsets = self.arrays[name + "_offsets"]
+            values = np.empty(len(offsets) - 1, dtype=object)
+            for i in range(len(values)):
+                values[i] = flat[offsets[i]:offsets[i + 1]]
+            values.flags.writeable = False
+            self._special[name] = values
+        return self._special[name]
@@ -5,6 +5,8 @@ The chemml.datasets module includes (please click on links adjacent to function
     - load_xyz_polarizability: :func:`~chemml.datasets.load_xyz_polarizability`
     - load_comp_energy: :func:`~chemml.datasets.load_comp_energy`
     - load_crystal_structures: :func:`~chemml.datasets.load_crystal_structures`
+    - get_cache_dir: :func:`~chemml.datasets.get_cache_dir`
+    - clear_cache: :func:`~chemml.datasets.clear_cache`
 """
 
 from .base import load_cep_homo
@@ -12,12 +14,16 @@ from .base import load_organic_density
 from .base import load_xyz_polarizability
 from .base import load_comp_energy
 from .base import load_crystal_structures
+from .cache import get_cache_dir
+from .cache import clear_cache
 
 __all__ = [
     'load_cep_homo',
     'load_organic_density',
     'load_xyz_polarizability',
     'load_comp_energy',
-    'load_crystal_structures'
+    'load_crystal_structures',
+    'get_cache_dir',
+    'clear_cache'
 ]
 
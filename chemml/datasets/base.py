@@ -4,8 +4,10 @@ import os
 import pandas as pd
 
 from chemml.chem import Molecule
+from chemml.datasets.cache import cached_object, cached_array, cache_path, LazyEntries, write_cached
 
-def load_cep_homo():
+
+def load_cep_homo(cache=True):
     """Load and return a small sample of HOMO energies of organic photovoltaic candidates from CEP database (regression).
     Clean Energy Project (CEP) database is available at: https://cepdb.molecularspace.org
     The unit of HOMO (highest occupied molecular orbitals) energies is electron Volt (eV).
@@ -20,6 +22,12 @@ def load_cep_homo():
     Returns               2 dataframes
     =================   ==============
 
+    Parameters
+    ----------
+    cache: bool, optional (default = True)
+        If True, the dataset is parsed once and stored in the user cache directory
+        (chemml.datasets.cache.get_cache_dir), and loaded from there afterwards.
+
     Returns
     -------
     pandas dataframe
@@ -38,7 +46,10 @@ def load_cep_homo():
     (500, 1)
     """
     DATA_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets','data','cep_homo.csv'))
-    df = pd.read_csv(DATA_PATH)
+    if cache:
+        df = cached_object('cep_homo', [DATA_PATH], lambda: pd.read_csv(DATA_PATH))
+    else:
+        df = pd.read_csv(DATA_PATH)
 
     smi = pd.DataFrame(df['smiles'], columns=['smiles'])
     homo = pd.DataFrame(df['homo_eV'], columns=['homo_eV'])
@@ -46,7 +57,7 @@ def load_cep_homo():
     return smi, homo
 
 
-def load_organic_density():
+def load_organic_density(cache=True, lazy=False):
     """Load and return 500 small organic molecules with their density and molecular descriptors.
 
     =================   ======================
@@ -58,6 +69,17 @@ def load_organic_density():
     Returns                       3 dataframes
     =================   ======================
 
+    Parameters
+    ----------
+    cache: bool, optional (default = True)
+        If True, the dataset is parsed once and stored in the user cache directory
+        (chemml.datasets.cache.get_cache_dir), and loaded from there afterwards.
+
+    lazy: bool, optional (default = False)
+        If True, the molecular descriptors are a read-only view of a memory-mapped float64 array in the cache,
+        instead of being loaded in memory (all the columns are float64 in this case). The lazy loading requires
+        the cache, thus a ValueError is raised if cache is False.
+
     Returns
     -------
     pandas dataframe
@@ -79,16 +101,40 @@ def load_organic_density():
     (500, 200)
     """
     DATA_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets','data','moldescriptor_density_smiles.csv'))
-    df = pd.read_csv(DATA_PATH)
+    if lazy:
+        if not cache:
+            msg = "The lazy loading of the organic density dataset requires the cache (cache=True)."
+            raise ValueError(msg)
+        targets, columns = cached_object('organic_density_targets', [DATA_PATH], lambda: _organic_density_targets(DATA_PATH))
+        values = cached_array('organic_density_features', [DATA_PATH],
+                              lambda: pd.read_csv(DATA_PATH, usecols=columns).values.astype(float))
+        smi = targets[['smiles']]
+        density = targets[['density_Kg/m3']]
+        features = pd.DataFrame(values, columns=columns, copy=False)
+        return smi, density, features
+
+    if cache:
+        df = cached_object('organic_density', [DATA_PATH], lambda: pd.read_csv(DATA_PATH))
+    else:
+        df = pd.read_csv(DATA_PATH)
 
     smi = pd.DataFrame(df['smiles'], columns=['smiles'])
     density = pd.DataFrame(df['density_Kg/m3'], columns=['density_Kg/m3'])
-    features = df.drop(['smiles', 'density_Kg/m3'],1)
+    features = df.drop(['smiles', 'density_Kg/m3'], axis=1)
 
     return smi, density, features
 
 
-def load_xyz_polarizability():
+def _organic_density_targets(path):
+    """
+    returns the smiles and density columns of the organic density dataset, and the headers of its descriptors.
+    """
+    df = pd.read_csv(path)
+    columns = [c for c in df.columns if c not in ('smiles', 'density_Kg/m3')]
+    return df[['smiles', 'density_Kg/m3']], columns
+
+
+def load_xyz_polarizability(packed=False, cache=True, lazy=False):
     """Load and return xyz files and polarizability (Bohr^3).
     The xyz coordinates of small organic molecules are optimized with BP86/def2svp level of theory.
     Polarizability of the molecules are also calcualted in the same level of thoery.
@@ -102,10 +148,26 @@ def load_xyz_polarizability():
     Returns             1 dataframe and 1 dict
     =================   ======================
 
+    Parameters
+    ----------
+    packed: bool or str, optional (default = False)
+        If True, the geometries are parsed directly (without openbabel) and returned as a
+        chemml.initialization.PackedGeometries object. If str, it's the path to a packed geometry archive
+        (chemml.initialization.pack_xyz) of the molecules, which is created if it doesn't exist and memory-mapped otherwise.
+
+    cache: bool, optional (default = True)
+        If True and packed is True, the packed geometries are stored in the user cache directory
+        (chemml.datasets.cache.get_cache_dir) on the first call, and memory-mapped from there afterwards.
+
+    lazy: bool, optional (default = False)
+        If True, the molecules are returned as a chemml.datasets.cache.LazyEntries sequence, and each
+        chemml.chem.Molecule object is only created when it's accessed.
+
     Returns
     -------
-    dictionary
-        The xyz coordinates and atomic numbers of each atom of the molecule will be in a numpy array.
+    list, LazyEntries or PackedGeometries
+        The list of chemml.chem.Molecule objects with the xyz coordinates and atomic numbers of each atom of the molecule,
+        or the packed geometries of all the molecules.
 
     pandas dataframe
         The polarizability of each molecule as a column of dataframe.
@@ -126,16 +188,37 @@ def load_xyz_polarizability():
     #                    reader='manual',
     #                    skip_lines=[2, 0])
     # molecules = reader.read()
+    df = pd.read_csv(os.path.join(DATA_PATH,'pol.csv'))
+    files = [os.path.join(DATA_PATH, "%i_opt.xyz" % i) for i in range(1, 51)]
+    if packed:
+        from chemml.initialization import PackedGeometries, pack_xyz
+        patterns = ['[1-9]_opt.xyz', '[1-9][0-9]_opt.xyz']
+        if isinstance(packed, str):
+            if os.path.exists(packed):
+                return PackedGeometries.load(packed), df
+            return pack_xyz(patterns, packed, path_root=DATA_PATH), df
+        from chemml.initialization import XYZreader
+        if cache:
+            archive = cache_path('xyz_polarizability', files, '.npz')
+            if os.path.exists(archive):
+                return PackedGeometries.load(archive), df
+            geometries = XYZreader(patterns, path_root=DATA_PATH).read_packed()
+            write_cached(archive, geometries.save)
+            return geometries, df
+        return XYZreader(patterns, path_root=DATA_PATH).read_packed(), df
+
+    if lazy:
+        return LazyEntries(files, lambda path: Molecule(path, "xyz")), df
+
     molecules = []
-    for i in range(1,51):
-        molecule = Molecule(os.path.join(DATA_PATH,"%i_opt.xyz"%i), "xyz")
+    for path in files:
+        molecule = Molecule(path, "xyz")
         molecules.append(molecule)
 
-    df = pd.read_csv(os.path.join(DATA_PATH,'pol.csv'))
     return molecules, df
 
 
-def load_comp_energy():
+def load_comp_energy(cache=True, lazy=False):
     """Load and return composition entries and formation energies (eV).
     From Magpie https://bitbucket.org/wolverton/magpie
 
@@ -147,9 +230,19 @@ def load_comp_energy():
     Returns             1 dataframe and 1 list
     =================   ======================
 
+    Parameters
+    ----------
+    cache: bool, optional (default = True)
+        If True, the entries are parsed once and pickled in the user cache directory
+        (chemml.datasets.cache.get_cache_dir), and loaded from there afterwards.
+
+    lazy: bool, optional (default = False)
+        If True, the entries are returned as a chemml.datasets.cache.LazyEntries sequence, and each
+        CompositionEntry is only parsed when it's accessed.
+
     Returns
     -------
-    list
+    list or LazyEntries
         The list of composition entries from CompositionEntry class.
 
     pandas dataframe
@@ -165,13 +258,21 @@ def load_comp_energy():
     DATA_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets', 'data', 'magpie_python_test', 'small_set_comp.txt'))
     TARGET_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets', 'data', 'magpie_python_test', 'small_set_delta_e.txt'))
     from chemml.chem.magpie_python import CompositionEntry
-    entries = CompositionEntry.import_composition_list(DATA_PATH)
     df = pd.read_csv(TARGET_PATH,header=None)
     df.columns = ['formation_energy']
+    if lazy:
+        with open(DATA_PATH, 'r') as f:
+            compositions = [line.strip() for line in f]
+        return LazyEntries(compositions, lambda composition: CompositionEntry(composition=composition)), df
+    if cache:
+        entries = cached_object('comp_energy', [DATA_PATH],
+                                lambda: CompositionEntry.import_composition_list(DATA_PATH))
+    else:
+        entries = CompositionEntry.import_composition_list(DATA_PATH)
     return entries, df
 
 
-def load_crystal_structures():
+def load_crystal_structures(cache=True, lazy=False):
     """Load and return crystal structure entries.
     From Magpie https://bitbucket.org/wolverton/magpie
 
@@ -183,9 +284,19 @@ def load_crystal_structures():
     Returns                             1 list
     =================   ======================
 
+    Parameters
+    ----------
+    cache: bool, optional (default = True)
+        If True, the entries are built once and pickled in the user cache directory
+        (chemml.datasets.cache.get_cache_dir), and loaded from there afterwards.
+
+    lazy: bool, optional (default = False)
+        If True, the entries are returned as a chemml.datasets.cache.LazyEntries sequence, and each
+        CrystalStructureEntry is only built (and its structure parsed) when it's accessed.
+
     Returns
     -------
-    list
+    list or LazyEntries
         The list of crystal structure entries from CrystalStructureEntry class.
 
     Examples
@@ -197,6 +308,24 @@ def load_crystal_structures():
     """
     DATA_PATH = pkg_resources.resource_filename('chemml', os.path.join('datasets', 'data', 'magpie_python_test'))
     from chemml.chem.magpie_python import CrystalStructureEntry
+    if lazy:
+        from chemml.chem.magpie_python.data.materials.util.LookUpData import LookUpData
+        from chemml.chem.magpie_python.vassal.io.VASP5IO import VASP5IO
+        io = VASP5IO()
+        radii = []
+
+        def build(f):
+            if len(radii) == 0:
+                radii.append(LookUpData.load_property("CovalentRadius"))
+            return CrystalStructureEntry(io.parse_file(os.path.join(DATA_PATH, f)), name=f.split(".vasp")[0],
+                                         radii=radii[0])
+
+        files = [f for f in os.listdir(DATA_PATH) if f.endswith(".vasp") and os.path.isfile(os.path.join(DATA_PATH, f))]
+        return LazyEntries(files, build)
+    if cache:
+        sources = [os.path.join(DATA_PATH, f) for f in os.listdir(DATA_PATH) if f.endswith(".vasp")]
+        return cached_object('crystal_structures', sources,
+                             lambda: CrystalStructureEntry.import_structures_list(DATA_PATH))
     entries = CrystalStructureEntry.import_structures_list(DATA_PATH)
     return entries
 
@@ -0,0 +1,236 @@
+from __future__ import print_function
+import os
+import glob
+import hashlib
+import pickle
+import tempfile
+import warnings
+
+import numpy as np
+
+from chemml import __version__
+
+# bump this when the format of the cached files changes
+CACHE_VERSION = 1
+
+
+def get_cache_dir():
+    """
+    returns the directory of the cached datasets. It's the CHEMML_CACHE_DIR environment variable if it's set, and
+    'chemml/datasets' in the user cache directory (XDG_CACHE_HOME or ~/.cache) otherwise.
+
+    Returns
+    -------
+    str
+        The path to the cache directory (it may not exist yet).
+    """
+    path = os.environ.get('CHEMML_CACHE_DIR')
+    if path:
+        return path
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'chemml', 'datasets')
+
+
+def clear_cache(name=None):
+    """
+    remove the cached datasets.
+
+    Parameters
+    ----------
+    name: str, optional (default=None)
+        The name of the dataset (e.g. 'comp_energy'). If None, all the cached datasets are removed.
+
+    Returns
+    -------
+    list
+        The paths of the removed files.
+    """
+    removed = []
+    for path in glob.glob(os.path.join(get_cache_dir(), '%s-*' % (name or '*'))):
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def source_hash(sources):
+    """
+    returns a hash of the contents of the source files of a dataset and of the chemml version, used to validate its
+    cached files (the cached objects may not be compatible with another version of chemml).
+
+    Parameters
+    ----------
+    sources: list of str
+        The paths of the source files.
+
+    Returns
+    -------
+    str
+    """
+    sha = hashlib.sha1(('%s-%s' % (CACHE_VERSION, __version__)).encode())
+    for path in sorted(sources):
+        sha.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+    return sha.hexdigest()[:16]
+
+
+def cache_path(name, sources, suffix):
+    """
+    returns the path of the cached file of a dataset for the current contents of its source files.
+    """
+    return os.path.join(get_cache_dir(), '%s-%s%s' % (name, source_hash(sources), suffix))
+
+
+def write_cached(path, dump):
+    """
+    writes a cached file atomically, and removes the stale files of the same dataset.
+    The cache is best effort: nothing is written (and a warning is raised) if the directory is not writable.
+
+    Parameters
+    ----------
+    path: str
+        The path of the cached file, e.g. from cache_path.
+
+    dump: callable
+        The function that writes the contents to a binary file object, e.g. lambda f: np.save(f, array).
+    """
+    directory = os.path.dirname(path)
+    name = os.path.basename(path).rsplit('-', 1)[0]
+    try:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                dump(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    except (OSError, pickle.PicklingError) as err:
+        msg = "The dataset could not be cached in '%s': %s" % (directory, err)
+        warnings.warn(msg)
+        return
+    for stale in glob.glob(os.path.join(directory, '%s-*' % name)):
+        if os.path.splitext(stale)[1] == os.path.splitext(path)[1] and stale != path:
+            os.remove(stale)
+
+
+def cached_object(name, sources, build):
+    """
+    returns the pickled object of a dataset from the cache, or builds (and caches) it if the source files have changed.
+    A cached file that can't be unpickled (e.g. truncated) is removed with a warning and rebuilt.
+
+    Parameters
+    ----------
+    name: str
+        The name of the dataset.
+
+    sources: list of str
+        The paths of the source files.
+
+    build: callable
+        The function that parses the source files, with no arguments.
+
+    Returns
+    -------
+    object
+    """
+    path = cache_path(name, sources, '.pkl')
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as err:
+            msg = "The cached dataset '%s' could not be loaded and is rebuilt: %s" % (path, err)
+            warnings.warn(msg)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    obj = build()
+    write_cached(path, lambda f: pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL))
+    return obj
+
+
+def cached_array(name, sources, build, mmap=True):
+    """
+    returns the numeric array of a dataset from the cache (memory-mapped, read only), or builds (and caches) it if the
+    source files have changed.
+
+    Parameters
+    ----------
+    name: str
+        The name of the dataset.
+
+    sources: list of str
+        The paths of the source files.
+
+    build: callable
+        The function that returns the array, with no arguments.
+
+    mmap: bool, optional (default=True)
+        If False, the cached array is loaded in memory.
+
+    Returns
+    -------
+    numpy array or memmap
+    """
+    path = cache_path(name, sources, '.npy')
+    if not os.path.exists(path):
+        array = np.ascontiguousarray(build())
+        write_cached(path, lambda f: np.save(f, array, allow_pickle=False))
+        if not os.path.exists(path):
+            return array
+    return np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+
+class LazyEntries(object):
+    """
+    a read-only sequence of the entries of a dataset, which are built on first access and kept afterwards.
+
+    Parameters
+    ----------
+    keys: list
+        The arguments of the factory function for each entry, e.g. the file paths or the composition strings.
+
+    factory: callable
+        The function that builds an entry from its key.
+
+    Examples
+    --------
+    >>> from chemml.datasets import load_comp_energy
+    >>> entries, df = load_comp_energy(lazy=True)
+    >>> entry = entries[0]      # only the first entry is built
+    """
+
+    def __init__(self, keys, factory):
+        self.keys = list(keys)
+        self.factory = factory
+        self._entries = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if isinstance(index, (list, tuple, np.ndarray)):
+            return [self[i] for i in index]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "index out of range"
+            raise IndexError(msg)
+        if index not in self._entries:
+            self._entries[index] = self.factory(self.keys[index])
+        return self._entries[index]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return "LazyEntries(%i entries, %i built)" % (len(self), len(self._entries))
@@ -1,6 +1,8 @@
 """
 The cheml.initialization module includes (please click on links adjacent to function names for more information):
     - XYZreader: :func:`~cheml.initialization.XYZreader`
+    - PackedGeometries: :func:`~cheml.initialization.PackedGeometries`
+    - pack_xyz: :func:`~cheml.initialization.pack_xyz`
     - ConvertFile: :func:`~cheml.initialization.ConvertFile`
     - Split: :func:`~cheml.initialization.Split`
 
@@ -10,10 +12,16 @@ from .initialization import Split
 
 from .initialization import XYZreader
 
+from .initialization import PackedGeometries
+
+from .initialization import pack_xyz
+
 from .initialization import ConvertFile
 
 __all__ = [
     'XYZreader',
+    'PackedGeometries',
+    'pack_xyz',
     'ConvertFile',
     'Split',
 ]
@@ -5,8 +5,134 @@ import pandas as pd
 import numpy as np
 import warnings
 import fnmatch
+import re
+import concurrent.futures
+
+from chemml.chem.molecule import Molecule, XYZ
+from chemml.utils import memmap_npz
+
+# the nuclear charges of the chemical symbols
+ATOMIC_NUMBERS = {
+    'Ru': 44.0,
+    'Re': 75.0,
+    'Rf': 104.0,
+    'Rg': 111.0,
+    'Ra': 88.0,
+    'Rb': 37.0,
+    'Rn': 86.0,
+    'Rh': 45.0,
+    'Be': 4.0,
+    'Ba': 56.0,
+    'Bh': 107.0,
+    'Bi': 83.0,
+    'Bk': 97.0,
+    'Br': 35.0,
+    'H': 1.0,
+    'P': 15.0,
+    'Os': 76.0,
+    'Es': 99.0,
+    'Hg': 80.0,
+    'Ge': 32.0,
+    'Gd': 64.0,
+    'Ga': 31.0,
+    'Pr': 59.0,
+    'Pt': 78.0,
+    'Pu': 94.0,
+    'C': 6.0,
+    'Pb': 82.0,
+    'Pa': 91.0,
+    'Pd': 46.0,
+    'Cd': 48.0,
+    'Po': 84.0,
+    'Pm': 61.0,
+    'Hs': 108.0,
+    'Uup': 115.0,
+    'Uus': 117.0,
+    'Uuo': 118.0,
+    'Ho': 67.0,
+    'Hf': 72.0,
+    'K': 19.0,
+    'He': 2.0,
+    'Md': 101.0,
+    'Mg': 12.0,
+    'Mo': 42.0,
+    'Mn': 25.0,
+    'O': 8.0,
+    'Mt': 109.0,
+    'S': 16.0,
+    'W': 74.0,
+    'Zn': 30.0,
+    'Eu': 63.0,
+    'Zr': 40.0,
+    'Er': 68.0,
+    'Ni': 28.0,
+    'No': 102.0,
+    'Na': 11.0,
+    'Nb': 41.0,
+    'Nd': 60.0,
+    'Ne': 10.0,
+    'Np': 93.0,
+    'Fr': 87.0,
+    'Fe': 26.0,
+    'Fl': 114.0,
+    'Fm': 100.0,
+    'B': 5.0,
+    'F': 9.0,
+    'Sr': 38.0,
+    'N': 7.0,
+    'Kr': 36.0,
+    'Si': 14.0,
+    'Sn': 50.0,
+    'Sm': 62.0,
+    'V': 23.0,
+    'Sc': 21.0,
+    'Sb': 51.0,
+    'Sg': 106.0,
+    'Se': 34.0,
+    'Co': 27.0,
+    'Cn': 112.0,
+    'Cm': 96.0,
+    'Cl': 17.0,
+    'Ca': 20.0,
+    'Cf': 98.0,
+    'Ce': 58.0,
+    'Xe': 54.0,
+    'Lu': 71.0,
+    'Cs': 55.0,
+    'Cr': 24.0,
+    'Cu': 29.0,
+    'La': 57.0,
+    'Li': 3.0,
+    'Lv': 116.0,
+    'Tl': 81.0,
+    'Tm': 69.0,
+    'Lr': 103.0,
+    'Th': 90.0,
+    'Ti': 22.0,
+    'Te': 52.0,
+    'Tb': 65.0,
+    'Tc': 43.0,
+    'Ta': 73.0,
+    'Yb': 70.0,
+    'Db': 105.0,
+    'Dy': 66.0,
+    'Ds': 110.0,
+    'I': 53.0,
+    'U': 92.0,
+    'Y': 39.0,
+    'Ac': 89.0,
+    'Ag': 47.0,
+    'Uut': 113.0,
+    'Ir': 77.0,
+    'Am': 95.0,
+    'Al': 13.0,
+    'As': 33.0,
+    'Ar': 18.0,
+    'Au': 79.0,
+    'At': 85.0,
+    'In': 49.0
+}
 
-from chemml.chem.molecule import Molecule
 
 class Split(object):
     """
@@ -79,7 +205,8 @@ class XYZreader(object):
               patterns for different length of characters. For example, range(1,30) = '[1-9]' and '[1-9][0-9]'
 
         The pattern matching is utilizes fnmatch library- Unix filename pattern matching.
-        Note: The pattern must include the file format at the end. The only acceptable extension is '.xyz'.
+        Note: The pattern must include the file format at the end. The acceptable extensions are '.xyz' and '.npz'
+              (the packed geometry archives created by the chemml.initialization.pack_xyz function).
 
     path_root: string, optional (default = None)
         fixed (with no special character) part of the path.
@@ -148,126 +275,7 @@ class XYZreader(object):
             self,
             path_pattern,
             path_root=None,
-            Z={
-                'Ru': 44.0,
-                'Re': 75.0,
-                'Rf': 104.0,
-                'Rg': 111.0,
-                'Ra': 88.0,
-                'Rb': 37.0,
-                'Rn': 86.0,
-                'Rh': 45.0,
-                'Be': 4.0,
-                'Ba': 56.0,
-                'Bh': 107.0,
-                'Bi': 83.0,
-                'Bk': 97.0,
-                'Br': 35.0,
-                'H': 1.0,
-                'P': 15.0,
-                'Os': 76.0,
-                'Es': 99.0,
-                'Hg': 80.0,
-                'Ge': 32.0,
-                'Gd': 64.0,
-                'Ga': 31.0,
-                'Pr': 59.0,
-                'Pt': 78.0,
-                'Pu': 94.0,
-                'C': 6.0,
-                'Pb': 82.0,
-                'Pa': 91.0,
-                'Pd': 46.0,
-                'Cd': 48.0,
-                'Po': 84.0,
-                'Pm': 61.0,
-                'Hs': 108.0,
-                'Uup': 115.0,
-                'Uus': 117.0,
-                'Uuo': 118.0,
-                'Ho': 67.0,
-                'Hf': 72.0,
-                'K': 19.0,
-                'He': 2.0,
-                'Md': 101.0,
-                'Mg': 12.0,
-                'Mo': 42.0,
-                'Mn': 25.0,
-                'O': 8.0,
-                'Mt': 109.0,
-                'S': 16.0,
-                'W': 74.0,
-                'Zn': 30.0,
-                'Eu': 63.0,
-                'Zr': 40.0,
-                'Er': 68.0,
-                'Ni': 28.0,
-                'No': 102.0,
-                'Na': 11.0,
-                'Nb': 41.0,
-                'Nd': 60.0,
-                'Ne': 10.0,
-                'Np': 93.0,
-                'Fr': 87.0,
-                'Fe': 26.0,
-                'Fl': 114.0,
-                'Fm': 100.0,
-                'B': 5.0,
-                'F': 9.0,
-                'Sr': 38.0,
-                'N': 7.0,
-                'Kr': 36.0,
-                'Si': 14.0,
-                'Sn': 50.0,
-                'Sm': 62.0,
-                'V': 23.0,
-                'Sc': 21.0,
-                'Sb': 51.0,
-                'Sg': 106.0,
-                'Se': 34.0,
-                'Co': 27.0,
-                'Cn': 112.0,
-                'Cm': 96.0,
-                'Cl': 17.0,
-                'Ca': 20.0,
-                'Cf': 98.0,
-                'Ce': 58.0,
-                'Xe': 54.0,
-                'Lu': 71.0,
-                'Cs': 55.0,
-                'Cr': 24.0,
-                'Cu': 29.0,
-                'La': 57.0,
-                'Li': 3.0,
-                'Lv': 116.0,
-                'Tl': 81.0,
-                'Tm': 69.0,
-                'Lr': 103.0,
-                'Th': 90.0,
-                'Ti': 22.0,
-                'Te': 52.0,
-                'Tb': 65.0,
-                'Tc': 43.0,
-                'Ta': 73.0,
-                'Yb': 70.0,
-                'Db': 105.0,
-                'Dy': 66.0,
-                'Ds': 110.0,
-                'I': 53.0,
-                'U': 92.0,
-                'Y': 39.0,
-                'Ac': 89.0,
-                'Ag': 47.0,
-                'Uut': 113.0,
-                'Ir': 77.0,
-                'Am': 95.0,
-                'Al': 13.0,
-                'As': 33.0,
-                'Ar': 18.0,
-                'Au': 79.0,
-                'At': 85.0,
-                'In': 49.0
-            },
+            Z=ATOMIC_NUMBERS,
             reader='auto',
             skip_lines=[2, 0],
             path_only=False):
@@ -306,58 +314,419 @@ class XYZreader(object):
                 ])
             return np.array(molecule)
 
-    def read(self):
+    def _find_files(self):
         """
-        read the XYZ files based on the path_pattern and path_root parameters and create a list of chemml.chem.Molecule objects.
-
-        Return
-        ------
-        molecules: list
-            A list of chemml.chem.Molecule objects
+        returns the list of (file path, label) of all the files that match the path_pattern, in the order of patterns.
+        The label is the path of the file if path_root is given, and the pattern without extension otherwise.
         """
         if isinstance(self.path_pattern, str):
             self.path_pattern = [self.path_pattern]
-        molecules = {}
-        it = 0
-        max_nAtoms = 1
+        files = []
         for pattern in self.path_pattern:
             file_name, file_extension = os.path.splitext(pattern)
             if file_extension == '':
                 msg = 'The file extension must be indicated.'
                 raise ValueError(msg)
-            elif file_extension != '.xyz':
-                msg = "file extension '%s' not available - xyz is the only acceptable extension" % file_extension
+            elif file_extension not in ('.xyz', '.npz'):
+                msg = "file extension '%s' not available - xyz and npz (packed archive) are the only acceptable extensions" % file_extension
                 raise ValueError(msg)
 
             if self.path_root:
+                # the pattern is compiled once for all the directories
+                match = re.compile(fnmatch.translate(os.path.join(self.path_root, pattern))).match
                 for root, directories, filenames in os.walk(self.path_root):
                     file_path = [
                         os.path.join(root, filename) for filename in filenames
                     ]
-                    for fn in sorted(
-                            fnmatch.filter(
-                                file_path, os.path.join(
-                                    self.path_root, pattern))):
-                        if not self.path_only:
-                            mol = self.__file_reader(fn)
-                            max_nAtoms = max(max_nAtoms, len(mol))
-                        else:
-                            mol = None
-                            max_nAtoms = max(max_nAtoms, 0)
-                        it += 1
-                        molecules[it] = {'file': fn, 'mol': mol}
+                    files.extend((fn, fn) for fn in sorted(filter(match, file_path)))
             else:
+                files.append((file_name + file_extension, file_name))
+        return files
+
+    def read(self):
+        """
+        read the XYZ files based on the path_pattern and path_root parameters and create a list of chemml.chem.Molecule objects.
+
+        Return
+        ------
+        molecules: list
+            A list of chemml.chem.Molecule objects
+        """
+        molecules = {}
+        it = 0
+        max_nAtoms = 1
+        for fn, label in self._find_files():
+            if fn.endswith('.npz'):
+                archive = PackedGeometries.load(fn)
+                for i, name in enumerate(archive.files):
+                    it += 1
+                    molecules[it] = {'file': name, 'mol': None if self.path_only else archive[i]}
                 if not self.path_only:
-                    mol = self.__file_reader(file_name + file_extension)
-                    max_nAtoms = max(max_nAtoms, len(mol))
-                else:
-                    mol = None
-                    max_nAtoms = max(max_nAtoms, 0)
-                it += 1
-                molecules[it] = {'file': file_name, 'mol': mol}
+                    max_nAtoms = max(max_nAtoms, archive.max_n_atoms)
+                continue
+            if not self.path_only:
+                mol = self.__file_reader(fn)
+                max_nAtoms = max(max_nAtoms, len(mol))
+            else:
+                mol = None
+                max_nAtoms = max(max_nAtoms, 0)
+            it += 1
+            molecules[it] = {'file': label, 'mol': mol}
         self.max_n_atoms_ = max_nAtoms
         return molecules
 
+    def read_packed(self, n_jobs=1, batch_size=1000):
+        """
+        read the XYZ files with a fast NumPy-based parser (no openbabel) and return the geometries in a columnar format.
+        With the 'auto' reader, each file may contain several concatenated XYZ blocks (multi-XYZ), each with the number
+        of atoms in its first line. With the 'manual' reader, the skip_lines parameter is applied and each file contains
+        one molecule. The packed geometry archives (.npz) are memory-mapped.
+
+        Parameters
+        ----------
+        n_jobs: int, optional (default = 1)
+            The number of worker processes to parse the files with. If -1, all the cores are used.
+
+        batch_size: int, optional (default = 1000)
+            The number of files that are parsed by a worker process at once.
+
+        Return
+        ------
+        geometries: PackedGeometries
+            The atomic numbers and coordinates of all the atoms as flat arrays, with the offsets of the molecules.
+        """
+        skip_lines = self.skip_lines if self.reader == 'manual' else None
+        # the archives are loaded as they are and the xyz files between them are parsed in batches
+        parts, batches = [], []
+        for fn, _ in self._find_files():
+            if fn.endswith('.npz'):
+                parts.append(PackedGeometries.load(fn))
+            elif len(parts) == 0 or not isinstance(parts[-1], list):
+                parts.append([fn])
+            else:
+                parts[-1].append(fn)
+        for part in parts:
+            if isinstance(part, list):
+                batches.extend(part[i:i + batch_size] for i in range(0, len(part), batch_size))
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs > 1 and len(batches) > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(_read_xyz_batch, batches, [self.Z] * len(batches),
+                                            [skip_lines] * len(batches)))
+        else:
+            results = [_read_xyz_batch(batch, self.Z, skip_lines) for batch in batches]
+        results = iter(results)
+        collections = []
+        for part in parts:
+            if isinstance(part, list):
+                collections.extend(next(results) for _ in range(0, len(part), batch_size))
+            else:
+                collections.append(part)
+        if len(collections) == 1 and not isinstance(parts[0], list):
+            geometries = collections[0]
+        else:
+            geometries = PackedGeometries.concatenate(collections)
+        self.max_n_atoms_ = max(1, geometries.max_n_atoms)
+        return geometries
+
+
+def _parse_xyz_block(lines):
+    """
+    returns the chemical symbols (array of str) and cartesian coordinates (n_atoms, 3) of the lines of an XYZ block.
+    """
+    lines = [line for line in lines if line.strip()]
+    if len(lines) == 0:
+        return np.array([], dtype=str), np.zeros((0, 3))
+    tokens = ' '.join(lines).split()
+    n_columns = len(lines[0].split())
+    if n_columns >= 4 and len(tokens) == n_columns * len(lines):
+        # all the lines have the same number of columns: one vectorized conversion
+        table = np.array(tokens).reshape(len(lines), n_columns)
+    else:
+        table = np.array([line.split()[:4] for line in lines])
+    if table.ndim != 2 or table.shape[1] < 4:
+        msg = 'The XYZ lines must contain a chemical symbol and three coordinates.'
+        raise ValueError(msg)
+    return table[:, 0], table[:, 1:4].astype(float)
+
+
+def parse_xyz(text, skip_lines=None):
+    """
+    parse the content of an XYZ file.
+
+    Parameters
+    ----------
+    text: str
+        The content of the XYZ file, with one or more concatenated XYZ blocks.
+
+    skip_lines: list of two integers, optional (default = None)
+        Number of lines to skip from top and bottom of the text, which contains one molecule.
+        If None, the number of atoms of each block is read from the first line of the block.
+
+    Returns
+    -------
+    molecules: list
+        The list of (chemical symbols, cartesian coordinates) of the molecules.
+    """
+    # the Mathematica style exponents (e.g., in the QM9 dataset)
+    lines = text.replace('*^', 'e').splitlines()
+    if skip_lines is not None:
+        return [_parse_xyz_block(lines[skip_lines[0]:len(lines) - skip_lines[1]])]
+    molecules = []
+    i = 0
+    while i < len(lines):
+        if not lines[i].strip():
+            i += 1
+            continue
+        n_atoms = int(lines[i].split()[0])
+        molecules.append(_parse_xyz_block(lines[i + 2:i + 2 + n_atoms]))
+        i += 2 + n_atoms
+    return molecules
+
+
+def _atomic_numbers(symbols, Z):
+    """
+    maps an array of chemical symbols (or atomic numbers as str) to the atomic numbers, with one lookup per unique symbol.
+    """
+    unique, inverse = np.unique(symbols, return_inverse=True)
+    numbers = np.zeros(len(unique), dtype=np.int32)
+    for i, symbol in enumerate(unique):
+        if symbol.isdigit():
+            numbers[i] = int(symbol)
+        elif symbol in Z:
+            numbers[i] = int(Z[symbol])
+        else:
+            msg = "The chemical symbol '%s' is not available in the Z dictionary." % symbol
+            raise ValueError(msg)
+    return numbers[inverse.reshape(-1)]
+
+
+def _read_xyz_batch(filenames, Z, skip_lines):
+    files, symbols, coordinates, n_atoms = [], [], [], []
+    for fn in filenames:
+        with open(fn, 'r') as f:
+            molecules = parse_xyz(f.read(), skip_lines)
+        for sym, xyz in molecules:
+            files.append(fn)
+            symbols.append(sym)
+            coordinates.append(xyz)
+            n_atoms.append(len(sym))
+    if len(files) == 0:
+        return PackedGeometries([], np.zeros(0, dtype=np.int32), np.zeros((0, 3)), np.zeros(1, dtype=np.int64))
+    offsets = np.concatenate([[0], np.cumsum(n_atoms)]).astype(np.int64)
+    return PackedGeometries(files, _atomic_numbers(np.concatenate(symbols), Z), np.concatenate(coordinates), offsets)
+
+
+class PackedGeometries(object):
+    """
+    The geometries of a collection of molecules in a columnar format: the atomic numbers and the cartesian coordinates of
+    all the atoms are stored in flat arrays and the atoms of the i-th molecule are in range(offsets[i], offsets[i+1]).
+
+    Parameters
+    ----------
+    files: list
+        The file name of each molecule.
+
+    atomic_numbers: array-like, shape (n_total_atoms,)
+        The atomic numbers of all the atoms.
+
+    coordinates: array-like, shape (n_total_atoms, 3)
+        The cartesian coordinates of all the atoms.
+
+    offsets: array-like, shape (n_molecules + 1,)
+        The index of the first atom of each molecule, and the total number of atoms as the last element.
+
+    """
+    def __init__(self, files, atomic_numbers, coordinates, offsets):
+        self.files = list(files)
+        self.atomic_numbers = atomic_numbers
+        self.coordinates = coordinates
+        self.offsets = np.asarray(offsets)
+        if len(self.offsets) != len(self.files) + 1:
+            msg = 'The number of offsets must be one more than the number of molecules.'
+            raise ValueError(msg)
+
+    @classmethod
+    def concatenate(cls, collections):
+        """
+        concatenate a list of PackedGeometries objects.
+        """
+        collections = list(collections)
+        if len(collections) == 0:
+            return cls([], np.zeros(0, dtype=np.int32), np.zeros((0, 3)), np.zeros(1, dtype=np.int64))
+        files, offsets, start = [], [np.zeros(1, dtype=np.int64)], 0
+        for c in collections:
+            files.extend(c.files)
+            offsets.append(np.asarray(c.offsets[1:], dtype=np.int64) - c.offsets[0] + start)
+            start = offsets[-1][-1] if len(offsets[-1]) else start
+        return cls(files,
+                   np.concatenate([np.asarray(c.atomic_numbers[c.offsets[0]:c.offsets[-1]]) for c in collections]),
+                   np.concatenate([np.asarray(c.coordinates[c.offsets[0]:c.offsets[-1]]) for c in collections]),
+                   np.concatenate(offsets))
+
+    def __len__(self):
+        return len(self.files)
+
+    @property
+    def n_atoms(self):
+        """
+        The number of atoms of each molecule.
+        """
+        return np.diff(self.offsets)
+
+    @property
+    def max_n_atoms(self):
+        return int(self.n_atoms.max()) if len(self) > 0 else 0
+
+    def __getitem__(self, index):
+        """
+        returns the geometry of a molecule as an array of (atomic number, x, y, z) rows, in the same format as the
+        'mol' arrays of the XYZreader.read method. A slice or a list of indices returns a PackedGeometries object.
+        """
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            start, end = self.offsets[index], self.offsets[index + 1]
+            return np.column_stack((self.atomic_numbers[start:end], self.coordinates[start:end])).astype(float)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                # a contiguous slice is a view of the arrays
+                return PackedGeometries(self.files[start:stop], self.atomic_numbers, self.coordinates,
+                                        self.offsets[start:stop + 1] if stop > start else self.offsets[start:start + 1])
+            index = range(start, stop, step)
+        index = list(index)
+        atoms = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in index]) if index else \
+            np.zeros(0, dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(self.n_atoms[index])]).astype(np.int64)
+        return PackedGeometries([self.files[i] for i in index], np.asarray(self.atomic_numbers)[atoms],
+                                np.asarray(self.coordinates)[atoms], offsets)
+
+    def to_dict(self):
+        """
+        returns the molecules in the output format of the XYZreader.read method: {index: {'file': ..., 'mol': ...}}
+        """
+        return {i + 1: {'file': fn, 'mol': self[i]} for i, fn in enumerate(self.files)}
+
+    def to_xyz(self):
+        """
+        returns the list of chemml.chem.XYZ objects of the molecules, e.g., to be featurized by the CoulombMatrix.
+        """
+        symbols = {int(z): s for s, z in ATOMIC_NUMBERS.items()}
+        xyz = []
+        for i in range(len(self)):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            numbers = np.asarray(self.atomic_numbers[start:end]).astype(int).reshape(-1, 1)
+            xyz.append(XYZ(np.array(self.coordinates[start:end], dtype=float), numbers,
+                           np.array([symbols.get(z, str(z)) for z in numbers[:, 0]]).reshape(-1, 1)))
+        return xyz
+
+    def save(self, filename):
+        """
+        store the geometries in a single (uncompressed) numpy archive, which can be memory-mapped by the load method.
+
+        Parameters
+        ----------
+        filename: str
+            The path to the archive file. The '.npz' extension is appended if not present.
+        """
+        start, end = self.offsets[0], self.offsets[-1]
+        np.savez(filename,
+                 atomic_numbers=np.asarray(self.atomic_numbers[start:end], dtype=np.int32),
+                 coordinates=np.asarray(self.coordinates[start:end], dtype=float),
+                 offsets=np.asarray(self.offsets, dtype=np.int64) - start,
+                 files=np.array(self.files, dtype=str))
+
+    @classmethod
+    def load(cls, filename, mmap=True):
+        """
+        load the geometries from an archive created by the save method.
+
+        Parameters
+        ----------
+        filename: str
+            The path to the archive file.
+
+        mmap: bool, optional (default = True)
+            If True, the atomic numbers and coordinates are memory-mapped and only the accessed molecules are read from the disk.
+
+        Returns
+        -------
+        PackedGeometries
+        """
+        with np.load(filename) as archive:
+            offsets = archive['offsets']
+            files = archive['files'].tolist()
+            if not mmap:
+                return cls(files, archive['atomic_numbers'], archive['coordinates'], offsets)
+        return cls(files, memmap_npz(filename, 'atomic_numbers'), memmap_npz(filename, 'coordinates'), offsets)
+
+
+def pack_xyz(path_pattern, filename, path_root=None, reader='auto', skip_lines=[2, 0], Z=ATOMIC_NUMBERS, n_jobs=1):
+    """
+    convert the XYZ files to a single packed geometry archive (.npz) with the atomic numbers, coordinates, offsets and
+    file names of all the molecules. The archive can be read by the XYZreader (with a '.npz' path_pattern) and by the
+    PackedGeometries.load method.
+
+    Parameters
+    ----------
+    path_pattern: string or list of string
+        The pattern(s) of the XYZ files, as in the XYZreader.
+
+    filename: str
+        The path to the archive file.
+
+    path_root: string, optional (default = None)
+        The fixed part of the path to the XYZ files, as in the XYZreader.
+
+    reader: string, optional (default = 'auto')
+        The XYZ reader: 'auto' for standard (multi-)XYZ files or 'manual' for applying the skip_lines parameter.
+
+    skip_lines: list of two integers, optional (default = [2,0])
+        Number of lines to skip from top and bottom of the xyz files (only for the 'manual' reader).
+
+    Z: dictionary, optional (default = ATOMIC_NUMBERS)
+        A dictionary of nuclear charges with respect to the chemical symbols.
+
+    n_jobs: int, optional (default = 1)
+        The number of worker processes to parse the files with.
+
+    Returns
+    -------
+    geometries: PackedGeometries
+        The packed geometries that are stored in the archive.
+    """
+    geometries = XYZreader(path_pattern, path_root=path_root, Z=Z, reader=reader, skip_lines=skip_lines).read_packed(n_jobs=n_jobs)
+    geometries.save(filename)
+    return geometries
+
+
+def _convert_batch(files, from_format, to_format):
+    """
+    converts a batch of (input path, output path) pairs in-process with pybel. If the output path is None, the converted
+    molecules are returned as a string instead of being written to a file.
+    returns the list of (status, error message, converted string) of the files.
+    """
+    import pybel
+    results = []
+    for fpath, out in files:
+        try:
+            molecules = list(pybel.readfile(from_format, fpath))
+            if len(molecules) == 0:
+                raise ValueError("no molecule was read from the file")
+            if out is None:
+                results.append(('converted', None, ''.join(mol.write(to_format) for mol in molecules)))
+            else:
+                output = pybel.Outputfile(to_format, out, overwrite=True)
+                for mol in molecules:
+                    output.write(mol)
+                output.close()
+                results.append(('converted', None, None))
+        except Exception as e:
+            results.append(('failed', '%s: %s' % (type(e).__name__, e), None))
+    return results
+
 
 class ConvertFile(object):
     """(ConvertFile)
@@ -377,13 +746,31 @@ class ConvertFile(object):
 
     to_format: string
         String of letters that specify the target file format or the desired format.
-        An openbabel command is generated which converts the files specified by 'file_path' to the target format.
         List of possible 'to_format's are on https://openbabel.org/wiki/Babel
 
+    engine: string, optional (default = 'pybel')
+        Available options: 'pybel' and 'babel'
+        If 'pybel', the files are converted in-process with the openbabel python bindings, in batches across a pool of
+        worker processes. If 'babel', an openbabel command is generated and executed for each file.
+
+    output: string, optional (default = None)
+        If None, each file is converted to a file with the same path and the to_format extension.
+        Otherwise, the path to a single multi-molecule file that all the converted molecules are streamed to, in the
+        order of the input files. Only available for the 'pybel' engine.
+
+    n_jobs: int, optional (default = 1)
+        The number of worker processes for the 'pybel' engine. If -1, all the cores are used.
+
+    batch_size: int, optional (default = 100)
+        The number of files that are converted by a worker process at once.
+
     Returns:
     ------
     converted_file_paths: dictionary
         dictionary of converted file paths, in the same format of XYZreader output: {index:{'file':""}}
+        With the 'pybel' engine, each entry also contains the 'status' of the conversion ('converted' or 'failed') and
+        the 'error' message of the failed conversions. The 'file' is None for the failed conversions and it's the
+        output path for all the files if the output parameter is given.
 
     Examples:
     --------
@@ -394,43 +781,82 @@ class ConvertFile(object):
     >>> from chemml.initialization import ConvertFile
     >>> model = ConvertFile(file_path=coordinates,from_format='xyz',to_format='cml')
     >>> converted_file_paths = model.convert()
-    {1: {'file': 'cheml/datasets/data/organic_xyz/1_opt.cml'}, 2: ...
+    {1: {'file': 'cheml/datasets/data/organic_xyz/1_opt.cml', 'status': 'converted', 'error': None}, 2: ...
 
     """
 
-    def __init__(self, file_path, from_format, to_format):
+    def __init__(self, file_path, from_format, to_format, engine='pybel', output=None, n_jobs=1, batch_size=100):
         self.file_path = file_path
         self.from_format = from_format
         self.to_format = to_format
+        self.engine = engine
+        self.output = output
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
 
-    def convert(self):
-        converted_file_paths = {}
+    def _input_files(self):
         if isinstance(self.file_path, str):
-            if not self.from_format == self.file_path[-len(self.from_format):]:
+            files = [self.file_path]
+        elif isinstance(self.file_path, dict):
+            files = [self.file_path[it]['file'] for it in range(1, len(self.file_path) + 1)]
+        else:
+            msg = 'The parameter file_path must be a string or a dictionary.'
+            raise ValueError(msg)
+        for fpath in files:
+            if not fpath[-len(self.from_format):] == self.from_format:
                 msg = 'file format is not the same as from_format'
                 raise ValueError(msg)
+        return files
 
-            else:
-                ob_from_format = '-i' + self.from_format
-                ob_to_format = '-o' + self.to_format
-                path = self.file_path[:self.file_path.rfind('.') + 1]
-                command = 'babel ' + ob_from_format + ' ' + self.file_path + ' ' + ob_to_format + ' ' + path + self.to_format
-                print(command)
-                os.system(command)
-                converted_file_paths[1] = {'file': path + self.to_format}
+    def convert(self):
+        files = self._input_files()
+        if self.engine == 'babel':
+            return self._convert_babel(files)
+        elif self.engine != 'pybel':
+            msg = "The parameter engine must be either 'pybel' or 'babel'."
+            raise ValueError(msg)
 
-        elif isinstance(self.file_path, dict):
-            for it in range(1, len(self.file_path) + 1):
-                fpath = self.file_path[it]['file']
-                if not fpath[-len(self.from_format):] == self.from_format:
-                    msg = 'file format is not the same as from_format'
-                    raise ValueError(msg)
-                else:
-                    ob_from_format = '-i' + self.from_format
-                    ob_to_format = '-o' + self.to_format
-                    path = fpath[:fpath.rfind('.') + 1]
-                    command = 'babel ' + ob_from_format + ' ' + fpath + ' ' + ob_to_format + ' ' + path + self.to_format
-                    os.system(command)
-                    converted_file_paths[it] = {'file': path + self.to_format}
+        outputs = [None if self.output else fpath[:fpath.rfind('.') + 1] + self.to_format for fpath in files]
+        pairs = list(zip(files, outputs))
+        batches = [pairs[i:i + self.batch_size] for i in range(0, len(pairs), self.batch_size)]
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 and len(batches) > 1 else None
+        stream = open(self.output, 'w') if self.output else None
+        converted_file_paths = {}
+        it = 0
+        try:
+            if executor is None:
+                results = (_convert_batch(batch, self.from_format, self.to_format) for batch in batches)
+            else:
+                results = executor.map(_convert_batch, batches, [self.from_format] * len(batches),
+                                       [self.to_format] * len(batches))
+            # the batches are received (and streamed to the output) in order
+            for batch, batch_results in zip(batches, results):
+                for (fpath, out), (status, error, text) in zip(batch, batch_results):
+                    it += 1
+                    if stream is not None and text is not None:
+                        stream.write(text)
+                        out = self.output
+                    converted_file_paths[it] = {'file': out if status == 'converted' else None,
+                                                'status': status, 'error': error}
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if stream is not None:
+                stream.close()
+        n_failed = sum(1 for it in converted_file_paths if converted_file_paths[it]['status'] == 'failed')
+        if n_failed > 0:
+            msg = '%i out of %i files could not be converted.' % (n_failed, len(converted_file_paths))
+            warnings.warn(msg)
+        return converted_file_paths
 
+    def _convert_babel(self, files):
+        converted_file_paths = {}
+        for it, fpath in enumerate(files, 1):
+            ob_from_format = '-i' + self.from_format
+            ob_to_format = '-o' + self.to_format
+            path = fpath[:fpath.rfind('.') + 1]
+            command = 'babel ' + ob_from_format + ' ' + fpath + ' ' + ob_to_format + ' ' + path + self.to_format
+            os.system(command)
+            converted_file_paths[it] = {'file': path + self.to_format}
         return converted_file_paths
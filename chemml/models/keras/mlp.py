@@ -7,6 +7,8 @@ from tensorflow.keras.optimizers import SGD
 from json import load
 from importlib import import_module
 
+from chemml.utils import profiling
+
 
 class MLP(object):
     """
@@ -85,6 +87,7 @@ class MLP(object):
         self.is_regression = regression
         self.nclasses = nclasses
 
+    @profiling.profiled()
     def fit(self, X, y):
         """
         Train the MLP for training data X and targets y
@@ -126,6 +129,7 @@ class MLP(object):
         self.model.fit(
             x=X, y=y, epochs=self.nepochs, batch_size=self.batch_size)
 
+    @profiling.profiled()
     def predict(self, X):
         """
         Return prediction for test data X
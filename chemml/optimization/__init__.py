@@ -1,13 +1,22 @@
 """
 The cheml.optimization module includes (please click on links adjacent to function names for more information):
     - GeneticAlgorithm: :func:`~chemml.optimization.GeneticAlgorithm`
+    - IslandGeneticAlgorithm: :func:`~chemml.optimization.IslandGeneticAlgorithm`
+    - EvaluationCache: :func:`~chemml.optimization.EvaluationCache`
     - ActiveLearning: :func:`~chemml.optimization.ActiveLearning`
+    - TargetLayerExtractor: :func:`~chemml.optimization.TargetLayerExtractor`
 """
 
 from .active import ActiveLearning
+from .active import TargetLayerExtractor
 from .genetic_algorithm import GeneticAlgorithm
+from .genetic_algorithm import IslandGeneticAlgorithm
+from .genetic_algorithm import EvaluationCache
 
 __all__ = [
     'GeneticAlgorithm',
+    'IslandGeneticAlgorithm',
+    'EvaluationCache',
     'ActiveLearning',
+    'TargetLayerExtractor',
 ]
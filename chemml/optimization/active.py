@@ -8,6 +8,9 @@ from builtins import range
 import warnings
 import types
 import copy
+import json
+import hashlib
+import weakref
 
 import numpy as np
 import pandas as pd
@@ -16,6 +19,152 @@ from sklearn.model_selection import ShuffleSplit, KFold
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
+from sklearn.utils import check_random_state
+
+from chemml.utils import profiling
+
+# the default number of rows of a memory-mapped pool of candidates that are read at once
+MEMMAP_CHUNK_SIZE = 10000
+
+
+class _GrowingArray(object):
+    """
+    An append-only array with an amortized growth of the allocated memory.
+    The capacity doubles whenever it is exhausted, so appending k rows costs O(k) on average instead of
+    copying the entire array (as np.append does).
+
+    Parameters
+    ----------
+    dtype: numpy dtype, optional (default = None)
+        The data type of the array. If None, it will be inferred from the first appended values.
+
+    """
+    def __init__(self, dtype=None):
+        self.dtype = dtype
+        self._data = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self):
+        """ A view of the filled part of the array."""
+        if self._data is None:
+            return np.array([], dtype=self.dtype)
+        return self._data[:self._size]
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        if self._data is None:
+            self.dtype = values.dtype
+            self._data = np.empty((max(16, values.shape[0]),) + values.shape[1:], dtype=self.dtype)
+        required = self._size + values.shape[0]
+        if required > self._data.shape[0]:
+            capacity = max(required, 2 * self._data.shape[0])
+            data = np.empty((capacity,) + self._data.shape[1:], dtype=self.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size:required] = values
+        self._size = required
+
+    def reset(self, values):
+        self._data = None
+        self._size = 0
+        self.append(values)
+
+
+class TargetLayerExtractor(object):
+    """
+    A reusable extractor of the latent features of a Keras model, i.e., the outputs of one or more hidden layers.
+    The sub-model that maps the inputs to the target layers is built only once, and it's applied to the input data
+    in fixed-size batches. The results are written into a preallocated output array.
+
+    Parameters
+    ----------
+    model: keras.models.Model
+        The keras model (with functional API) that contains the target layers.
+
+    target_layer: str or list
+        The name of a layer of the model or a list of names. The outputs of multiple layers will be concatenated.
+
+    batch_size: int, optional (default = 1024)
+        The number of samples that pass through the sub-model at once.
+
+    Attributes
+    ----------
+    model_: keras.models.Model
+        The sub-model that maps the inputs to the target layers.
+
+    """
+    def __init__(self, model, target_layer, batch_size=1024):
+        from tensorflow.keras.models import Model
+
+        if isinstance(target_layer, str):
+            out = [model.get_layer(target_layer).output]
+        elif isinstance(target_layer, list):
+            out = [model.get_layer(name).output for name in target_layer]
+        else:
+            msg = "The parameter 'target_layer' must be str or list of str."
+            raise ValueError(msg)
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            msg = "The parameter 'batch_size' must be a positive int."
+            raise ValueError(msg)
+
+        self.target_layer = target_layer
+        self.batch_size = batch_size
+        self.multi_input = isinstance(model.input, list)
+        self.model_ = Model(inputs=model.input, outputs=out)
+
+    def transform(self, X, out=None):
+        """
+        The main function to extract the latent features.
+
+        Parameters
+        ----------
+        X: ndarray or list
+            The input array of the model, or a list of arrays if the model has multiple inputs.
+
+        out: ndarray, optional (default = None)
+            The preallocated output array. If None, it will be allocated after the first batch.
+
+        Returns
+        -------
+        ndarray
+            The concatenated array of the target layers.
+
+        """
+        # inputs
+        if self.multi_input:
+            if not isinstance(X, list):
+                msg = "The input must be a list of arrays."
+                raise ValueError(msg)
+        else:
+            if isinstance(X, list):
+                msg = "Only one input array is required."
+                raise ValueError(msg)
+            else:
+                X = [X]
+
+        n_samples = X[0].shape[0]
+        for start in range(0, n_samples, self.batch_size):
+            stop = min(start + self.batch_size, n_samples)
+            batch = [x[start:stop] for x in X]
+            target_layers = self.model_.predict_on_batch(batch if self.multi_input else batch[0])
+            if not isinstance(target_layers, (list, tuple)):
+                target_layers = [target_layers]
+            target_layers = [np.asarray(t).reshape(stop - start, -1) for t in target_layers]
+            if out is None:
+                n_features = sum(t.shape[1] for t in target_layers)
+                out = np.empty((n_samples, n_features), dtype=target_layers[0].dtype)
+            col = 0
+            for t in target_layers:
+                out[start:stop, col:col + t.shape[1]] = t
+                col += t.shape[1]
+        if out is None:
+            out = np.empty((0, 0))
+        return out
 
 
 class ActiveLearning(object):
@@ -36,8 +185,11 @@ class ActiveLearning(object):
         Note that you should also compile your model inside the function. We don't provide options to compile the model.
         The compile (e.g., for Keras models) defines the loss function, the optimizer/learning rate, and the metrics.
 
-    U: array-like
+    U: array-like or numpy.memmap or FunctionType
         The features/descriptors of unlabeled candidates that are available to be labeled.
+        A numpy.memmap is kept on the disk and only the requested rows are loaded into the memory.
+        If a function, it must return an iterable of 2D arrays (chunks of rows) every time it's called.
+        The chunks must be yielded in the same order at each call.
 
     target_layer: str or list or FunctionType
         If str, it's the name of a layer of the Keras model that is linearly mapped to the outputs.
@@ -78,6 +230,11 @@ class ActiveLearning(object):
         This parameter must be an integer and greater than one. It specifies the number of previous active learning
         rounds to memorize for the distribution shift alleviation (DSA) approach.
 
+    chunk_size: int, optional (default = None)
+        The number of candidates that are transformed and passed to the models at once for the predictions and
+        latent features. If None, the entire pool is processed at once (or chunk by chunk, if U is a function, and
+        in chunks of MEMMAP_CHUNK_SIZE rows, if U is a memory-map).
+
     Attributes
     ----------
     queries: list
@@ -116,6 +273,8 @@ class ActiveLearning(object):
     random_search
     visualize
     get_target_layer
+    save
+    load
 
     Notes
     -----
@@ -124,7 +283,7 @@ class ActiveLearning(object):
     """
 
     def __init__(self, model_creator, U, target_layer, train_size=100, test_size=100,
-                 test_type='passive', batch_size=[10], history=2):
+                 test_type='passive', batch_size=[10], history=2, chunk_size=None):
         self.model_creator = model_creator
         self.U = U
         self.target_layer = target_layer
@@ -133,20 +292,140 @@ class ActiveLearning(object):
         self.test_type = test_type
         self.batch_size = batch_size
         self.history = history
+        self.chunk_size = chunk_size
         self._fit()
 
     def _X_train(self):
         """ We don't want to keep a potentially big matrix in the memory."""
-        return self.U[self.train_indices]
+        return self._U_rows(self.train_indices)
 
     def _X_test(self):
         """ We don't want to keep a potentially big matrix in the memory."""
-        return self.U[self.test_indices]
+        return self._U_rows(self.test_indices)
+
+    def _U_chunks(self, rows=None):
+        """
+        The internal generator of the candidates' features in chunks.
+
+        Parameters
+        ----------
+        rows: ndarray, optional (default = None)
+            A sorted 1D array of the indices of requested candidates. If None, all candidates will be generated.
+
+        Yields
+        ------
+        ndarray
+            The positions of the generated candidates in the 'rows' (or in U, if rows is None).
+
+        ndarray
+            The features of the generated candidates.
+
+        """
+        if callable(self.U):
+            offset = 0
+            for chunk in self.U():
+                chunk = np.asarray(chunk)
+                n = chunk.shape[0]
+                if rows is None:
+                    yield np.arange(offset, offset + n), chunk
+                else:
+                    lo, hi = np.searchsorted(rows, [offset, offset + n])
+                    if hi > lo:
+                        yield np.arange(lo, hi), chunk[rows[lo:hi] - offset]
+                offset += n
+        else:
+            n_rows = self.U_size if rows is None else len(rows)
+            chunk_size = self.chunk_size
+            if chunk_size is None and isinstance(self.U, np.memmap):
+                chunk_size = MEMMAP_CHUNK_SIZE
+            step = max(n_rows if chunk_size is None else chunk_size, 1)
+            for start in range(0, n_rows, step):
+                stop = min(start + step, n_rows)
+                if rows is None:
+                    yield np.arange(start, stop), np.asarray(self.U[start:stop])
+                else:
+                    yield np.arange(start, stop), np.asarray(self.U[rows[start:stop]])
+
+    def _U_rows(self, indices=None):
+        """
+        The internal function to load the features of the candidates by their indices.
+        """
+        if indices is None:
+            if not callable(self.U):
+                return self.U
+            indices = np.arange(self.U_size)
+        indices = np.asarray(indices, dtype=int)
+        if not callable(self.U):
+            return np.asarray(self.U[indices])
+        # collect rows from the chunks in the sorted order and put them back in the requested order
+        order = np.argsort(indices, kind='mergesort')
+        X = None
+        for pos, chunk in self._U_chunks(indices[order]):
+            if X is None:
+                X = np.empty((len(indices),) + chunk.shape[1:], dtype=chunk.dtype)
+            X[order[pos]] = chunk
+        return X
+
+    def _map_U(self, func, rows=None, X_scaler=None):
+        """
+        The internal function to apply a function (e.g., model.predict) to the (scaled) candidates chunk by chunk.
+        The outputs are collected in a preallocated array with the same order as the rows.
+        """
+        n_rows = self.U_size if rows is None else len(rows)
+        out = None
+        for pos, X in self._U_chunks(rows):
+            if X_scaler is not None:
+                X = X_scaler.transform(X)
+            Y = np.asarray(func(X))
+            if out is None:
+                out = np.empty((n_rows,) + Y.shape[1:], dtype=Y.dtype)
+            out[pos] = Y
+        return out
+
+    def _fit_X_scaler(self, X_scaler):
+        """
+        The internal function to fit the X scaler on all the candidates, chunk by chunk if possible.
+        A memory-mapped pool is always streamed, so that it is never loaded into the memory at once.
+        """
+        streamed = callable(self.U) or isinstance(self.U, np.memmap) or self.chunk_size is not None
+        if streamed and hasattr(X_scaler, 'partial_fit'):
+            for _, X in self._U_chunks():
+                X_scaler.partial_fit(X)
+        else:
+            X_scaler.fit(self._U_rows())
+        return X_scaler
 
     @property
     def queries(self):
         return self._queries
 
+    @property
+    def U_indices(self):
+        # the boolean mask of the unlabeled pool is the source of truth, the array of indices is cached
+        if self._U_indices is None:
+            self._U_indices = np.flatnonzero(self._U_mask)
+        return self._U_indices
+
+    @property
+    def train_indices(self):
+        return self._train_indices.values
+
+    @train_indices.setter
+    def train_indices(self, value):
+        self._train_indices.reset(np.asarray(value, dtype=int))
+
+    @property
+    def test_indices(self):
+        return self._test_indices.values
+
+    @test_indices.setter
+    def test_indices(self, value):
+        self._test_indices.reset(np.asarray(value, dtype=int))
+
+    @property
+    def initial_test_indices(self):
+        return self._initial_test_indices.values
+
     @property
     def X_train(self):
         return self._X_train()
@@ -157,11 +436,15 @@ class ActiveLearning(object):
 
     @property
     def Y_train(self):
-        return self._Y_train
+        if len(self._Y_train) == 0:
+            return None
+        return self._Y_train.values
 
     @property
     def Y_test(self):
-        return self._Y_test
+        if len(self._Y_test) == 0:
+            return None
+        return self._Y_test.values
 
     @property
     def Y_pred(self):
@@ -182,9 +465,16 @@ class ActiveLearning(object):
         return df
 
     def _fit(self):
-        # np array the input U
-        self.U = np.array(self.U)
-        self.U_size = self.U.shape[0]
+        self._U_hash_value = None
+        # np array the input U, unless it's a memory-map or a generator of chunks
+        if callable(self.U):
+            self.U_size = 0
+            for chunk in self.U():
+                self.U_size += int(np.shape(chunk)[0])
+        else:
+            if not isinstance(self.U, np.memmap):
+                self.U = np.array(self.U)
+            self.U_size = self.U.shape[0]
 
         # Todo: support for sklearn linear models
         if not isinstance(self.model_creator, types.FunctionType):
@@ -236,20 +526,26 @@ class ActiveLearning(object):
             msg = "The parameter 'test_type' must be either 'active' or 'passive'."
             raise ValueError(msg)
 
+        # check chunk size
+        if self.chunk_size is not None and (not isinstance(self.chunk_size, int) or self.chunk_size < 1):
+            msg = "The parameter 'chunk_size' must be a positive int or None."
+            raise ValueError(msg)
+
 
         # other attributes
         self._queries = []
         self.qbc_queries = []
         self.dsa_queries = []
         self.bemcm_queries = []
-        # all indices are numpy arrays
-        self.train_indices = np.array([])
-        self.test_indices = np.array([])
-        self.initial_test_indices = np.array([])
-        self.U_indices = np.array(range(self.U_size))
+        # all indices are numpy arrays (growing buffers) and the unlabeled pool is tracked by a boolean mask
+        self._train_indices = _GrowingArray(dtype=int)
+        self._test_indices = _GrowingArray(dtype=int)
+        self._initial_test_indices = _GrowingArray(dtype=int)
+        self._U_mask = np.ones(self.U_size, dtype=bool)
+        self._U_indices = None
         self.query_number = 0
-        self._Y_train = None
-        self._Y_test = None
+        self._Y_train = _GrowingArray()
+        self._Y_test = _GrowingArray()
         self._Y_pred = None
         self._results = []
         self._random_results = []
@@ -260,51 +556,33 @@ class ActiveLearning(object):
 
         self.lr = 0
 
+        # the cached extractors of latent features
+        self._extractors = weakref.WeakKeyDictionary()
+
     def get_target_layer(self, model, X):
         """
         The main function to get the latent features from the linear layer of the keras model.
+        The TargetLayerExtractor of each model is built once and reused for the next calls with the same target layer(s).
 
         Returns
         -------
         ndarray
             The concatenated array of the specified hidden layers by parameter `target_layer`.
         """
-        # import keras here
-        from tensorflow.keras import backend as K
+        if isinstance(self.target_layer, types.FunctionType):
+            return self.target_layer(model, X)
 
-        # inputs
-        inp = model.input
-        if isinstance(inp, list):
-            if not isinstance(X, list):
-                msg = "The input must be a list of arrays."
-                raise ValueError(msg)
-        else:
-            if isinstance(X, list):
-                msg = "Only one input array is required."
-                raise ValueError(msg)
-            else:
-                # list of inp is required for K.function mapping
-                inp = [inp]
-                # if input is not a list should become a list
-                X = [X]
-
-        # outputs
-        if isinstance(self.target_layer, str):
-            out = [model.get_layer(self.target_layer).output]
-        elif isinstance(self.target_layer, list):
-            out = [model.get_layer(name).output for name in self.target_layer]
-        else:
+        if not isinstance(self.target_layer, (str, list)):
             msg = "The parameter 'linear_layer' must be str, list of str or a function."
             raise ValueError(msg)
 
-        # define mapping function
-        g = K.function(inp, out)
+        # the extractor is rebuilt if the target layer(s) changed since it was cached
+        target_layer, extractor = self._extractors.get(model, (None, None))
+        if extractor is None or target_layer != self.target_layer:
+            extractor = TargetLayerExtractor(model, self.target_layer)
+            self._extractors[model] = (copy.copy(self.target_layer), extractor)
 
-        # find and concatenate target layers
-        target_layers = g(X)
-        target_layers = np.concatenate(target_layers, axis=-1)
-
-        return target_layers
+        return extractor.transform(X)
 
     def initialize(self,random_state=90):
         """
@@ -369,7 +647,7 @@ class ActiveLearning(object):
 
         if len(self._queries) > 0:
             for query in self._queries:
-                query[1] = np.array([i for i in query[1] if i not in indices])
+                query[1] = query[1][~np.isin(query[1], indices)]
         else:
             msg = "The list of queries is already empty."
             raise ValueError(msg)
@@ -420,34 +698,31 @@ class ActiveLearning(object):
 
         if len(self._queries) > 0:
             match_flag = False
-            self.last_deposited_indices_ = np.array([])
+            deposited = []
             for query in self._queries:
                 ind_in_q = np.where(np.in1d(indices, query[1], assume_unique=True))[0] # the position of matched numbers in the indices
                 if len(ind_in_q)>0:
                     match_flag = True
+                    settled_inds = np.array(indices[ind_in_q]).astype(int)
+                    deposited.append(settled_inds)
                     if query[0] == 'test set':      # the only case that we query test data
-                        if self._Y_test is None:
-                            self._Y_test = Y[ind_in_q]
-                        else:
-                            self._Y_test = np.append(self._Y_test, Y[ind_in_q], axis=0)
-                        # update test_indices and U_indices
-                        settled_inds = np.array(indices[ind_in_q])
-                        self.last_deposited_indices_ = np.append(self.last_deposited_indices_, settled_inds).astype(int)
-                        self.test_indices = np.append(self.test_indices, settled_inds).astype(int)           # array of all indices
-                        self.initial_test_indices = np.append(self.initial_test_indices, settled_inds).astype(int)
-                        self.U_indices = np.array([i for i in self.U_indices if i not in settled_inds])
+                        self._Y_test.append(Y[ind_in_q])
+                        # update test_indices
+                        self._test_indices.append(settled_inds)           # array of all indices
+                        self._initial_test_indices.append(settled_inds)
                     else:
-                        if self._Y_train is None:
-                            self._Y_train = Y[ind_in_q]
-                        else:
-                            self._Y_train = np.append(self._Y_train, Y[ind_in_q], axis=0)
-                        # update train_indices and U_indices
-                        settled_inds = np.array(indices[ind_in_q])
-                        self.last_deposited_indices_ = np.append(self.last_deposited_indices_, settled_inds).astype(int)
-                        self.train_indices = np.append(self.train_indices, settled_inds).astype(int)
-                        self.U_indices = np.array([i for i in self.U_indices if i not in settled_inds])
+                        self._Y_train.append(Y[ind_in_q])
+                        # update train_indices
+                        self._train_indices.append(settled_inds)
+                    # update U_indices
+                    self._U_mask[settled_inds] = False
+                    self._U_indices = None
                     # update q_ind and thus _queries
-                    query[1] = np.array([i for i in query[1] if i not in settled_inds])
+                    query[1] = query[1][~np.isin(query[1], settled_inds)]
+            if len(deposited) > 0:
+                self.last_deposited_indices_ = np.concatenate(deposited)
+            else:
+                self.last_deposited_indices_ = np.array([], dtype=int)
             if not match_flag:
                 msg = "Can't match the indices with queries."
                 raise ValueError(msg)
@@ -482,17 +757,175 @@ class ActiveLearning(object):
         else:
             # active test split
             all_indices = np.concatenate([self.train_indices, self.test_indices], axis=0)
-            all_y = np.concatenate([self._Y_train, self._Y_test], axis=0)
+            all_y = np.concatenate([self.Y_train, self.Y_test], axis=0)
             # select randomly
             ss = ShuffleSplit(n_splits=1, test_size=self.test_size, train_size=None, random_state=90)
             for train_indices, test_indices in ss.split(all_indices):
                 # test
-                self._Y_test = all_y[test_indices]
+                self._Y_test.reset(all_y[test_indices])
                 self.test_indices = all_indices[test_indices]
                 # train
-                self._Y_train = all_y[train_indices]
+                self._Y_train.reset(all_y[train_indices])
                 self.train_indices = all_indices[train_indices]
 
+    def _U_hash(self):
+        """
+        The internal function to find a fingerprint (sha1 hash) of the pool of candidates (U), chunk by chunk.
+        The pool doesn't change during the lifetime of the instance, so the hash is computed only once.
+        """
+        if self._U_hash_value is not None:
+            return self._U_hash_value
+        sha = hashlib.sha1()
+        for _, X in self._U_chunks():
+            X = np.ascontiguousarray(X)
+            sha.update(str(X.dtype).encode())
+            sha.update(X.tobytes())
+        sha.update(str(self.U_size).encode())
+        self._U_hash_value = sha.hexdigest()
+        return self._U_hash_value
+
+    def save(self, filename):
+        """
+        This function stores the state of the active learning search in a compressed `.npz` file.
+        Only the compact state (indices, labels, queries, history and results) is stored. The pool of candidates (U)
+        is only referenced by its path (if it's a memory-map) and a hash, and the model_creator must be provided again
+        to the `load` method.
+
+        Parameters
+        ----------
+        filename: str
+            The path to the checkpoint file with .npz format.
+
+        """
+        if not isinstance(filename, str):
+            msg = "The parameter 'filename' must be a path to the file with .npz format."
+            raise ValueError(msg)
+
+        # the numpy integers are not json serializable
+        meta = {'train_size': int(self.train_size),
+                'test_size': int(self.test_size),
+                'test_type': self.test_type,
+                'batch_size': [int(b) for b in self.batch_size],
+                'history': int(self.history),
+                'chunk_size': None if self.chunk_size is None else int(self.chunk_size),
+                'target_layer': self.target_layer if isinstance(self.target_layer, (str, list)) else None,
+                'query_number': int(self.query_number),
+                'lr': float(self.lr),
+                'queries': [q[0] for q in self._queries],
+                'U_size': int(self.U_size),
+                'U_hash': self._U_hash(),
+                'U_path': None}
+        if isinstance(self.U, np.memmap) and self.U.filename is not None:
+            meta['U_path'] = self.U.filename
+            meta['U_dtype'] = self.U.dtype.str
+            meta['U_shape'] = list(self.U.shape)
+            meta['U_offset'] = int(self.U.offset)
+            meta['U_order'] = 'F' if np.isfortran(self.U) else 'C'
+
+        arrays = {'train_indices': self.train_indices,
+                  'test_indices': self.test_indices,
+                  'initial_test_indices': self.initial_test_indices,
+                  'U_mask': self._U_mask,
+                  'history': self._history,
+                  'results': np.array(self._results, dtype=float).reshape(-1, 9),
+                  'random_results': np.array(self._random_results, dtype=float).reshape(-1, 9),
+                  'qbc_queries': np.array(self.qbc_queries, dtype=int),
+                  'dsa_queries': np.array(self.dsa_queries, dtype=int),
+                  'bemcm_queries': np.array(self.bemcm_queries, dtype=int)}
+        if len(self._Y_train) > 0:
+            arrays['Y_train'] = self.Y_train
+        if len(self._Y_test) > 0:
+            arrays['Y_test'] = self.Y_test
+        if self._Y_pred is not None:
+            arrays['Y_pred'] = self._Y_pred
+        if hasattr(self, 'last_deposited_indices_'):
+            arrays['last_deposited_indices_'] = np.asarray(self.last_deposited_indices_, dtype=int)
+        for i, q in enumerate(self._queries):
+            arrays['query_%i' % i] = np.asarray(q[1], dtype=int)
+
+        np.savez_compressed(filename, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, filename, model_creator, U=None, target_layer=None, check_pool=True):
+        """
+        This function restores an active learning search from a checkpoint file stored by the `save` method.
+        The search resumes where it was left, without calling the initialize method or retraining any model.
+
+        Parameters
+        ----------
+        filename: str
+            The path to the checkpoint file with .npz format.
+
+        model_creator: FunctionType
+            The function that returns the compiled model. Please find more info in the ActiveLearning class.
+
+        U: array-like or numpy.memmap or FunctionType, optional (default = None)
+            The pool of candidates. If None, the memory-mapped file that was referenced in the checkpoint will be opened.
+
+        target_layer: str or list or FunctionType, optional (default = None)
+            If None, the target layer(s) stored in the checkpoint will be used.
+
+        check_pool: bool, optional (default = True)
+            If True, the hash of the pool of candidates must match the one in the checkpoint.
+
+        Returns
+        -------
+        ActiveLearning
+            The restored instance of the class.
+
+        """
+        with np.load(filename, allow_pickle=False) as f:
+            arrays = {key: f[key] for key in f.files}
+        meta = json.loads(str(arrays.pop('meta')))
+
+        if U is None:
+            if meta['U_path'] is None:
+                msg = "The pool of candidates (U) was not memory-mapped and must be provided."
+                raise ValueError(msg)
+            U = np.memmap(meta['U_path'], dtype=np.dtype(meta['U_dtype']), mode='r', offset=meta['U_offset'],
+                          shape=tuple(meta['U_shape']), order=meta['U_order'])
+        if target_layer is None:
+            target_layer = meta['target_layer']
+            if target_layer is None:
+                msg = "The target layer was a function and must be provided."
+                raise ValueError(msg)
+
+        chunk_size = meta['chunk_size']
+        al = cls(model_creator, U, target_layer, train_size=int(meta['train_size']), test_size=int(meta['test_size']),
+                 test_type=meta['test_type'], batch_size=[int(b) for b in meta['batch_size']],
+                 history=int(meta['history']), chunk_size=None if chunk_size is None else int(chunk_size))
+
+        if al.U_size != int(meta['U_size']) or (check_pool and al._U_hash() != meta['U_hash']):
+            msg = "The pool of candidates (U) doesn't match the one stored in the checkpoint."
+            raise ValueError(msg)
+
+        # indices and labels
+        al.train_indices = arrays['train_indices']
+        al.test_indices = arrays['test_indices']
+        al._initial_test_indices.reset(arrays['initial_test_indices'].astype(int))
+        al._U_mask = arrays['U_mask'].astype(bool)
+        al._U_indices = None
+        if 'Y_train' in arrays:
+            al._Y_train.reset(arrays['Y_train'])
+        if 'Y_test' in arrays:
+            al._Y_test.reset(arrays['Y_test'])
+        al._Y_pred = arrays.get('Y_pred')
+        if 'last_deposited_indices_' in arrays:
+            al.last_deposited_indices_ = arrays['last_deposited_indices_'].astype(int)
+
+        # queries, history and results
+        al._queries = [[name, arrays['query_%i' % i]] for i, name in enumerate(meta['queries'])]
+        al.query_number = int(meta['query_number'])
+        al.lr = float(meta['lr'])
+        al._history = arrays['history']
+        al.qbc_queries = list(arrays['qbc_queries'])
+        al.dsa_queries = list(arrays['dsa_queries'])
+        al.bemcm_queries = list(arrays['bemcm_queries'])
+        al._results = [[int(r[0]), int(r[1]), int(r[2])] + list(r[3:]) for r in arrays['results']]
+        al._random_results = [[int(r[0]), int(r[1]), int(r[2])] + list(r[3:]) for r in arrays['random_results']]
+
+        return al
+
     def _scaler(self, scale):
         """
         The internal function to manage the X and Y scalers.
@@ -520,7 +953,9 @@ class ActiveLearning(object):
             else:
                 return None, None
 
-    def search(self, n_evaluation=3, ensemble='bootstrap', n_ensemble=4, normalize_input=True, normalize_internal=False, random_state=90, **kwargs):
+    @profiling.profiled()
+    def search(self, n_evaluation=3, ensemble='bootstrap', n_ensemble=4, normalize_input=True, normalize_internal=False,
+               random_state=90, pool_size=None, pool_filter='random', **kwargs):
         """
         The main function to start or continue an active learning search.
         The bootstrap approach is used to generate an ensemble of models that estimate the prediction
@@ -553,6 +988,17 @@ class ActiveLearning(object):
             The random state will be directly passed to the sklearn.model_selection.KFold or ShuffleSplit
             Additional info at: https://scikit-learn.org/stable/modules/generated/sklearn.model_selection.KFold.html
 
+        pool_size: int, optional (default = None)
+            If not None, only this many of the remaining candidates will be scored by the ensemble of models
+            and the BEMCM/QBC approaches. This pre-filter shrinks the expensive part of the search for large pools.
+            The value must be an int and not smaller than the sum of the batch sizes.
+
+        pool_filter: str, optional (default = 'random')
+            The method to pre-filter the pool of candidates, if the parameter 'pool_size' is not None.
+                - 'random': a random subsample of the remaining candidates.
+                - 'uncertainty': the candidates with the largest standard deviation of the predictions of the
+                  n_evaluation models (requires n_evaluation > 1).
+
         kwargs
             Any argument (except input data) that should be passed to the model's fit method.
 
@@ -580,35 +1026,43 @@ class ActiveLearning(object):
             elif i==2:
                 dsa = s
 
+        # check pool size
+        if pool_size is not None:
+            if not isinstance(pool_size, int) or pool_size < sum(self.batch_size):
+                msg = "The parameter 'pool_size' must be an int and not smaller than the sum of the batch sizes."
+                raise ValueError(msg)
+            if pool_filter not in ('random', 'uncertainty'):
+                msg = "The parameter 'pool_filter' must be either 'random' or 'uncertainty'."
+                raise ValueError(msg)
+            if pool_filter == 'uncertainty' and n_evaluation < 2:
+                msg = "The 'uncertainty' pool filter requires the parameter 'n_evaluation' to be greater than one."
+                raise ValueError(msg)
+
         # get input data
         X_tr = self._X_train()
         X_te = self._X_test()
-        Y_tr = copy.deepcopy(self._Y_train)
-        Y_te = copy.deepcopy(self._Y_test)
+        Y_tr = copy.deepcopy(self.Y_train)
+        Y_te = copy.deepcopy(self.Y_test)
 
         # scale
         X_scaler, Y_scaler = self._scaler(normalize_input)
         if X_scaler is not None:
-            # scale X arrays
-            Utr = X_scaler.fit_transform(self.U)
+            # scale X arrays (the pool of candidates will be transformed chunk by chunk)
+            self._fit_X_scaler(X_scaler)
             X_tr = X_scaler.transform(X_tr)
             X_te = X_scaler.transform(X_te)
             # scale Y
             Y_tr = Y_scaler.fit_transform(Y_tr)
-        else:
-            Utr = self.U
-
-        # assert not (Utr == self.U).all()  # run just for test
 
         # make sure the data is not overwritten
         # assert not (X_tr == self.U[self.train_indices]).all()   # run just for test
-        assert not (Y_tr == self._Y_train).all()
+        assert not (Y_tr == self.Y_train).all()
 
         # training and evaluation
         it_results = {'mae':[], 'rmse':[], 'r2':[]}
-        Y_U_pred_df = pd.DataFrame()  # empty dataframe to collect f(U) at each iteration
+        Y_U_pred = np.empty((self.U_size, n_evaluation))  # collect f(U) at each iteration
         learning_rate = []
-        lin_layers = {}
+        best_model = None
         for it in range(n_evaluation):
             model = self.model_creator()
             model, _, mae, rmse, r2 = self._train_predict_evaluate(model,
@@ -617,20 +1071,17 @@ class ActiveLearning(object):
                                                                            Y_te,
                                                                            **kwargs)
             # Todo: how can we support multioutput?
-            # predict Y of remaining U, f(Utr)
+            # predict Y of all candidates, f(U)
+            preds = self._map_U(model.predict, None, X_scaler)
             if Y_scaler is not None:
-                Y_U_pred_df[it] = Y_scaler.inverse_transform(model.predict(Utr)).reshape(-1,)
+                preds = Y_scaler.inverse_transform(preds)
+            Y_U_pred[:, it] = preds.reshape(-1,)
 
-            # calculate the linear layer, phi(U), and collect lr for bemcm approach
+            # keep the best model for the linear layer, phi(U), and collect lr for bemcm approach
             if bemcm:
-                lin_layers[it] = self.get_target_layer(model, Utr[self.U_indices])
-                # if it == 0:
-                #     lin_layer = self.get_target_layer(model, Utr[self.U_indices])
-                # else:
-                #     temp = self.get_target_layer(model, Utr[self.U_indices])
-                #     lin_layer = lin_layer + temp
-
-                assert lin_layers[it].shape[0] == self.U_indices.shape[0]
+                # the order of lin_layer might be different from one model to another model
+                if best_model is None or mae < min(it_results['mae']):
+                    best_model = model
 
                 # collect lr
                 from tensorflow.keras import backend as K
@@ -650,21 +1101,35 @@ class ActiveLearning(object):
         self._results.append(results_temp)
 
         # find Y predictions of all candidates U
-        assert Y_U_pred_df.shape == (self.U_size, n_evaluation)
-        self._Y_pred = Y_U_pred_df.mean(axis=1).values.reshape(-1, 1)
+        self._Y_pred = Y_U_pred.mean(axis=1).reshape(-1, 1)
         # transform back to scaled
         if Y_scaler is not None:
             fU_preds_scaled = Y_scaler.transform(self._Y_pred)
         else:
             fU_preds_scaled = self._Y_pred
         assert self._Y_pred.shape == (self.U_size, 1)
-        del Y_U_pred_df
+
+        i_dsa_queries = []
+        if dsa:
+            i_dsa_queries = self._dsa_y_dist()
+            # i_dsa_queries = self._dsa_test_y()
+            # i_dsa_queries = self._dsa_unlabeled(deviations)
+
+        # the candidates (positions in the U_indices) that will be scored by the ensemble of models
+        if pool_size is None:
+            candidates = np.arange(len(self.U_indices))
+            rows = None     # all candidates in U
+        else:
+            candidates = self._pool_filter(pool_size, pool_filter, Y_U_pred, i_dsa_queries, random_state)
+            rows = self.U_indices[candidates]
+        del Y_U_pred
 
         # find linear layer input and learning rate for bemcm approach
         if bemcm:
-            best_ind = np.argmin(it_results['mae'])     # the order of lin_layer might be different from one model to another model
-            lin_layer = lin_layers[best_ind]
-            # lin_layer = lin_layer/float(n_evaluation)   # shape: (m,d)
+            lin_layer = self._map_U(lambda X: self.get_target_layer(best_model, X),
+                                    self.U_indices[candidates], X_scaler)
+            assert lin_layer.shape[0] == candidates.shape[0]
+            del best_model
 
             # scale linear layer
             if normalize_internal:
@@ -688,6 +1153,8 @@ class ActiveLearning(object):
             msg = "You must select between 'bootstrap', 'kfold' or 'shuffle' sampling methods with the `n_ensemble` greater than zero."
             raise ValueError(msg)
 
+        n_rows = self.U_size if rows is None else len(rows)
+        deviations = np.empty((n_rows, n_ensemble))
         for it in range(n_ensemble):
             if g is None:
                 train_index = np.random.choice(range(len(X_tr)), size=len(X_tr), replace=True)
@@ -697,64 +1164,85 @@ class ActiveLearning(object):
             Ytr = Y_tr[train_index]
             # model
             model = self.model_creator()
-            model, Z_U_pred, _, _, _ = self._train_predict_evaluate(model,
-                                                                    [Xtr,Ytr,Utr],
-                                                                    None,   # don't inverse_transform preds
-                                                                    False,
-                                                                    **kwargs)
-            deviation = fU_preds_scaled - Z_U_pred     # shape: (m,1)
-
+            model.fit(Xtr, Ytr, **kwargs)
+            Z_U_pred = self._map_U(model.predict, rows, X_scaler)     # don't inverse_transform preds
             # collect the bootstrap deviation from actual predictions
-            if it==0:
-                deviations = deviation
+            if rows is None:
+                deviations[:, it] = (fU_preds_scaled - Z_U_pred).reshape(-1,)
             else:
-                deviations = np.append(deviations, deviation, axis=1)
+                deviations[:, it] = (fU_preds_scaled[rows] - Z_U_pred).reshape(-1,)
 
             del Xtr, Z_U_pred, model
-        del X_tr, Y_tr, Utr      # from now on we only need deviations and lin_layer
-
-        assert deviations.shape == (self.U_size, n_ensemble)
+        del X_tr, Y_tr      # from now on we only need deviations and lin_layer
 
         # scale deviations
         if normalize_internal:
             scaler = StandardScaler()
             deviations = scaler.fit_transform(deviations)
+        if rows is None:
+            deviations = deviations[self.U_indices]
+        assert deviations.shape == (candidates.shape[0], n_ensemble)
 
-        i_dsa_queries = []
-        if dsa:
-            i_dsa_queries = self._dsa_y_dist()
-            # i_dsa_queries = self._dsa_test_y()
-            # i_dsa_queries = self._dsa_unlabeled(deviations)
+        # the qbc and bemcm approaches work with the positions in the candidates
+        i_dsa_candidates = list(np.searchsorted(candidates, i_dsa_queries))
 
         i_qbc_queries = []
         if qbc and not bemcm:     # bemcm can cover for duplicates in all of the approaches
-            i_qbc_queries = self._qbc(deviations[self.U_indices],i_dsa_queries)
+            i_qbc_queries = self._qbc(deviations, i_dsa_candidates)
         elif qbc:
-            i_qbc_queries = self._qbc(deviations[self.U_indices],None)
+            i_qbc_queries = self._qbc(deviations, None)
 
         i_bemcm_queries = []
         if bemcm:
-            i_bemcm_queries = self._bemcm(deviations[self.U_indices], lin_layer, alpha, normalize_internal,
-                                              i_qbc_queries+i_dsa_queries)
+            i_bemcm_queries = self._bemcm(deviations, lin_layer, alpha, normalize_internal,
+                                              i_qbc_queries+i_dsa_candidates)
+
+        # back to the positions in the U_indices
+        i_qbc_queries = [int(candidates[i]) for i in i_qbc_queries]
+        i_bemcm_queries = [int(candidates[i]) for i in i_bemcm_queries]
 
         i_queries = np.unique(i_qbc_queries+i_dsa_queries+i_bemcm_queries)
         assert len(i_queries) == sum(self.batch_size)
 
         # increase global query number by one
         self.query_number += 1
+        U_indices = self.U_indices
         if qbc:
-            self.qbc_queries += [self.U_indices[i] for i in i_qbc_queries]
+            self.qbc_queries += list(U_indices[np.array(i_qbc_queries, dtype=int)])
         if dsa:
-            self.dsa_queries += [self.U_indices[i] for i in i_dsa_queries if i not in i_qbc_queries]
+            i_qbc_set = set(i_qbc_queries)
+            i_dsa_only = [i for i in i_dsa_queries if i not in i_qbc_set]
+            self.dsa_queries += list(U_indices[np.array(i_dsa_only, dtype=int)])
         if bemcm:
-            self.bemcm_queries += [self.U_indices[i] for i in i_bemcm_queries]
+            self.bemcm_queries += list(U_indices[np.array(i_bemcm_queries, dtype=int)])
 
         # find original indices and update queries
-        _queries = np.array([self.U_indices[i] for i in i_queries])
+        _queries = U_indices[i_queries.astype(int)]
 
         self._queries.append(['batch #%i'%self.query_number, _queries])
         return _queries
 
+    def _pool_filter(self, pool_size, pool_filter, Y_U_pred, former_queries, random_state):
+        """
+        The internal function to pre-filter the remaining candidates before the expensive scoring by the ensemble of models.
+
+        Returns
+        -------
+        ndarray
+            The sorted positions of the selected candidates in the U_indices. The former queries are always included.
+
+        """
+        n_remaining = len(self.U_indices)
+        if pool_size >= n_remaining:
+            return np.arange(n_remaining)
+        if pool_filter == 'random':
+            rng = check_random_state(random_state)
+            selected = rng.choice(n_remaining, pool_size, replace=False)
+        else:
+            sigma = Y_U_pred[self.U_indices].std(axis=1)
+            selected = np.argpartition(-sigma, pool_size - 1)[:pool_size]
+        return np.union1d(selected, np.array(former_queries, dtype=int)).astype(int)
+
     def _qbc(self, deviations, former_queries):
         """
         qbc approach
@@ -789,7 +1277,7 @@ class ActiveLearning(object):
         dsa approach based on the distribution of the test data and predicted y values
         """
         # test distribuiton
-        f = pd.DataFrame(self._Y_test, columns=['yt'])
+        f = pd.DataFrame(self.Y_test, columns=['yt'])
         f['ind'] = f.index
         out, bins = pd.cut(f.yt, 100, retbins=True)
         groups = f.groupby(['ind', out])
@@ -798,7 +1286,7 @@ class ActiveLearning(object):
         _ytest_dist['prob'] = _ytest_dist[0]/sum(_ytest_dist[0])
 
         # train distribution
-        f = pd.DataFrame(self._Y_train, columns=['yt'])
+        f = pd.DataFrame(self.Y_train, columns=['yt'])
         f['ind'] = f.index
         groups = f.groupby(['ind', pd.cut(f.yt, bins)])
         _ytrain_dist = pd.DataFrame(groups.size().unstack().sum())
@@ -919,48 +1407,75 @@ class ActiveLearning(object):
         bemcm approach
         B_EMCM = EMCM - correlation_term
         EMCM = mean(deviations * lin_layer)
+
+        For each ensemble member k, both terms are row-wise multiples of lin_layer:
+            EMCM_k = dev_k * lin_layer
+            correlation_term_k = c_k * lin_layer,  c_k += dev_k[s] * (lin_layer . lin_layer[s]) after selecting s
+        Thus, the norms are |dev_k - alpha * c_k| * ||lin_layer|| and each selection is a rank-1 update of
+        the running coefficients followed by a masked argmax (no sorting of the candidates).
+        The normalize_internal option breaks this structure and keeps the full (m,d) correlation terms, which are
+        updated in place.
         """
-        former_queries = np.unique(former_queries)
+        former_queries = np.unique(former_queries).astype(int)
         bemcm_size = sum(self.batch_size) - len(former_queries)
         # shapes: m = number of samples, d = length of latent features
+        m, n_ensemble = deviations.shape
         i_queries = []              # the indices of queries based on the length of U_indices (not original U)
-        correlation_term = {it: np.zeros(lin_layer.shape) for it in range(deviations.shape[1])}   # shape of each: (m,d)
-        while len(i_queries) < bemcm_size:
-            norms = pd.DataFrame()  # store the norms of n_ensemble models
-            for it in range(deviations.shape[1]):
-                # EMCM
-                EMCM = deviations[:,it].reshape(-1,1) * lin_layer
+        if bemcm_size <= 0:
+            return i_queries
 
-                # correlation term acts after first selection
-                if len(i_queries) > 0:
-                    correlation_term[it] += self._correlation_term(i_queries[-1], deviations[:,it], lin_layer, normalize_internal)
+        # mask of candidates that can't be selected anymore
+        unavailable = np.zeros(m, dtype=bool)
+        unavailable[former_queries] = True
 
-                # calculate batch EMCM
-                B_EMCM = EMCM - alpha * correlation_term[it]    # shape: (m,d)
+        if normalize_internal:
+            correlation_term = np.zeros((n_ensemble,) + lin_layer.shape)    # shape of each: (m,d)
+            workspace = np.empty(lin_layer.shape)
+        else:
+            lin_layer_norm = np.linalg.norm(lin_layer, axis=1)     # shape: (m,)
+            residuals = np.array(deviations.T, dtype=float, order='C')     # dev_k - alpha * c_k, shape: (n_ensemble, m)
+            workspace = np.empty(m)
 
-                # find norm and
-                norm = np.linalg.norm(B_EMCM, axis=1)
-                norms[it] = norm.reshape(-1,)
+        norms = np.empty(m)
+        while len(i_queries) < bemcm_size:
+            # correlation term acts after first selection
+            if len(i_queries) > 0:
+                ind = i_queries[-1]
+                dot = np.dot(lin_layer, lin_layer[ind])     # shape: (m,)
+                if normalize_internal:
+                    for it in range(n_ensemble):
+                        self._correlation_term(deviations[ind, it] * dot, lin_layer, workspace)
+                        correlation_term[it] += workspace
+                else:
+                    for it in range(n_ensemble):
+                        np.multiply(dot, alpha * deviations[ind, it], out=workspace)
+                        residuals[it] -= workspace
 
-            # average and argmax of norms
-            assert norms.shape == (self.U_indices.shape[0], deviations.shape[1])
-            norms['mean'] = norms.mean(axis=1)
-            norms['ind'] = norms.index
-            norms = norms.drop(i_queries, axis=0)   # remove rows of previously selected points
-            norms.sort_values('mean', ascending=False, inplace=True)
+            # average of norms over the ensemble
+            if normalize_internal:
+                norms[:] = 0.0
+                for it in range(n_ensemble):
+                    np.multiply(deviations[:, it].reshape(-1, 1), lin_layer, out=workspace)
+                    workspace -= alpha * correlation_term[it]
+                    norms += np.linalg.norm(workspace, axis=1)
+                norms /= n_ensemble
+            else:
+                norms[:] = 0.0
+                for it in range(n_ensemble):
+                    np.abs(residuals[it], out=workspace)
+                    norms += workspace
+                norms *= lin_layer_norm / n_ensemble
 
             # memorize the initial ranking of the norms
             if len(i_queries) == 0:
-                initial_ranking = list(norms.head(bemcm_size)['ind'])
+                initial_ranking = np.argpartition(-norms, bemcm_size - 1)[:bemcm_size] if bemcm_size < m \
+                    else np.arange(m)
 
             # select top candidate and update i_queries
-            n = 1
-            select = list(norms.head(n)['ind'])
-            while select[0] in former_queries:
-                n += 1
-                select = [list(norms.head(n)['ind'])[-1]]
-
-            i_queries += select
+            norms[unavailable] = -np.inf
+            select = int(np.argmax(norms))
+            unavailable[select] = True
+            i_queries.append(select)
 
         # make sure correlation term is making any difference than simple sorting of the initial norms
         if set(initial_ranking) <= set(i_queries):
@@ -969,19 +1484,18 @@ class ActiveLearning(object):
 
         return i_queries
 
-    def _correlation_term(self, ind, dev, lin_layer, normalize_internal):
+    def _correlation_term(self, coefficients, lin_layer, out):
         """
-        The internal function to find the correlation term
+        The internal function to find the (normalized) correlation term of a selected candidate.
+        The result, coefficients * lin_layer with standardized columns, is written into 'out'.
         """
-        deviations_asterisk = dev[ind] * lin_layer[ind]    # shape: (d,)
-        deviations_asterisk_transpose = deviations_asterisk.reshape(-1,1).T  # shape (1,d)
-        lin_layer_transpose = lin_layer.T       # shape: (d,m)
-        dot = np.dot(deviations_asterisk_transpose, lin_layer_transpose)  # shape: (1,m)
-        correlation_term_of_ind = dot.T * lin_layer       # shape (m,d) same shape as lin_layer
-        if normalize_internal:
-            scaler = StandardScaler()
-            correlation_term_of_ind = scaler.fit_transform(correlation_term_of_ind)
-        return correlation_term_of_ind
+        np.multiply(coefficients.reshape(-1, 1), lin_layer, out=out)       # shape (m,d) same shape as lin_layer
+        mean = out.mean(axis=0)
+        std = out.std(axis=0)
+        std[std == 0.0] = 1.0
+        out -= mean
+        out /= std
+        return out
 
     def _train_predict_evaluate(self, model=None, data_list=None, Y_scaler=None, metrics=None, **kwargs):
         """
@@ -1079,13 +1593,14 @@ class ActiveLearning(object):
         # we must consider the test type: active or passive
         if test_type == 'passive':
             test_indices = self.initial_test_indices
-            except_test_inds = [i for i in range(self.U_size) if i not in self.initial_test_indices]
         elif test_type == 'active':
             test_indices = self.test_indices
-            except_test_inds = [i for i in range(self.U_size) if i not in self.test_indices]
         else:
             msg = "The parameter 'test_type' must be either 'passive' or 'active'."
             raise ValueError(msg)
+        except_test_mask = np.ones(self.U_size, dtype=bool)
+        except_test_mask[test_indices] = False
+        except_test_inds = np.flatnonzero(except_test_mask)
 
         # remaining training set size to run ML
         remaining_ind = [i for i in range(len(self._results)) if i not in range(len(self._random_results))]
@@ -1101,18 +1616,18 @@ class ActiveLearning(object):
                               random_state=random_state)
             for train_indices, _ in ss.split(except_test_inds):
                 # training indices based on the original U
-                actual_tr_inds = np.array(except_test_inds)[train_indices]
-                X_tr = self.U[actual_tr_inds]
+                actual_tr_inds = except_test_inds[train_indices]
+                X_tr = self._U_rows(actual_tr_inds)
                 Y_tr = Y[actual_tr_inds]
 
                 # test set based on the test type
-                X_te = self.U[test_indices]
+                X_te = self._U_rows(test_indices)
                 Y_te = Y[test_indices]
                 # scale
                 X_scaler, Y_scaler = self._scaler(scale)
                 if X_scaler is not None:
                     # scale X arrays
-                    _ = X_scaler.fit_transform(self.U)
+                    self._fit_X_scaler(X_scaler)
                     X_tr = X_scaler.transform(X_tr)
                     X_te = X_scaler.transform(X_te)
                     # scale Y
@@ -1170,7 +1685,7 @@ class ActiveLearning(object):
 
         # feature transformation
         pca = PCA(n_components=2)
-        u = pca.fit_transform(self.U)   # use this (original) transformed feature space for all the X data
+        u = pca.fit_transform(self._U_rows())   # use this (original) transformed feature space for all the X data
         u_rem = u[self.U_indices]
         # test is fixed
         xte = u[self.test_indices]
@@ -1178,10 +1693,10 @@ class ActiveLearning(object):
         xtr = u[self.train_indices]
         if self.query_number == 0 or (self.query_number == 1 and len(self._queries) > 0):
             xtr_last_batch = u[self.train_indices][:self.train_size]
-            ytr_last_batch = self._Y_train[:self.train_size]
+            ytr_last_batch = self.Y_train[:self.train_size]
         else:
             xtr_last_batch = u[self.train_indices][-sum(self.batch_size):]
-            ytr_last_batch = self._Y_train[-sum(self.batch_size):]
+            ytr_last_batch = self.Y_train[-sum(self.batch_size):]
 
         # plot1 : x/pc distribution
         collect_plots["dist_pc"] = self._visualize_dist_pc(u,u_rem, xte, xtr, xtr_last_batch)
@@ -1286,9 +1801,9 @@ class ActiveLearning(object):
         if Y is not None:
             sns.distplot(Y.reshape(-1, ), hist=False, color=sns.xkcd_rgb["denim blue"],
                          kde_kws={"shade": True, 'bw': 0.15}, ax=ax, label='Labeled U')  # label='Labeled U',
-        sns.distplot(self._Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
+        sns.distplot(self.Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
                      kde_kws={"shade": True, 'bw': 0.15}, ax=ax, label='Entire Train')  # label='Train',
-        sns.distplot(self._Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
+        sns.distplot(self.Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
                      kde_kws={"shade": True, 'bw': 0.15}, ax=ax, label='Test')  # label='Test',
         if sum(self.batch_size) != 1:
             sns.distplot(ytr_last_batch.reshape(-1, ), hist=False, color=sns.xkcd_rgb["light purple"],
@@ -1309,9 +1824,9 @@ class ActiveLearning(object):
         if Y is not None:
             sns.distplot(Y.reshape(-1, ), hist=False, color=sns.xkcd_rgb["denim blue"],
                          kde_kws={"shade": True, 'bw': 0.15}, ax=ax2, label='Labeled U')  # label='Labeled U',
-        sns.distplot(self._Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
+        sns.distplot(self.Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
                      kde_kws={"shade": True, 'bw': 0.15}, ax=ax2, label='Entire Train')  # label='Train',
-        sns.distplot(self._Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
+        sns.distplot(self.Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
                      kde_kws={"shade": True, 'bw': 0.15}, ax=ax2, label='Test')  # label='Test',
 
         # labels
@@ -1325,9 +1840,9 @@ class ActiveLearning(object):
 
         # full except Us
         fig3 = plt.figure()
-        ax3 = sns.distplot(self._Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
+        ax3 = sns.distplot(self.Y_train.reshape(-1, ), hist=False, color=sns.xkcd_rgb["medium green"],
                      kde_kws={"shade": True, 'bw': 0.15}, label='Entire Train')  # label='Train',
-        sns.distplot(self._Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
+        sns.distplot(self.Y_test.reshape(-1, ), hist=False, color=sns.xkcd_rgb["pale red"],
                      kde_kws={"shade": True, 'bw': 0.15}, ax=ax3, label='Test')  # label='Test',
         if sum(self.batch_size) != 1:
             sns.distplot(ytr_last_batch.reshape(-1, ), hist=False, color=sns.xkcd_rgb["light purple"],
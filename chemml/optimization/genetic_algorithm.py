@@ -7,6 +7,298 @@ import math
 import numpy as np
 from copy import deepcopy
 import itertools
+import os
+import concurrent.futures
+import sqlite3
+import pickle
+import hashlib
+import bisect
+
+from chemml.utils import profiling
+
+
+def _code_fingerprint(code, sha):
+    sha.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'): _code_fingerprint(const, sha)
+        else: sha.update(repr(const).encode())
+
+
+def objective_fingerprint(objective):
+    """
+    returns a fingerprint (sha1 hash) of an objective function based on its name, bytecode and the immutable values
+    (numbers, strings, tuples and functions) captured in its closure. The global variables and the mutable objects used
+    by the function are not part of the fingerprint, pass a user-defined fingerprint if they change between the searches.
+    A string is considered as a user-defined fingerprint and it's returned as is.
+    """
+    if isinstance(objective, str): return objective
+    sha = hashlib.sha1()
+    sha.update(str(getattr(objective, '__module__', '')).encode())
+    sha.update(str(getattr(objective, '__qualname__', getattr(objective, '__name__', ''))).encode())
+    code = getattr(objective, '__code__', None)
+    if code is not None: _code_fingerprint(code, sha)
+    for cell in getattr(objective, '__closure__', None) or ():
+        try: value = cell.cell_contents
+        except ValueError: continue
+        if hasattr(value, '__code__'): sha.update(objective_fingerprint(value).encode())
+        elif _is_immutable(value): sha.update(_individual_key(value if isinstance(value, tuple) else [value]).encode())
+    return sha.hexdigest()
+
+
+def _is_immutable(value):
+    if isinstance(value, tuple): return all(_is_immutable(v) for v in value)
+    return value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic))
+
+
+def _individual_key(individual):
+    """
+    returns the key of an individual in the EvaluationCache. The genes are converted to python scalars, thus the key
+    doesn't depend on the numpy version (e.g. repr of np.float64(1.0) is 'np.float64(1.0)' in numpy 2).
+    """
+    return repr(tuple(x.item() if hasattr(x, 'item') else x for x in individual))
+
+
+def _dominates(A, B):
+    """
+    returns a boolean matrix with the element (i, j) True if the point A[i] dominates the point B[j].
+    """
+    geq = (A[:, None, :] >= B[None, :, :]).all(axis=2)
+    gt = (A[:, None, :] > B[None, :, :]).any(axis=2)
+    return geq & gt
+
+
+def dominance_matrix(F):
+    """
+    returns a boolean matrix with the element (i, j) True if the point i dominates the point j.
+    All the objectives in F (n_points, n_objectives) are maximized.
+    """
+    F = np.asarray(F, dtype=float)
+    return _dominates(F, F)
+
+
+def non_dominated_sort(F, chunk_size=1000):
+    """
+    The fast non-dominated sorting of NSGA-II. All the objectives in F (n_points, n_objectives) are maximized.
+    returns the index of the front (0 for the Pareto front) of each point.
+    The dominance is computed for chunk_size points at a time, so the memory doesn't grow with n_points ** 2.
+    """
+    F = np.asarray(F, dtype=float)
+    n_dominators = np.zeros(F.shape[0], dtype=int)
+    for start in range(0, F.shape[0], chunk_size):
+        n_dominators += _dominates(F[start:start + chunk_size], F).sum(axis=0)
+    fronts = np.full(F.shape[0], -1)
+    current, k = np.flatnonzero(n_dominators == 0), 0
+    while current.size > 0:
+        fronts[current] = k
+        for start in range(0, current.size, chunk_size):
+            n_dominators -= _dominates(F[current[start:start + chunk_size]], F).sum(axis=0)
+        n_dominators[current] = -1
+        current, k = np.flatnonzero(n_dominators == 0), k + 1
+    return fronts
+
+
+def crowding_distance(F):
+    """
+    The crowding distance of the points of a front (n_points, n_objectives). Boundary points have infinite distance.
+    """
+    F = np.asarray(F, dtype=float)
+    n, m = F.shape
+    distance = np.zeros(n)
+    if n < 3:
+        distance[:] = np.inf
+        return distance
+    for j in range(m):
+        order = np.argsort(F[:, j], kind='mergesort')
+        f = F[order, j]
+        distance[order[[0, -1]]] = np.inf
+        if f[-1] > f[0]: distance[order[1:-1]] += (f[2:] - f[:-2]) / (f[-1] - f[0])
+    return distance
+
+
+def pareto_front(F, chunk_size=1000):
+    """
+    returns the indices of the non-dominated points in F (n_points, n_objectives). All the objectives are maximized.
+    """
+    F = np.asarray(F, dtype=float)
+    dominated = np.zeros(F.shape[0], dtype=bool)
+    for start in range(0, F.shape[0], chunk_size):
+        dominated[start:start + chunk_size] = _dominates(F, F[start:start + chunk_size]).any(axis=0)
+    return np.flatnonzero(~dominated)
+
+
+class DiscreteSpace(object):
+    """
+    An indexed representation of a discrete search space ('int' and 'choice' variables only).
+    Each chromosome is encoded as an integer in range(size) with a mixed-radix representation (the first variable is
+    the most significant digit) and the visited chromosomes are marked in a bitmap. Thus, unvisited chromosomes are
+    sampled in O(1) expected time and the exhaustion of the space is detected immediately.
+    If the space is larger than BITMAP_MAX_SIZE, the visited indices are kept in a set instead of the bitmap (only a
+    tiny fraction of such a space can be visited anyway).
+
+    Parameters
+    ----------
+    values: list
+        The list of valid values of each variable.
+
+    """
+    BITMAP_MAX_SIZE = 2 ** 27
+
+    def __init__(self, values):
+        self.values = [list(v) for v in values]
+        self.radices = [len(v) for v in self.values]
+        if min(self.radices) < 1: raise Exception("All the discrete variables should have at least one valid value.")
+        self.size = 1
+        for r in self.radices: self.size *= r
+        self._lookup = []
+        for v in self.values:
+            try: self._lookup.append({x: i for i, x in enumerate(v)})
+            except TypeError: self._lookup.append(None)
+        if self.size <= self.BITMAP_MAX_SIZE: self._visited = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        else: self._visited = set()
+        self.n_visited = 0
+        self._unvisited = None
+
+    def encode(self, chromosome):
+        """
+        returns the index of the chromosome, or None if the chromosome is not in the space.
+        """
+        if len(chromosome) != len(self.values): return None
+        index = 0
+        for x, r, v, lookup in zip(chromosome, self.radices, self.values, self._lookup):
+            try: i = lookup[x] if lookup is not None else v.index(x)
+            except (KeyError, ValueError, TypeError): return None
+            index = index * r + i
+        return index
+
+    def decode(self, index):
+        """
+        returns the chromosome (tuple) with the index.
+        """
+        digits = []
+        for r in reversed(self.radices):
+            index, i = divmod(index, r)
+            digits.append(i)
+        return tuple(v[i] for v, i in zip(self.values, reversed(digits)))
+
+    def is_visited(self, index):
+        if isinstance(self._visited, set): return index in self._visited
+        return bool(self._visited[index >> 3] & (1 << (index & 7)))
+
+    def visit(self, chromosome):
+        """
+        marks the chromosome as visited. returns False if it was visited already or it's not in the space.
+        """
+        index = self.encode(chromosome)
+        if index is None or self.is_visited(index): return False
+        if isinstance(self._visited, set): self._visited.add(index)
+        else: self._visited[index >> 3] |= np.uint8(1 << (index & 7))
+        self.n_visited += 1
+        return True
+
+    def reset(self):
+        if isinstance(self._visited, set): self._visited.clear()
+        else: self._visited[:] = 0
+        self.n_visited = 0
+        self._unvisited = None
+
+    @property
+    def exhausted(self):
+        return self.n_visited >= self.size
+
+    def sample(self):
+        """
+        returns a random unvisited chromosome (without marking it as visited), or None if the space is exhausted.
+        """
+        if self.exhausted: return None
+        if (self.n_visited <= self.size // 2 and self._unvisited is None) or isinstance(self._visited, set):
+            # rejection sampling: at most two trials are expected
+            while True:
+                index = random.randrange(self.size)
+                if not self.is_visited(index): return self.decode(index)
+        if self._unvisited is None:
+            bits = np.unpackbits(self._visited, bitorder='little')[:self.size]
+            self._unvisited = np.flatnonzero(bits == 0).tolist()
+        # the visited indices are removed lazily from the list of unvisited ones
+        while True:
+            position = random.randrange(len(self._unvisited))
+            index = self._unvisited[position]
+            if not self.is_visited(index): return self.decode(index)
+            self._unvisited[position] = self._unvisited[-1]
+            self._unvisited.pop()
+
+    def sample_many(self, n):
+        """
+        returns n distinct random chromosomes (or all of them if n is larger than the size of the space).
+        """
+        if self.size > self.BITMAP_MAX_SIZE:
+            # range(size) is too large for random.sample, but the draws hardly ever collide
+            indices = set()
+            while len(indices) < n: indices.add(random.randrange(self.size))
+            return [self.decode(i) for i in indices]
+        return [self.decode(i) for i in random.sample(range(self.size), min(n, self.size))]
+
+
+class EvaluationCache(object):
+    """
+    A persistent store of the fitness values of the evaluated individuals in a SQLite database.
+    The individuals are stored with a fingerprint of the objective function, thus the same database can be
+    shared by several searches and a crashed search can be restarted without evaluating the same individuals again.
+
+    Parameters
+    ----------
+    path: str
+        The path to the SQLite database file. It will be created if it doesn't exist.
+
+    objective: function or str, optional (default = None)
+        The objective function or a user-defined fingerprint of it (str). If None, the cache will be bound to the
+        objective function of the GeneticAlgorithm that uses it.
+
+    """
+    def __init__(self, path, objective=None):
+        self.path = path
+        self.fingerprint = None if objective is None else objective_fingerprint(objective)
+        self._connection = None
+
+    def bind(self, objective):
+        if self.fingerprint is None: self.fingerprint = objective_fingerprint(objective)
+        return self
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS fitness "
+                                     "(objective TEXT, individual TEXT, value BLOB, PRIMARY KEY (objective, individual))")
+            self._connection.commit()
+        return self._connection
+
+    def get(self, individual):
+        """
+        returns the stored fitness value of the individual, or None if it has not been evaluated yet.
+        """
+        row = self.connection.execute("SELECT value FROM fitness WHERE objective=? AND individual=?",
+                                      (self.fingerprint, _individual_key(individual))).fetchone()
+        if row is None: return None
+        return pickle.loads(row[0])
+
+    def set(self, individual, fitness):
+        self.connection.execute("INSERT OR REPLACE INTO fitness VALUES (?, ?, ?)",
+                                (self.fingerprint, _individual_key(individual), sqlite3.Binary(pickle.dumps(fitness, protocol=2))))
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM fitness WHERE objective=?", (self.fingerprint,)).fetchone()[0]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
 
 class GeneticAlgorithm(object):
     """
@@ -31,6 +323,12 @@ class GeneticAlgorithm(object):
 
             fitness: tuple, optional (default = ('Max',)
                 A tuple of string(s) for Maximizing (Max) or minimizing (Min) the objective function(s).
+
+            multi_objective: string, optional (default = "weighted")
+                The approach to rank the individuals for multiple objectives:
+                    - "weighted": the sum of the objectives scaled in range 1-2.
+                    - "nsga2": the non-dominated sorting and crowding distance of NSGA-II. The Pareto front of all the
+                      evaluated individuals is tracked after each generation.
                 
             pop_size: integer, optional (default = 50)
                 Size of the population
@@ -53,12 +351,54 @@ class GeneticAlgorithm(object):
             initial_population: list, optional (default=None)
                 The initial population for the algorithm to start with. If not provided, initial population is randomly generated.
 
+            n_jobs: int, optional (default=1)
+                The number of individuals to evaluate concurrently. If greater than one (or -1 for all the cores) and no
+                executor is provided, a pool of worker processes is used. In that case the objective function must be picklable
+                (e.g., defined at the top level of a module).
+
+            executor: concurrent.futures.Executor, optional (default=None)
+                An executor (e.g., ThreadPoolExecutor, ProcessPoolExecutor or a distributed executor) to evaluate the
+                individuals with. If provided, n_jobs only specifies the number of concurrent evaluations.
+
+            cache: str or EvaluationCache, optional (default=None)
+                A persistent store of the fitness values. If str, it's the path to a SQLite database file.
+                The cache is consulted before evaluating any individual and each fitness value is stored as soon as it's
+                available. Any object with get(individual) and set(individual, fitness) methods can be used as well.
+
+            surrogate: str or regressor, optional (default=None)
+                A cheap regression model to pre-screen the offspring with. If provided, surrogate_ratio times more offspring are
+                generated and only the most promising ones (according to the surrogate model trained on the fitness_dict so far)
+                are evaluated by the objective function. Available options:
+                    - 'RandomForest': sklearn.ensemble.RandomForestRegressor
+                    - 'GaussianProcess': sklearn.gaussian_process.GaussianProcessRegressor (on standardized hyper-parameters)
+                    - any object with fit(X, y) and predict(X) methods.
+                The hyper-parameters are encoded as numbers (the index of the value for 'choice' type) and the surrogate
+                regresses the scalar fitness scores of the individuals.
+
+            surrogate_ratio: int, optional (default=3)
+                The number of offspring generated per offspring evaluated, when a surrogate model is used.
+
+            Attributes
+            ----------
+            discrete_space: DiscreteSpace
+                The indexed search space with the visited individuals, if there is no 'uniform' variable in the space.
+
+            n_evaluations: int
+                The total number of calls to the objective function (cached fitness values are not counted).
+
+            pareto_front: pandas dataframe
+                The non-dominated individuals among all evaluated individuals and their fitness values ("nsga2" only).
+
+            pareto_fronts: list
+                The list of the Pareto fronts (list of individuals) after each generation ("nsga2" only).
+
             """
 
     def __init__(self, 
                 evaluate, 
                 space,
                 fitness=("Max", ), 
+                multi_objective="weighted",
                 pop_size=50,
                 crossover_size=30,
                 mutation_size=20,
@@ -66,7 +406,12 @@ class GeneticAlgorithm(object):
                 fused_cutoff = 5,
                 mutation_prob=0.6,
                 algorithm=3,
-                initial_population=None):
+                initial_population=None,
+                n_jobs=1,
+                executor=None,
+                cache=None,
+                surrogate=None,
+                surrogate_ratio=3):
 
         self.chromosome_length = len(space)
         if self.chromosome_length < 1:
@@ -108,26 +453,41 @@ class GeneticAlgorithm(object):
         self.mutation_size = mutation_size
         self.algo = algorithm
         self.initial_pop = initial_population
-        self.fit_val, self.population, self.fitness_dict, self.global_cm_list = [], None, {}, None
+        if n_jobs == -1: n_jobs = os.cpu_count() or 1
+        if not isinstance(n_jobs, int) or n_jobs < 1: raise Exception("The parameter n_jobs should be a positive integer or -1.")
+        self.n_jobs = n_jobs
+        self.executor = executor
+        if isinstance(cache, str): cache = EvaluationCache(cache)
+        if hasattr(cache, 'bind'): cache.bind(evaluate)
+        self.cache = cache
+        self.fit_val, self.population, self.fitness_dict, self.discrete_space = [], None, {}, None
+        self._visited_dict, self._visited_size = None, 0
+        self._rank_table, self._rank_population, self._population_ranks = None, None, None
+        if multi_objective not in ("weighted", "nsga2"): raise Exception("The parameter multi_objective should be either 'weighted' or 'nsga2'.")
+        self.multi_objective = multi_objective
+        self.pareto_fronts, self._pareto, self._pareto_size = [], [], 0
+        if surrogate is not None and not hasattr(surrogate, 'fit') and surrogate not in ("RandomForest", "GaussianProcess"):
+            raise Exception("The parameter surrogate should be 'RandomForest', 'GaussianProcess' or a regressor with fit and predict methods.")
+        if not isinstance(surrogate_ratio, int) or surrogate_ratio < 1: raise Exception("The parameter surrogate_ratio should be a positive integer.")
+        self.surrogate = surrogate
+        self.surrogate_ratio = surrogate_ratio if surrogate is not None else 1
+        self.n_evaluations = 0
+        self._max_evaluations, self._deadline = None, None
         for i in fitness:
             if i.lower() == 'max': self.fit_val.append(1)
             else: self.fit_val.append(-1)
-        # if there is no uniform type in the space parameter, use a pre-defined crossover and mutation list as follows: 
+        # if there is no uniform type in the space parameter, index the discrete space to select unvisited individuals for mutation
         if uni == 0:
-            if len(space) == 1: self.global_cm_list = self.bit_limits[0]
-            else:
-                gcl = []
-                for i, t in zip(self.bit_limits, self.chromosome_type):
-                    if t == 'int':
-                        gcl.append(list(range(i[0], i[1]+1)))
-                    else: gcl.append(i)
-                self.global_cm_list = list(itertools.product(*gcl))
+            self.discrete_space = DiscreteSpace([range(i[0], i[1]+1) if t == 'int' else i
+                                                 for i, t in zip(self.bit_limits, self.chromosome_type)])
 
     def pop_generator(self, n):
         pop = []
         if self.initial_pop is not None:
             for i in self.initial_pop:
                 pop.append(tuple(i))
+        elif self.discrete_space is not None:
+            pop = self.discrete_space.sample_many(n)
         else:
             for x in range(n):
                 while True:
@@ -174,10 +534,8 @@ class GeneticAlgorithm(object):
         return tuple(deepcopy(ind1)), tuple(deepcopy(ind2))
 
     def blend(self, ind1, ind2, fitness_dict, z=0.4, alpha=0.5, beta=0.1):
-        # rank all individuals in fitness dict
-        ranked_list = self.select([i for i in fitness_dict], fitness_dict, len(fitness_dict.items()), choice="best")
         # determine the better individual among the two for implementing the alpha-beta crossover
-        if ranked_list.index(ind1) < ranked_list.index(ind2): better, worse = deepcopy(list(ind1)), deepcopy(list(ind2))
+        if self.rank(ind1, fitness_dict) < self.rank(ind2, fitness_dict): better, worse = deepcopy(list(ind1)), deepcopy(list(ind2))
         else: better, worse = deepcopy(list(ind2)), deepcopy(list(ind1))
         
         for i in range(self.chromosome_length):
@@ -216,57 +574,140 @@ class GeneticAlgorithm(object):
         y_ind1, y_ind2 = self.UniformCrossover(y_ind1, y_ind2)
         return tuple(deepcopy(list(x_ind1) + list(y_ind1))), tuple(deepcopy(list(x_ind2) + list(y_ind2)))
 
+    def crossover(self, ind1, ind2, fitness_dict):
+        if self.crossover_type == "SinglePoint":
+            return self.SinglePointCrossover(ind1, ind2)
+        elif self.crossover_type == "DoublePoint":
+            return self.DoublePointCrossover(ind1, ind2)
+        elif self.crossover_type == "Blend":
+            return self.blend(ind1, ind2, fitness_dict)
+        elif self.crossover_type == "Fused":
+            return self.fused(ind1, ind2, fitness_dict)
+        elif self.crossover_type == "Uniform":
+            return self.UniformCrossover(ind1, ind2)
+        else: raise Exception("Crossover type should be one of SinglePoint, DoublePoint, Blend, Fused or Uniform.")
+
+    def scores(self, population, fit_dict):
+        """
+        returns the scalar fitness scores of the individuals (the higher the better) as a numpy array.
+        Each objective is scaled in range 1-2 (inversed for minimization) and the scaled objectives are summed up.
+        """
+        fits = np.array([fit_dict[i] for i in population], dtype=float).reshape(len(population), -1)
+        if self.multi_objective == "nsga2" and fits.shape[1] > 1: return self._nsga2_scores(fits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # scale all values in range 1-2
+            fits = (fits - fits.min(axis=0)) / (fits.max(axis=0) - fits.min(axis=0)) + 1
+            # inverse min columns
+            fits = fits ** np.array(self.fit_val[:fits.shape[1]], dtype=float)
+            # rescale all values in range 1-2
+            fits = (fits - fits.min(axis=0)) / (fits.max(axis=0) - fits.min(axis=0)) + 1
+        # constant objectives (nan) don't contribute to the scores
+        return np.nansum(fits, axis=1)
+
+    def _nsga2_scores(self, fits):
+        """
+        NSGA-II scores: the lower front is always better and the crowding distance breaks the ties within a front.
+        """
+        fits = fits * np.array(self.fit_val[:fits.shape[1]], dtype=float)
+        fronts = non_dominated_sort(fits)
+        crowding = np.zeros(len(fronts))
+        for k in range(fronts.max() + 1):
+            members = np.flatnonzero(fronts == k)
+            crowding[members] = crowding_distance(fits[members])
+        # map the crowding distances to [0, 1)
+        finite = np.isfinite(crowding)
+        crowding[finite] = crowding[finite] / (1.0 + crowding[finite])
+        crowding[~finite] = 1.0
+        crowding *= 0.999
+        return (fronts.max() + 1 - fronts) + crowding
+
+    def _track_pareto(self, fitness_dict):
+        """
+        updates the Pareto front of all the evaluated individuals with the ones added to the fitness_dict since the last call.
+        """
+        if self.multi_objective != "nsga2": return
+        if self._pareto_size > len(fitness_dict): self._pareto, self._pareto_size = [], 0
+        candidates = self._pareto + list(itertools.islice(fitness_dict, self._pareto_size, None))
+        fits = np.array([fitness_dict[i] for i in candidates], dtype=float).reshape(len(candidates), -1)
+        fits = fits * np.array(self.fit_val[:fits.shape[1]], dtype=float)
+        self._pareto = [candidates[i] for i in pareto_front(fits)]
+        self._pareto_size = len(fitness_dict)
+        self.pareto_fronts.append(list(self._pareto))
+
+    @property
+    def pareto_front(self):
+        if self.multi_objective != "nsga2" or not self._pareto: return None
+        df = pd.DataFrame(self._pareto, columns=self.var_names)
+        fits = pd.DataFrame([self.fitness_dict[i] for i in self._pareto])
+        fits.columns = ['Fitness_%i' % i for i in range(fits.shape[1])]
+        return pd.concat([df, fits], axis=1)
+
     def select(self, population, fit_dict, num, choice="Roulette"):
         if num >= len(population): return population
-        o_fits = [fit_dict[i] for i in population]
-
-        df_fits = pd.DataFrame(o_fits)
-        # scale all values in range 1-2
-        df2 = [((df_fits[i] - df_fits[i].min()) / (df_fits[i].max() - df_fits[i].min())) + 1 for i in range(df_fits.shape[1])]
-        # inverse min columns
-        df2 = pd.DataFrame([df2[i]**self.fit_val[i] for i in range(len(df2))]).T
-        # rescale all values in range 1-2
-        df2 = pd.DataFrame([((df2[i] - df2[i].min()) / (df2[i].max() - df2[i].min())) + 1 for i in range(df2.shape[1])])
-        
-        fitnesses = list(df2.sum())
+        fitnesses = self.scores(population, fit_dict)
 
         if choice == "Roulette":
-            total_fitness = float(sum(fitnesses))
-            rel_fitness = [f/total_fitness for f in fitnesses]
             # Generate probability intervals for each individual
-            probs = [sum(rel_fitness[:i+1]) for i in range(len(rel_fitness))]
+            probs = np.cumsum(fitnesses / fitnesses.sum())
             # Draw new population
-            new_population = []
-            for _ in range(num):
-                r = random.random()
-                for i, individual in enumerate(population):
-                    if r <= probs[i]:
-                        new_population.append(deepcopy(individual))
-                        break
-            return new_population
+            draws = np.searchsorted(probs, [random.random() for _ in range(num)], side='left')
+            return [deepcopy(population[i]) for i in np.minimum(draws, len(population) - 1)]
         else:
-            fits_sort = sorted(fitnesses, reverse=True)
-            best = [deepcopy(population[fitnesses.index(fits_sort[i])]) for i in range(min(num, len(population)))]
-            return best
+            order = np.argsort(-fitnesses, kind='mergesort')[:num]
+            return [deepcopy(population[i]) for i in order]
+
+    def _rank_pool(self, ind):
+        """
+        returns the individuals that an "nsga2" rank is computed among: the current population of the search (and the
+        individual itself). returns None in the other modes or outside of a search (all the fitness_dict is used).
+        """
+        if self.multi_objective != "nsga2" or len(self.fit_val) == 1 or self._rank_population is None: return None
+        pool = self._rank_population
+        return pool if ind in pool else pool + [ind]
+
+    def rank(self, ind, fitness_dict):
+        """
+        returns the rank of an individual (0 for the best) among all the individuals in the fitness_dict, or among the
+        current population during an "nsga2" search.
+        The rank table is maintained incrementally as new individuals are added to the fitness_dict.
+        The NSGA-II scores depend on all the ranked individuals (non-dominated sorting), thus during an "nsga2" search the
+        individual is ranked only among the current population, instead of sorting all the evaluated individuals at every
+        call. The other modes always rank among all the fitness_dict.
+        """
+        pool = self._rank_pool(ind)
+        if pool is not None:
+            cached = self._population_ranks
+            if cached is None or cached[0] is not self._rank_population or ind not in cached[1]:
+                order = np.argsort(-self.scores(pool, fitness_dict), kind='mergesort')
+                self._population_ranks = cached = (self._rank_population, {pool[i]: r for r, i in enumerate(order)})
+            return cached[1][ind]
+        table = self._rank_table
+        if table is None or table['dict'] is not fitness_dict or len(fitness_dict) < table['size']:
+            table = self._rank_table = {'dict': fitness_dict, 'size': 0, 'keys': [], 'ranks': None}
+        if len(fitness_dict) != table['size']:
+            if len(self.fit_val) == 1:
+                # single objective: insert the new individuals into a sorted list of scores
+                for new in itertools.islice(fitness_dict, table['size'], None):
+                    bisect.insort(table['keys'], -self.fit_val[0] * float(np.ravel(fitness_dict[new])[0]))
+            else:
+                # multiple objectives: the normalized scores depend on all individuals
+                population = list(fitness_dict)
+                order = np.argsort(-self.scores(population, fitness_dict), kind='mergesort')
+                table['ranks'] = {population[i]: r for r, i in enumerate(order)}
+            table['size'] = len(fitness_dict)
+        if len(self.fit_val) == 1:
+            return bisect.bisect_left(table['keys'], -self.fit_val[0] * float(np.ravel(fitness_dict[ind])[0]))
+        return table['ranks'][ind]
 
     def custom_mutate(self, indi, fitness_dict):
-        # rank all individuals in fitness dict
-        ranked_list = self.select([i for i in fitness_dict], fitness_dict, len(fitness_dict.items()), choice="best")
+        # if there is no uniform type hyperparamter in the space variable, select a random unvisited individual of the indexed discrete space.
+        if self.discrete_space is not None:
+            self._sync_visited(fitness_dict)
+            return self.discrete_space.sample()
         # calculate parameter to adjust Gaussian distribution according to individual's rank for uniform type
-        parent_fit_param = (ranked_list.index(indi) + 1)*2/len(ranked_list)
+        pool = self._rank_pool(indi)
+        parent_fit_param = (self.rank(indi, fitness_dict) + 1)*2/(len(fitness_dict) if pool is None else len(pool))
         indi = list(indi)
-        # if there is no uniform type hyperparamter in the space variable, run the 'if' condition below to select from a pre-defined superlist of mutations and crossovers.
-        if self.global_cm_list is not None:
-            try:
-                if self.chromosome_length == 1:
-                    indi = random.choice(list(set(self.global_cm_list)-set([i[0] for i in fitness_dict.keys()])))
-                    if isinstance(indi, int): return indi,
-                    else: return tuple(indi)
-                else:
-                    indi = random.choice(list(set(self.global_cm_list)-set(list(fitness_dict.keys()))))
-                    return tuple(indi)
-            except:
-                return None
         for i in range(self.chromosome_length):
             if self.chromosome_type[i] == 'uniform':
                 if random.random() < self.mutation_prob:
@@ -286,7 +727,115 @@ class GeneticAlgorithm(object):
         if tuple(indi) in fitness_dict.keys(): indi = self.custom_mutate(tuple(indi), fitness_dict)
         return tuple(indi)
 
-    def search(self, n_generations=20, early_stopping=10, init_ratio = 0.35, crossover_ratio = 0.35):
+    def _sync_visited(self, fitness_dict):
+        """
+        marks the individuals added to the fitness_dict since the last call as visited in the discrete space.
+        """
+        if self._visited_dict is not fitness_dict or len(fitness_dict) < self._visited_size:
+            self.discrete_space.reset()
+            self._visited_dict, self._visited_size = fitness_dict, 0
+        for ind in itertools.islice(fitness_dict, self._visited_size, None):
+            self.discrete_space.visit(ind)
+        self._visited_size = len(fitness_dict)
+
+    def _executor(self):
+        """
+        returns the executor to evaluate the individuals with, and a flag that is True if the executor is owned by the search
+        (and must be shut down at the end of it).
+        """
+        if self.executor is not None: return self.executor, False
+        if self.n_jobs > 1: return concurrent.futures.ProcessPoolExecutor(max_workers=self.n_jobs), True
+        return None, False
+
+    @profiling.profiled('GeneticAlgorithm.evaluate')
+    def fit_eval(self, invalid_ind, fitness_dict, executor=None):
+        """
+        evaluates all the individuals that are not in the fitness_dict yet, concurrently if an executor is provided.
+        """
+        invalid_ind = [tuple(i) for i in invalid_ind]
+        invalid_ind = [i for i in dict.fromkeys(invalid_ind) if i not in fitness_dict]
+        if self.cache is not None:
+            invalid_ind = [i for i in invalid_ind if not self._from_cache(i, fitness_dict)]
+        # the individuals beyond the evaluation budget are dropped
+        if self._budget_left() is not None: invalid_ind = invalid_ind[:self._budget_left()]
+        if not invalid_ind: return fitness_dict
+        if executor is None:
+            for ind in invalid_ind:
+                self._store(ind, self.evaluate(ind), fitness_dict)
+        else:
+            futures = {executor.submit(self.evaluate, ind): ind for ind in invalid_ind}
+            for future in concurrent.futures.as_completed(futures):
+                self._store(futures[future], future.result(), fitness_dict)
+        return fitness_dict
+
+    def _from_cache(self, ind, fitness_dict):
+        """
+        copies the fitness value of the individual from the cache to the fitness_dict, if available.
+        """
+        fit = self.cache.get(ind)
+        if fit is None: return False
+        fitness_dict[ind] = fit
+        return True
+
+    def _store(self, ind, fit, fitness_dict):
+        fitness_dict[ind] = fit
+        self.n_evaluations += 1
+        profiling.count('GeneticAlgorithm.evaluations')
+        if self.cache is not None: self.cache.set(ind, fit)
+
+    def _budget_left(self, pending=0):
+        """
+        returns the number of evaluations left in the budget of the current search (None for no limit), considering
+        the pending evaluations as well.
+        """
+        if self._max_evaluations is None: return None
+        return max(0, self._max_evaluations - self.n_evaluations - pending)
+
+    def _out_of_budget(self, pending=0):
+        if self._deadline is not None and time.time() >= self._deadline: return True
+        return self._budget_left(pending) == 0
+
+    def _encode(self, population):
+        """
+        encodes the individuals as a numeric array for the surrogate model. 'choice' values are replaced by their index.
+        """
+        X = np.empty((len(population), self.chromosome_length), dtype=float)
+        for j, (t, limits) in enumerate(zip(self.chromosome_type, self.bit_limits)):
+            if t == 'choice':
+                limits = list(limits)
+                X[:, j] = [limits.index(ind[j]) for ind in population]
+            else:
+                X[:, j] = [ind[j] for ind in population]
+        return X
+
+    def _surrogate_model(self):
+        if self.surrogate == "RandomForest":
+            from sklearn.ensemble import RandomForestRegressor
+            return RandomForestRegressor(n_estimators=100)
+        elif self.surrogate == "GaussianProcess":
+            from sklearn.gaussian_process import GaussianProcessRegressor
+            from sklearn.pipeline import make_pipeline
+            from sklearn.preprocessing import StandardScaler
+            return make_pipeline(StandardScaler(), GaussianProcessRegressor(normalize_y=True))
+        return self.surrogate
+
+    def screen(self, candidates, num, fitness_dict):
+        """
+        returns the num most promising candidates according to the surrogate model trained on the fitness_dict.
+        The candidates are returned unchanged if no surrogate is used, or if there are not enough evaluated individuals yet.
+        """
+        if self.surrogate is None or len(candidates) <= num: return candidates
+        evaluated = list(fitness_dict)
+        if len(evaluated) < max(5, self.chromosome_length + 1): return random.sample(candidates, num)
+        model = self._surrogate_model()
+        model.fit(self._encode(evaluated), self.scores(evaluated, fitness_dict))
+        predicted = np.ravel(model.predict(self._encode(candidates)))
+        order = np.argsort(-predicted, kind='mergesort')[:num]
+        return [candidates[i] for i in order]
+
+    @profiling.profiled()
+    def search(self, n_generations=20, early_stopping=10, init_ratio = 0.35, crossover_ratio = 0.35, steady_state=False,
+               max_evaluations=None, max_time=None):
         """
         Algorithm 1:
             Initial population is instantiated. 
@@ -303,6 +852,12 @@ class GeneticAlgorithm(object):
         Algorithm 4:
             Same as algorithm 1 but mutation population is selected from the crossover population and not from the parents directly.
 
+        Steady state (asynchronous):
+            The initial population is evaluated and then n_jobs offspring are evaluated at any time. As soon as an evaluation
+            finishes, the new individual replaces the worst member of the population (if it's better) and a new offspring
+            is generated by crossover or mutation (in the ratio of crossover_size to mutation_size). Thus, the workers never wait
+            for the slowest evaluation of a generation. A generation is counted as (crossover_size + mutation_size) evaluations.
+
 
         Parameters
         ----------
@@ -319,6 +874,17 @@ class GeneticAlgorithm(object):
         crossover_ratio: float, optional (default = 0.3)
             Fraction of crossover population to select for next generation. Required only for algorithm 3.
 
+        steady_state: bool, optional (default = False)
+            If True, the asynchronous steady state search is performed instead of the generational algorithm.
+
+        max_evaluations: int, optional (default = None)
+            The maximum number of calls to the objective function in this search. The individuals that don't fit in the budget
+            are not evaluated and the search terminates as soon as the budget is exhausted.
+
+        max_time: float, optional (default = None)
+            The maximum wall-clock time of the search in hours. The search terminates after the generation (or, for the steady
+            state search, the evaluations) in progress when the time is up.
+
         
         Attributes
         ----------
@@ -337,16 +903,10 @@ class GeneticAlgorithm(object):
         best_ind:  dict,
             The best individual after the last generation.
 
-        """
-        def fit_eval(invalid_ind, fitness_dict):
-            if invalid_ind: 
-                invalid_ind = [i for i in invalid_ind if i not in fitness_dict.keys()]
-                fitnesses = list(map(self.evaluate, invalid_ind))
-                for ind, fit in zip(invalid_ind, fitnesses):
-                    fitness_dict[tuple(ind)] = fit
-            return fitness_dict
-
+        In the "nsga2" mode, the non-dominated individuals among all evaluated individuals are available as the
+        pareto_front attribute.
 
+        """
         if init_ratio >=1 or crossover_ratio >=1 or (init_ratio+crossover_ratio)>=1: raise Exception("Sum of parameters init_ratio and crossover_ratio should be in the range (0,1)")
         if self.population is not None:
             pop = self.population
@@ -354,18 +914,50 @@ class GeneticAlgorithm(object):
         else:
             pop = self.pop_generator(n=self.pop_size)       # list of tuples
             fitness_dict = {}
-        
-        # Evaluate the initial population
-        fitness_dict = fit_eval(pop, fitness_dict)
 
+        if max_evaluations is not None and (not isinstance(max_evaluations, int) or max_evaluations < 1):
+            raise Exception("The parameter max_evaluations should be a positive integer.")
+        self._max_evaluations = None if max_evaluations is None else self.n_evaluations + max_evaluations
+        self._deadline = None if max_time is None else time.time() + max_time * 60 * 60
+
+        executor, owned = self._executor()
+        try:
+            # Evaluate the initial population
+            fitness_dict = self.fit_eval(pop, fitness_dict, executor)
+            pop = [i for i in pop if i in fitness_dict]
+
+            if steady_state:
+                pop, best_ind_df = self._steady_state_search(pop, fitness_dict, n_generations, early_stopping, executor)
+            else:
+                pop, best_ind_df = self._generational_search(pop, fitness_dict, n_generations, early_stopping, init_ratio,
+                                                             crossover_ratio, executor)
+        finally:
+            if owned: executor.shutdown()
+            self._max_evaluations, self._deadline = None, None
+            self._rank_population, self._population_ranks = None, None
+
+        self.population = pop    # stores best individuals of last generation
+        self.fitness_dict = fitness_dict
+        best_ind_dict = {}
+        for name, val in zip(self.var_names, pop[0]):
+            best_ind_dict[name] = val
+        return best_ind_df, best_ind_dict
+
+    def _generational_search(self, pop, fitness_dict, n_generations, early_stopping, init_ratio, crossover_ratio, executor):
         best_indi_per_gen, best_indi_fitness_values, timer, total_pop, convergence, flag = [], [], [], [], 0, False
+        best_ind_df = None
+        n_cross, n_mutation = int(math.ceil(self.crossover_size)), int(math.ceil(self.mutation_size))
         for c_gen in range(n_generations):
             if convergence >= early_stopping:
                 print("The search converged with convergence criteria = ", early_stopping)
                 break
+            elif self._out_of_budget():
+                print("The search budget is exhausted. Stopping genetic algorithm iterations.")
+                break
             else:
                 st_time = time.time()
-                cross_pop, mutant_pop, co_pop, psum = [], [], [], len(list(fitness_dict.items()))
+                cross_pop, mutant_pop, co_pop = [], [], []
+                self._rank_population = pop
                 
                 # Generate crossover population
                 co_pop = self.select(pop, fitness_dict, int(math.ceil(self.crossover_size)))
@@ -373,36 +965,41 @@ class GeneticAlgorithm(object):
                 combi = list(itertools.combinations(list(set(pop + total_pop)), 2))
                 co_pop += combi
                 for child1, child2 in co_pop:
-                    if (len(list(fitness_dict.items())) - psum) >= int(math.ceil(self.crossover_size)): break
-                    if self.crossover_type == "SinglePoint":
-                        c1, c2 = self.SinglePointCrossover(child1, child2)
-                    elif self.crossover_type == "DoublePoint":
-                        c1, c2 = self.DoublePointCrossover(child1, child2)
-                    elif self.crossover_type == "Blend":
-                        c1, c2 = self.blend(child1, child2, fitness_dict)
-                    elif self.crossover_type == "Fused":
-                        c1, c2 = self.fused(child1, child2, fitness_dict)
-                    elif self.crossover_type == "Uniform":
-                        c1, c2 = self.UniformCrossover(child1, child2)
+                    if len(cross_pop) >= n_cross * self.surrogate_ratio: break
+                    c1, c2 = self.crossover(child1, child2, fitness_dict)
                     if c1 in fitness_dict.keys() or c2 in fitness_dict.keys() or c1==c2: continue
-                    fitness_dict = fit_eval([c1, c2], fitness_dict)
+                    if c1 in cross_pop or c2 in cross_pop: continue
                     cross_pop.extend([c1, c2])
+                cross_pop = self.screen(cross_pop, n_cross, fitness_dict)
+                # all the children of a generation are evaluated at once
+                fitness_dict = self.fit_eval(cross_pop, fitness_dict, executor)
+                cross_pop = [i for i in cross_pop if i in fitness_dict]
                     
                 # Generate mutation population
                 if self.algo == 4:
-                    mu_pop = self.select(cross_pop, fitness_dict, int(math.ceil(self.mutation_size)))
+                    mu_pop = self.select(cross_pop, fitness_dict, n_mutation)
                 else:
-                    mu_pop = self.select(pop, fitness_dict, int(math.ceil(self.mutation_size)))
+                    mu_pop = self.select(pop, fitness_dict, n_mutation)
                 
-                for mutant in mu_pop:
-                    a = self.custom_mutate(mutant, fitness_dict)
+                # keep drawing until the mutation population is complete, since the same mutant can be drawn twice
+                # (e.g. from the discrete space, which only excludes the evaluated individuals)
+                n_mutants, n_draws = len(mu_pop) * self.surrogate_ratio, 0
+                if self.discrete_space is not None: self._sync_visited(fitness_dict)
+                while len(mutant_pop) < n_mutants and n_draws < 100 * n_mutants:
+                    # stop as soon as all the unvisited individuals of the discrete space are drawn
+                    if self.discrete_space is not None and \
+                            0 < self.discrete_space.size - self.discrete_space.n_visited <= len(mutant_pop): break
+                    a = self.custom_mutate(mu_pop[n_draws % len(mu_pop)], fitness_dict)
+                    n_draws += 1
                     if a is not None:
-                        mutant_pop.append(a)
-                        fitness_dict = fit_eval([a], fitness_dict)
+                        if a not in mutant_pop: mutant_pop.append(a)
                     else: 
                         print("All combinations exhausted. Stopping genetic algorithm iterations.")
                         flag = True
                         break
+                mutant_pop = self.screen(mutant_pop, len(mu_pop), fitness_dict)
+                fitness_dict = self.fit_eval(mutant_pop, fitness_dict, executor)
+                mutant_pop = [i for i in mutant_pop if i in fitness_dict]
                 
                 # Select the next generation individuals
                 total_pop = pop + cross_pop + mutant_pop
@@ -422,6 +1019,7 @@ class GeneticAlgorithm(object):
                     else: convergence = 0
                 best_indi_per_gen.append(best_individual)
                 best_indi_fitness_values.append(fitness_dict[best_individual])
+                self._track_pareto(fitness_dict)
                 tot_time = (time.time() - st_time)/(60*60)
                 timer.append(tot_time)
                 b1 = pd.Series(best_indi_per_gen, name='Best_individual')
@@ -429,11 +1027,255 @@ class GeneticAlgorithm(object):
                 b3 = pd.Series(timer, name='Time (hours)')
                 best_ind_df = pd.concat([b1, b2, b3], axis=1)
                 if flag: break
-    
 
-        self.population = pop    # stores best individuals of last generation
-        self.fitness_dict = fitness_dict
+        if best_ind_df is None:
+            # no generation was completed
+            pop = self.select(pop, fitness_dict, len(pop), choice="best")
+            best_ind_df = pd.concat([pd.Series([pop[0]], name='Best_individual'),
+                                     pd.Series([fitness_dict[pop[0]]], name='Fitness_values'),
+                                     pd.Series([0.0], name='Time (hours)')], axis=1)
+        return pop, best_ind_df
+
+    def _offspring(self, pop, fitness_dict, pending):
+        """
+        generates new individuals for the steady state search, by crossover or mutation of the current population.
+        returns None if all the combinations are exhausted.
+        """
+        cm_size = self.crossover_size + self.mutation_size
+        for _ in range(100):
+            if len(pop) > 1 and random.random() < float(self.crossover_size) / cm_size:
+                parents = self.select(pop, fitness_dict, 2)
+                if len(parents) < 2 or parents[0] == parents[1]: parents = random.sample(pop, 2)
+                children = self.crossover(parents[0], parents[1], fitness_dict)
+            else:
+                a = self.custom_mutate(self.select(pop, fitness_dict, 1)[0], fitness_dict)
+                if a is None: return None
+                children = (a, )
+            children = [c for c in dict.fromkeys(children) if c not in fitness_dict and c not in pending]
+            if children: return children
+        return []
+
+    def _steady_state_search(self, pop, fitness_dict, n_generations, early_stopping, executor):
+        own_executor = executor is None
+        if own_executor: executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        gen_size = self.crossover_size + self.mutation_size
+        n_evaluations = n_generations * gen_size
+        best_indi_per_gen, best_indi_fitness_values, timer, convergence = [], [], [], 0
+        best_ind_df = None
+        pop = self.select(pop, fitness_dict, self.pop_size, choice="best")
+        futures, queue, n_submitted, n_done, stop = {}, [], 0, 0, False
+        st_time = time.time()
+        try:
+            while True:
+                # keep the workers busy
+                while not stop and len(futures) < self.n_jobs and n_submitted < n_evaluations:
+                    if self._out_of_budget(pending=len(futures)):
+                        print("The search budget is exhausted. Stopping genetic algorithm iterations.")
+                        stop = True
+                        break
+                    if not queue:
+                        children = []
+                        self._rank_population = pop
+                        for _ in range(self.surrogate_ratio):
+                            new = self._offspring(pop, fitness_dict, set(futures.values()) | set(children))
+                            if new is None: break
+                            children.extend(new)
+                        if new is None and not children:
+                            print("All combinations exhausted. Stopping genetic algorithm iterations.")
+                            stop = True
+                            break
+                        if not children: break
+                        queue.extend(self.screen(children, max(1, len(children) // self.surrogate_ratio), fitness_dict))
+                    ind = queue.pop(0)
+                    if self.cache is not None and self._from_cache(ind, fitness_dict):
+                        pop = self.select(pop + [ind], fitness_dict, self.pop_size, choice="best")
+                        continue
+                    futures[executor.submit(self.evaluate, ind)] = ind
+                    n_submitted += 1
+                if not futures: break
+
+                # wait for the first evaluation to finish
+                done, _ = concurrent.futures.wait(list(futures), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    ind = futures.pop(future)
+                    self._store(ind, future.result(), fitness_dict)
+                    # replace the worst member of the population
+                    pop = self.select(pop + [ind], fitness_dict, self.pop_size, choice="best")
+                    n_done += 1
+
+                    # Storing the best individuals after each generation
+                    if n_done % gen_size == 0:
+                        best_individual = pop[0]
+                        if len(best_indi_per_gen)>0:
+                            if best_individual==best_indi_per_gen[-1]: convergence += 1
+                            else: convergence = 0
+                        best_indi_per_gen.append(best_individual)
+                        best_indi_fitness_values.append(fitness_dict[best_individual])
+                        self._track_pareto(fitness_dict)
+                        timer.append((time.time() - st_time)/(60*60))
+                        st_time = time.time()
+                        b1 = pd.Series(best_indi_per_gen, name='Best_individual')
+                        b2 = pd.Series(best_indi_fitness_values, name='Fitness_values')
+                        b3 = pd.Series(timer, name='Time (hours)')
+                        best_ind_df = pd.concat([b1, b2, b3], axis=1)
+                        if convergence >= early_stopping:
+                            print("The search converged with convergence criteria = ", early_stopping)
+                            stop = True
+        finally:
+            for future in futures: future.cancel()
+            if own_executor: executor.shutdown()
+
+        if best_ind_df is None or n_done % gen_size != 0:
+            best_individual = pop[0]
+            best_indi_per_gen.append(best_individual)
+            best_indi_fitness_values.append(fitness_dict[best_individual])
+            self._track_pareto(fitness_dict)
+            timer.append((time.time() - st_time)/(60*60))
+            b1 = pd.Series(best_indi_per_gen, name='Best_individual')
+            b2 = pd.Series(best_indi_fitness_values, name='Fitness_values')
+            b3 = pd.Series(timer, name='Time (hours)')
+            best_ind_df = pd.concat([b1, b2, b3], axis=1)
+        return pop, best_ind_df
+
+
+def _evolve_island(ga, n_generations, search_kwargs):
+    best_ind_df, _ = ga.search(n_generations=n_generations, **search_kwargs)
+    return ga, best_ind_df
+
+
+class IslandGeneticAlgorithm(object):
+    """
+    The island model of the genetic algorithm: several populations (islands) evolve in parallel processes and exchange
+    their best individuals (migrants) every few generations. The islands can have different settings (e.g., crossover_type
+    or algorithm) and the diversity of the islands prevents the premature convergence of a single population.
+
+    Parameters
+    ----------
+    islands: list
+        A list of GeneticAlgorithm instances. The objective function must be picklable (e.g., defined at the top level of a
+        module) and the islands can't have their own executor.
+
+    migration_interval: int, optional (default = 5)
+        The number of generations between two migrations.
+
+    n_migrants: int, optional (default = 2)
+        The number of best individuals of each island that migrate to the next island (ring topology) and replace
+        the worst members of its population.
+
+    share_fitness: bool, optional (default = True)
+        If True, the fitness values of all islands are shared after each migration, so the same individual is never
+        evaluated on two islands after that.
+
+    n_jobs: int, optional (default = None)
+        The number of worker processes. If None, one process per island is used. If 1, islands evolve in the main process.
+
+    Attributes
+    ----------
+    fitness_dict: dict,
+        dictionary of all individuals evaluated on all islands
+
+    pareto_front: pandas dataframe
+        The non-dominated individuals among all the individuals evaluated on all islands and their fitness values, after
+        a search with the "nsga2" multi_objective (None otherwise).
+
+    """
+    def __init__(self, islands, migration_interval=5, n_migrants=2, share_fitness=True, n_jobs=None):
+        if len(islands) < 1 or not all(isinstance(ga, GeneticAlgorithm) for ga in islands):
+            raise Exception("The parameter islands should be a list of GeneticAlgorithm instances.")
+        if any(ga.executor is not None for ga in islands):
+            raise Exception("The islands can't have their own executor.")
+        if not isinstance(migration_interval, int) or migration_interval < 1:
+            raise Exception("The parameter migration_interval should be a positive integer.")
+        self.islands = list(islands)
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.share_fitness = share_fitness
+        self.n_jobs = len(islands) if n_jobs is None else n_jobs
+        self.fitness_dict = {}
+        self.pareto_front = None
+
+    def migrate(self):
+        """
+        sends the best individuals of each island to the next island (ring topology).
+        """
+        migrants = [ga.select(ga.population, ga.fitness_dict, self.n_migrants, choice="best") for ga in self.islands]
+        for i, ga in enumerate(self.islands):
+            incoming = [m for m in migrants[i - 1] if m not in ga.population]
+            for m in incoming:
+                ga.fitness_dict[m] = self.islands[i - 1].fitness_dict[m]
+            size = len(ga.population)
+            ga.population = ga.select(ga.population + incoming, ga.fitness_dict, size, choice="best")
+
+    @profiling.profiled()
+    def search(self, n_generations=20, **kwargs):
+        """
+        The main function to evolve all the islands.
+
+        Parameters
+        ----------
+        n_generations: integer, optional (default = 20)
+                An integer for the number of generations to evolve each island for.
+
+        kwargs
+            Any other argument of the GeneticAlgorithm.search method (e.g., early_stopping or steady_state).
+
+        Returns
+        -------
+        best_ind_df:  pandas dataframe
+            A pandas dataframe of best individuals of each generation of each island
+
+        best_ind:  dict,
+            The best individual among all the individuals evaluated on all islands.
+
+        If the islands use the "nsga2" multi_objective, the non-dominated individuals among all the individuals evaluated
+        on all islands are available as the pareto_front attribute.
+
+        """
+        executor = None
+        if self.n_jobs > 1: executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.n_jobs)
+        dfs, generation = [], 0
+        try:
+            while generation < n_generations:
+                n_gen = min(self.migration_interval, n_generations - generation)
+                if executor is None:
+                    results = [_evolve_island(ga, n_gen, kwargs) for ga in self.islands]
+                else:
+                    futures = [executor.submit(_evolve_island, ga, n_gen, kwargs) for ga in self.islands]
+                    results = [f.result() for f in futures]
+                self.islands = [r[0] for r in results]
+                for i, (_, df) in enumerate(results):
+                    df = df.copy()
+                    df.insert(0, 'Generation', range(generation, generation + df.shape[0]))
+                    df.insert(0, 'Island', i)
+                    dfs.append(df)
+                generation += n_gen
+
+                # global fitness dictionary
+                for ga in self.islands:
+                    self.fitness_dict.update(ga.fitness_dict)
+                if generation < n_generations:
+                    self.migrate()
+                    if self.share_fitness:
+                        for ga in self.islands:
+                            ga.fitness_dict.update(self.fitness_dict)
+        finally:
+            if executor is not None: executor.shutdown()
+
+        best_ind_df = pd.concat(dfs, axis=0, ignore_index=True)
+        # the best of all the evaluated individuals
+        ga = self.islands[0]
+        candidates = list(self.fitness_dict)
+        if ga.multi_objective == "nsga2":
+            # the best individual is always on the Pareto front, which is found in chunks
+            fits = np.array([self.fitness_dict[i] for i in candidates], dtype=float).reshape(len(candidates), -1)
+            candidates = [candidates[i] for i in pareto_front(fits * np.array(ga.fit_val[:fits.shape[1]], dtype=float))]
+        best_individual = ga.select(candidates, self.fitness_dict, 1, choice="best")[0]
         best_ind_dict = {}
-        for name, val in zip(self.var_names, best_individual):
+        for name, val in zip(ga.var_names, best_individual):
             best_ind_dict[name] = val
+        if ga.multi_objective == "nsga2":
+            front = pd.DataFrame(candidates, columns=ga.var_names)
+            fits = pd.DataFrame([self.fitness_dict[i] for i in candidates])
+            fits.columns = ['Fitness_%i' % i for i in range(fits.shape[1])]
+            self.pareto_front = pd.concat([front, fits], axis=1)
         return best_ind_df, best_ind_dict
@@ -3,6 +3,8 @@ The cheml.preprocessing module includes (please click on links adjacent to funct
     - MissingValues: :func:`~cheml.preprocessing.MissingValues`
     - ConstantColumns: :func:`~cheml.preprocessing.ConstantColumns`
     - Outliers: :func:`~cheml.preprocessing.Outliers`
+    - ColumnStatistics: :func:`~cheml.preprocessing.ColumnStatistics`
+    - iter_chunks: :func:`~cheml.preprocessing.iter_chunks`
 """
 
 from .handle_missing import MissingValues
@@ -10,9 +12,14 @@ from .handle_missing import MissingValues
 from .purge import ConstantColumns
 from .purge import Outliers
 
+from .streaming import ColumnStatistics
+from .streaming import iter_chunks
+
 
 __all__ = [
     'MissingValues',
     'ConstantColumns',
-    'Outliers'
+    'Outliers',
+    'ColumnStatistics',
+    'iter_chunks'
 ]
@@ -5,9 +5,10 @@ import pandas as pd
 import numpy as np
 
 from chemml.utils import check_object_col
+from chemml.preprocessing.streaming import ColumnStatistics, _ChunkedMixin
 
 
-class MissingValues(object):
+class MissingValues(_ChunkedMixin):
     """
     find missing values and interpolate/replace or remove them.
 
@@ -30,21 +31,38 @@ class MissingValues(object):
     inf_as_null: boolean, optional (default=True)
         If True inf and -inf elements are considered to be null in computations.
 
+    copy: boolean, optional (default=True)
+        If False, the input dataframe or array may be modified in place (and its memory may be shared with the output)
+        to avoid copying wide tables. If True, the input is never modified.
+
     Returns
     -------
     data frame
     mask: Only if strategy = ignore_row. Mask is a binary pandas series which stores the information regarding removed
+
+    Notes
+    -----
+    Tables larger than memory can be processed in chunks with the fit (or partial_fit) and transform_chunks methods,
+    for all the strategies except 'interpolate'. The columns of the table are determined by the first chunk.
+
+    Dataframes with only float columns are processed with one pass over a float array, except for the 'interpolate'
+    strategy. The other dataframes keep the dtypes of their columns (e.g. integer columns without missing values).
+    Numpy arrays are also accepted; the output and the mask are numpy arrays in that case. The mask of the
+    'ignore_column' strategy covers all the columns of the array (the columns with all null values are False), thus
+    the transform method accepts arrays of the same width as the fitted one.
     """
 
     def __init__(self,
                  strategy="ignore_row",
                  string_as_null=True,
                  inf_as_null=True,
-                 missing_values=None):
+                 missing_values=None,
+                 copy=True):
         self.strategy = strategy
         self.string_as_null = string_as_null
         self.inf_as_null = inf_as_null
         self.missing_values = missing_values
+        self.copy = copy
 
     def fit_transform(self, df):
         """
@@ -55,7 +73,7 @@ class MissingValues(object):
 
         Parameters
         ----------
-        df : pandas data frame
+        df : pandas data frame or numpy array
 
         Attributes
         ----------
@@ -65,36 +83,59 @@ class MissingValues(object):
             The goal is keeping track of removed rows/columns to change the target data frame or other input data frames based
             on that. The mask can later be used in the transform method to change other data frames in the same way.
         """
-        if self.inf_as_null == True:
-            df.replace([np.inf, -np.inf, 'inf', '-inf'], np.nan, True)
-        if self.string_as_null == True:
-            for col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        if isinstance(self.missing_values, (list, tuple)):
-            for pattern in self.missing_values:
-                df.replace(pattern, np.nan, True)
+        if self.strategy not in ('zero', 'ignore_row', 'ignore_column', 'interpolate'):
+            msg = "Wrong strategy has been passed"
+            raise TypeError(msg)
+        if isinstance(df, np.ndarray):
+            if df.dtype.kind in 'biuf' and self.strategy != 'interpolate':
+                X = np.array(df, dtype=float) if self.copy else np.asarray(df, dtype=float)
+                X, row_mask, col_mask = self._fit_transform_array(X)
+                if self.strategy == 'ignore_row':
+                    self.mask = row_mask
+                else:
+                    # the mask of all the columns, including the dropped null ones
+                    self.mask = np.zeros(len(self._not_null), dtype=bool)
+                    self.mask[self._not_null] = col_mask
+                return X
+            X = self.fit_transform(pd.DataFrame(df)).values
+            if self.strategy == 'ignore_row':
+                self.mask = self.mask.values
+            elif self.strategy == 'ignore_column':
+                self.mask = self.mask.reindex(range(df.shape[1]), fill_value=False).values
+            return X
+        if self.strategy != 'interpolate':
+            X = self._float_values(df)
+            if X is not None:
+                X, row_mask, col_mask = self._fit_transform_array(X)
+                columns = df.columns[self._not_null]
+                if self.strategy == 'ignore_row':
+                    self.mask = pd.Series(row_mask, index=df.index)
+                    return pd.DataFrame(X, index=df.index[row_mask], columns=columns)
+                elif self.strategy == 'ignore_column':
+                    self.mask = pd.Series(col_mask, index=columns)
+                    return pd.DataFrame(X, index=df.index, columns=columns[col_mask])
+                return pd.DataFrame(X, index=df.index, columns=columns)
 
-        df = check_object_col(df, 'df')
+        if self.copy:
+            df = df.copy()
+        df = self._clean(df)
         # drop null columns
         df.dropna(axis=1, how='all', inplace=True)
 
         if self.strategy == 'zero':
-            for col in df.columns:
-                df[col].fillna(value=0, inplace=True)
+            df.fillna(value=0, inplace=True)
             return df
         elif self.strategy == 'ignore_row':
             dfi = df.index
             df.dropna(axis=0, how='any', inplace=True)
-            mask = [i in df.index for i in dfi]
-            self.mask = pd.Series(mask, index=dfi)
+            self.mask = pd.Series(dfi.isin(df.index), index=dfi)
             # self.mask = pd.notnull(df).all(1)
             # df = df[self.mask]
             return df
         elif self.strategy == 'ignore_column':
             dfc = df.columns
             df.dropna(axis=1, how='any', inplace=True)
-            mask = [i in df.columns for i in dfc]
-            self.mask = pd.Series(mask, index=dfc)
+            self.mask = pd.Series(dfc.isin(df.columns), index=dfc)
             # self.mask = pd.notnull(df).all(0)
             # df = df.T[self.mask].T
             return df
@@ -108,18 +149,155 @@ class MissingValues(object):
             msg = "Wrong strategy has been passed"
             raise TypeError(msg)
 
+    def _float_values(self, df):
+        """
+        returns the values of the dataframe as one float array, or None if the dataframe has non-float columns, whose
+        dtypes are kept by the pandas path.
+        """
+        if not all(dtype.kind == 'f' for dtype in df.dtypes):
+            return None
+        if self.copy:
+            return np.array(df.values, dtype=float)
+        return np.asarray(df.values, dtype=float)
+
+    def _fit_transform_array(self, X):
+        """
+        the fast path of fit_transform: one pass over a float array. X is modified in place.
+        returns the transformed array, and the masks of the kept rows and (not null) columns.
+        """
+        if self.inf_as_null == True:
+            X[np.isinf(X)] = np.nan
+        if isinstance(self.missing_values, (list, tuple)):
+            patterns = [v for v in self.missing_values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            if len(patterns) > 0:
+                X[np.isin(X, patterns)] = np.nan
+        null = np.isnan(X)
+        # drop null columns
+        self._not_null = ~null.all(axis=0)
+        if not self._not_null.all():
+            X, null = X[:, self._not_null], null[:, self._not_null]
+        row_mask = np.ones(X.shape[0], dtype=bool)
+        col_mask = np.ones(X.shape[1], dtype=bool)
+        if self.strategy == 'zero':
+            X[null] = 0
+        elif self.strategy == 'ignore_row':
+            row_mask = ~null.any(axis=1)
+            X = X[row_mask]
+        elif self.strategy == 'ignore_column':
+            col_mask = ~null.any(axis=0)
+            X = X[:, col_mask]
+        return X, row_mask, col_mask
+
+    def _clean(self, df):
+        """
+        replace the missing values with nan and drop the non-numeric columns.
+        """
+        if self.inf_as_null == True:
+            df.replace([np.inf, -np.inf, 'inf', '-inf'], np.nan, True)
+        if self.string_as_null == True:
+            for col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        if isinstance(self.missing_values, (list, tuple)):
+            for pattern in self.missing_values:
+                df.replace(pattern, np.nan, True)
+
+        df = check_object_col(df, 'df')
+        return df
+
+    def _reset(self):
+        self.statistics_ = None
+        self.columns_ = None
+
+    def partial_fit(self, df):
+        """
+        update the per-column statistics (e.g. number of null values) with a chunk of the table.
+
+        Parameters
+        ----------
+        df : pandas dataframe
+            a chunk of the rows of the table
+
+        Attributes
+        ----------
+        statistics_: chemml.preprocessing.ColumnStatistics
+            the statistics of the columns after replacing the missing values with nan.
+
+        Returns
+        -------
+        self
+        """
+        if self.strategy == 'interpolate':
+            msg = "The 'interpolate' strategy is not available for the chunked processing."
+            raise ValueError(msg)
+        if getattr(self, 'statistics_', None) is None:
+            self.statistics_ = ColumnStatistics()
+            self.columns_ = None
+            self._masks = []
+        df = self._clean(df.copy())
+        if self.columns_ is None:
+            self.columns_ = df.columns
+        self.statistics_.update(df.reindex(columns=self.columns_).values)
+        return self
+
+    def transform_chunk(self, df):
+        """
+        transform a chunk of the table, after fitting with the fit or partial_fit methods.
+
+        Parameters
+        ----------
+        df : pandas dataframe
+            a chunk of the rows of the table
+
+        Returns
+        -------
+        transformed chunk
+        """
+        if getattr(self, 'statistics_', None) is None:
+            msg = "The partial_fit or fit methods must be called before transforming the chunks."
+            raise ValueError(msg)
+        df = self._clean(df.copy()).reindex(columns=self.columns_)
+        # drop null columns
+        not_null = self.statistics_.count > 0
+        df = df.loc[:, not_null]
+        if self.strategy == 'zero':
+            return df.fillna(value=0)
+        elif self.strategy == 'ignore_row':
+            mask = df.notnull().all(axis=1)
+            self._masks.append(mask)
+            return df[mask]
+        elif self.strategy == 'ignore_column':
+            mask = self.statistics_.nan_count[not_null] == 0
+            self.mask = pd.Series(mask, index=df.columns)
+            return df.loc[:, mask]
+        else:
+            msg = "Wrong strategy has been passed"
+            raise TypeError(msg)
+
+    def _start_transform(self):
+        self._masks = []
+
+    def _end_transform(self):
+        if self.strategy == 'ignore_row' and len(self._masks) > 0:
+            self.mask = pd.concat(self._masks)
+
     def transform(self, df):
         """
         Only if the class is fitted with 'ignore_row' or 'ignore_column' strategies.
 
         Parameters
         ----------
-        df : pandas dataframe
+        df : pandas dataframe or numpy array
 
         Returns
         -------
         transformed data frame based on the mask vector from fit_transform method.
         """
+        if isinstance(df, np.ndarray):
+            mask = np.asarray(self.mask, dtype=bool)
+            if self.strategy == 'ignore_row':
+                return df[mask]
+            elif self.strategy == 'ignore_column':
+                return df[:, mask]
         if self.strategy == 'ignore_row':
             return df[self.mask]
         elif self.strategy == 'ignore_column':
@@ -1,20 +1,30 @@
 from builtins import range
+import warnings
+
 import numpy as np
+import pandas as pd
+
+from chemml.preprocessing.streaming import ColumnStatistics, _ChunkedMixin
 
 
-class ConstantColumns(object):
+class ConstantColumns(_ChunkedMixin):
     """
     remove constant columns
 
 
     Attributes
     ----------
-    removed_columns: list of column headers that have been removed
+    removed_columns_: list of column headers (or column positions for numpy arrays) that have been removed
+
+    mask_: boolean numpy array of the columns that have been kept
 
     Returns
     -------
     df: pandas dataframe
 
+    Notes
+    -----
+    Tables larger than memory can be processed in chunks with the fit (or partial_fit) and transform_chunks methods.
     """
 
     def fit_transform(self, df):
@@ -23,18 +33,21 @@ class ConstantColumns(object):
 
         Parameters
         ----------
-        df: pandas dataframe
+        df: pandas dataframe or numpy array
             input dataframe
 
         Returns
         -------
         transformed dataframe
         """
-        dfc = df.columns
-        df = df.loc[:, (df != df.iloc[0]).any()]
-        self.removed_columns_ = np.array(
-            [i for i in dfc if i not in df.columns])
-        return df
+        values = df if isinstance(df, np.ndarray) else df.values
+        # a column is constant if all its values are equal to the first row (nan is never equal)
+        self.mask_ = (values != values[0]).any(axis=0)
+        if isinstance(df, np.ndarray):
+            self.removed_columns_ = np.flatnonzero(~self.mask_)
+            return df[:, self.mask_]
+        self.removed_columns_ = np.array(df.columns[~self.mask_])
+        return df.loc[:, self.mask_]
 
     def transform(self, df):
         """
@@ -42,18 +55,52 @@ class ConstantColumns(object):
 
         Parameters
         ----------
-        df: pandas dataframe
+        df: pandas dataframe or numpy array
             input dataframe
 
         Returns
         -------
         transformed dataframe
         """
-        df = df.drop(self.removed_columns_, 1)
+        if isinstance(df, np.ndarray):
+            return np.delete(df, self.removed_columns_, axis=1)
+        df = df.drop(self.removed_columns_, axis=1)
         return df
 
+    def _reset(self):
+        self._first = None
+
+    def partial_fit(self, df):
+        """
+        update the constant columns with a chunk of the table. A column is constant if all its values are equal to the
+        value of the first row of the table.
 
-class Outliers(object):
+        Parameters
+        ----------
+        df: pandas dataframe
+            a chunk of the rows of the table
+
+        Returns
+        -------
+        self
+        """
+        if len(df) == 0:
+            return self
+        if getattr(self, '_first', None) is None:
+            self._first = df.iloc[0]
+            self._varying = pd.Series(False, index=df.columns)
+        self._varying |= (df != self._first).any()
+        self.removed_columns_ = np.array(self._varying.index[~self._varying.values])
+        return self
+
+    def transform_chunk(self, df):
+        """
+        remove the constant columns from a chunk of the table, after fitting with the fit or partial_fit methods.
+        """
+        return self.transform(df)
+
+
+class Outliers(_ChunkedMixin):
     """
     remove all rows where the values of a certain column are within an specified
     standard deviation from mean/median.
@@ -69,16 +116,22 @@ class Outliers(object):
 
     Attributes
     ----------
-    removed_rows_: numpy array of indices that have been removed
+    removed_rows_: numpy array of indices (or row positions for numpy arrays) that have been removed
+
+    mask_: boolean numpy array of the rows that have been kept
 
     Notes
     -----
     We highly recommend you to remove constant columns first and then remove outliers.
+
+    Tables larger than memory can be processed in chunks with the fit (or partial_fit) and transform_chunks methods.
+    The medians are estimated from a random sample of reservoir_size rows (exact for smaller tables).
     """
 
-    def __init__(self, m=2.0, strategy='median'):
+    def __init__(self, m=2.0, strategy='median', reservoir_size=10000):
         self.m = m
         self.strategy = strategy
+        self.reservoir_size = reservoir_size
 
     def fit_transform(self, df):
         """
@@ -86,21 +139,40 @@ class Outliers(object):
 
         Parameters
         ----------
-        df: pandas dataframe
+        df: pandas dataframe or numpy array
             input dataframe
 
         Returns
         -------
         transformed dataframe
         """
-        if self.strategy == 'mean':
-            mask = ((df - df.mean()).abs() <= self.m * df.std(ddof=0)).T.all()
-        elif self.strategy == 'median':
-            mask = (((df - df.median()).abs()) <=
-                    self.m * df.std(ddof=0)).T.all()
-        df = df.loc[mask, :]
-        self.removed_rows_ = np.array(mask[mask == False].index)
-        return df
+        if self.strategy not in ('mean', 'median'):
+            msg = "The strategy must be either 'mean' or 'median'."
+            raise ValueError(msg)
+        if isinstance(df, pd.DataFrame) and not all(dtype.kind in 'biuf' for dtype in df.dtypes):
+            # the non-numeric columns are left to pandas
+            if self.strategy == 'mean':
+                mask = ((df - df.mean()).abs() <= self.m * df.std(ddof=0)).T.all()
+            else:
+                mask = (((df - df.median()).abs()) <= self.m * df.std(ddof=0)).T.all()
+            self.mask_ = mask.values
+            self.removed_rows_ = np.array(mask[mask == False].index)
+            return df.loc[mask, :]
+
+        values = np.asarray(df, dtype=float)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            # the columns without any value have nan statistics, and all the rows are removed as in pandas
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if self.strategy == 'mean':
+                center = np.nanmean(values, axis=0)
+            else:
+                center = np.nanmedian(values, axis=0)
+            self.mask_ = (np.abs(values - center) <= self.m * np.nanstd(values, axis=0)).all(axis=1)
+        if isinstance(df, np.ndarray):
+            self.removed_rows_ = np.flatnonzero(~self.mask_)
+            return df[self.mask_]
+        self.removed_rows_ = np.array(df.index[~self.mask_])
+        return df.loc[self.mask_, :]
 
     def transform(self, df):
         """
@@ -108,12 +180,62 @@ class Outliers(object):
 
         Parameters
         ----------
-        df: pandas dataframe
+        df: pandas dataframe or numpy array
             input dataframe
 
         Returns
         -------
         transformed dataframe
         """
-        df = df.drop(self.removed_rows_, 0)
+        if isinstance(df, np.ndarray):
+            return np.delete(df, self.removed_rows_.astype(int), axis=0)
+        df = df.drop(self.removed_rows_, axis=0)
         return df
+
+    def _reset(self):
+        self.statistics_ = None
+
+    def partial_fit(self, df):
+        """
+        update the mean, median and standard deviation of the columns with a chunk of the table.
+
+        Parameters
+        ----------
+        df: pandas dataframe
+            a chunk of the rows of the table
+
+        Attributes
+        ----------
+        statistics_: chemml.preprocessing.ColumnStatistics
+            the statistics of the columns.
+
+        Returns
+        -------
+        self
+        """
+        if getattr(self, 'statistics_', None) is None:
+            self.statistics_ = ColumnStatistics(reservoir_size=self.reservoir_size)
+            self.removed_rows_ = np.array([])
+        self.statistics_.update(df.values)
+        return self
+
+    def transform_chunk(self, df):
+        """
+        remove the outliers from a chunk of the table, after fitting with the fit or partial_fit methods.
+        The indices of the removed rows are appended to the removed_rows_ attribute.
+        """
+        if getattr(self, 'statistics_', None) is None:
+            msg = "The partial_fit or fit methods must be called before transforming the chunks."
+            raise ValueError(msg)
+        if self.strategy == 'mean':
+            center = self.statistics_.mean
+        elif self.strategy == 'median':
+            center = self.statistics_.median
+        with np.errstate(invalid='ignore'):
+            mask = (np.abs(df.values.astype(float) - center) <= self.m * self.statistics_.std).all(axis=1)
+        removed = np.array(df.index[~mask])
+        self.removed_rows_ = np.concatenate([self.removed_rows_, removed]) if len(self.removed_rows_) > 0 else removed
+        return df.loc[mask, :]
+
+    def _start_transform(self):
+        self.removed_rows_ = np.array([])
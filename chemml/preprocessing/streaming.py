@@ -0,0 +1,241 @@
+import os
+
+import pandas as pd
+import numpy as np
+
+
+def iter_chunks(data, chunksize=100000, **kwargs):
+    """
+    iterate over the rows of a table in chunks of pandas dataframes.
+
+    Parameters
+    ----------
+    data: pandas dataframe, numpy array, str or iterable
+        The input table. Available options:
+            - pandas dataframe
+            - numpy array or memmap (2D): the chunks are indexed by the row numbers
+            - str: the path to a csv (or any text file readable by pandas.read_csv), parquet (requires pyarrow) or npy
+              (memory-mapped) file
+            - an iterable of pandas dataframes, e.g. the chunks of a pandas.read_csv reader
+
+    chunksize: int, optional (default=100000)
+        The number of rows of each chunk.
+
+    kwargs:
+        The extra parameters of pandas.read_csv for csv files.
+
+    Returns
+    -------
+    generator of pandas dataframes
+    """
+    if isinstance(data, str):
+        extension = os.path.splitext(data)[1].lower()
+        if extension == '.npy':
+            data = np.load(data, mmap_mode='r')
+        elif extension == '.parquet':
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                msg = "The pyarrow library is required to read parquet files."
+                raise ImportError(msg)
+            start = 0
+            for batch in pq.ParquetFile(data).iter_batches(batch_size=chunksize):
+                chunk = batch.to_pandas()
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+                start += len(chunk)
+                yield chunk
+            return
+        else:
+            for chunk in pd.read_csv(data, chunksize=chunksize, **kwargs):
+                yield chunk
+            return
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, data.shape[0], chunksize):
+            yield data.iloc[start:start + chunksize]
+    elif isinstance(data, np.ndarray):
+        if data.ndim != 2:
+            msg = "The numpy array must be 2 dimensional."
+            raise ValueError(msg)
+        for start in range(0, data.shape[0], chunksize):
+            chunk = np.asarray(data[start:start + chunksize])
+            yield pd.DataFrame(chunk, index=pd.RangeIndex(start, start + chunk.shape[0]))
+    else:
+        for chunk in data:
+            yield chunk
+
+
+class ColumnStatistics(object):
+    """
+    accumulate the per-column statistics of a numeric table over chunks of rows, without keeping the table in memory.
+    The mean and standard deviation are merged exactly (Chan et al.) and the median is estimated from a uniform
+    reservoir sample of the rows (it's exact if the table has no more rows than the reservoir).
+
+    Parameters
+    ----------
+    reservoir_size: int, optional (default=10000)
+        The number of rows to sample for the estimation of the medians.
+
+    random_state: int or numpy RandomState, optional (default=None)
+        The random state of the reservoir sampling.
+
+    Attributes
+    ----------
+    n_rows: int
+        The number of rows seen so far.
+
+    count: numpy array
+        The number of non-null values of each column.
+
+    nan_count: numpy array
+        The number of null values of each column.
+
+    min, max, mean, std, median: numpy array
+        The statistics of the non-null values of each column (nan for the columns without any value).
+    """
+
+    def __init__(self, reservoir_size=10000, random_state=None):
+        self.reservoir_size = reservoir_size
+        self.random_state = random_state
+        self.n_rows = 0
+
+    def update(self, X):
+        """
+        update the statistics with a chunk of rows.
+
+        Parameters
+        ----------
+        X: numpy array, shape (n_rows, n_columns)
+            The chunk of rows. The null values must be nan.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2:
+            msg = "The chunk must be 2 dimensional."
+            raise ValueError(msg)
+        n, m = X.shape
+        if self.n_rows == 0:
+            self.count = np.zeros(m, dtype=np.int64)
+            self.min = np.full(m, np.inf)
+            self.max = np.full(m, -np.inf)
+            self._mean = np.zeros(m)
+            self._m2 = np.zeros(m)
+            self._reservoir = np.empty((0, m))
+            self._rng = np.random.RandomState(self.random_state) if not isinstance(
+                self.random_state, np.random.RandomState) else self.random_state
+        elif m != self.count.shape[0]:
+            msg = "All the chunks must have the same number of columns."
+            raise ValueError(msg)
+        if n == 0:
+            return self
+
+        finite = ~np.isnan(X)
+        count = finite.sum(axis=0)
+        self.min = np.minimum(self.min, np.where(finite, X, np.inf).min(axis=0))
+        self.max = np.maximum(self.max, np.where(finite, X, -np.inf).max(axis=0))
+        # merge the mean and the sum of squared deviations of the chunk
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, np.where(finite, X, 0).sum(axis=0) / count, 0)
+        m2 = (np.where(finite, X - mean, 0) ** 2).sum(axis=0)
+        total = self.count + count
+        delta = mean - self._mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._mean = np.where(total > 0, self._mean + delta * count / total, 0)
+            self._m2 = np.where(total > 0, self._m2 + m2 + delta ** 2 * self.count * count / total, 0)
+        self.count = total
+
+        # reservoir sampling of the rows
+        free = self.reservoir_size - self._reservoir.shape[0]
+        if free > 0:
+            self._reservoir = np.vstack([self._reservoir, X[:free]])
+        if n > free:
+            positions = np.arange(self.n_rows + max(free, 0), self.n_rows + n)
+            slots = (self._rng.random_sample(len(positions)) * (positions + 1)).astype(np.int64)
+            replace = slots < self.reservoir_size
+            # the later rows overwrite the earlier ones, as in the sequential algorithm
+            self._reservoir[slots[replace]] = X[max(free, 0):][replace]
+        self.n_rows += n
+        return self
+
+    @property
+    def nan_count(self):
+        return self.n_rows - self.count
+
+    @property
+    def mean(self):
+        return np.where(self.count > 0, self._mean, np.nan)
+
+    @property
+    def std(self):
+        """
+        The population standard deviation (ddof=0), as used by the preprocessing methods.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 0, np.sqrt(self._m2 / self.count), np.nan)
+
+    @property
+    def median(self):
+        median = np.full(self.count.shape[0], np.nan)
+        filled = ~np.isnan(self._reservoir).all(axis=0)
+        if filled.any():
+            median[filled] = np.nanmedian(self._reservoir[:, filled], axis=0)
+        return median
+
+
+class _ChunkedMixin(object):
+    """
+    the streaming API of the preprocessing methods: fit over the chunks of a (possibly larger than memory) table with
+    partial_fit, and transform it chunk by chunk.
+    """
+
+    def fit(self, data, chunksize=100000, **kwargs):
+        """
+        fit the method to all the chunks of the input table, without loading the whole table in memory.
+
+        Parameters
+        ----------
+        data: pandas dataframe, numpy array, str or iterable
+            The input table. Look at the chemml.preprocessing.iter_chunks function for the available options.
+
+        chunksize: int, optional (default=100000)
+            The number of rows of each chunk.
+
+        kwargs:
+            The extra parameters of pandas.read_csv for csv files.
+
+        Returns
+        -------
+        self
+        """
+        self._reset()
+        for chunk in iter_chunks(data, chunksize, **kwargs):
+            self.partial_fit(chunk)
+        return self
+
+    def transform_chunks(self, data, chunksize=100000, **kwargs):
+        """
+        transform the input table chunk by chunk, after fitting with the fit or partial_fit methods.
+
+        Parameters
+        ----------
+        data: pandas dataframe, numpy array, str or iterable
+            The input table. Look at the chemml.preprocessing.iter_chunks function for the available options.
+
+        chunksize: int, optional (default=100000)
+            The number of rows of each chunk.
+
+        kwargs:
+            The extra parameters of pandas.read_csv for csv files.
+
+        Returns
+        -------
+        generator of the transformed pandas dataframes
+        """
+        self._start_transform()
+        for chunk in iter_chunks(data, chunksize, **kwargs):
+            yield self.transform_chunk(chunk)
+        self._end_transform()
+
+    def _start_transform(self):
+        pass
+
+    def _end_transform(self):
+        pass
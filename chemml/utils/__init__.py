@@ -13,6 +13,8 @@ from .utilities import chunk
 # from .utilities import return2Dshape
 from .utilities import bool_formatter
 from .utilities import padaxis
+from .utilities import memmap_npz
+from . import profiling
 
 from .validation import isfloat
 from .validation import islist
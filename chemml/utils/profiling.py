@@ -0,0 +1,283 @@
+"""
+A lightweight and opt-in instrumentation of the chemml pipelines. The featurizers, the models and the search methods
+record the time spent in their entry points and in their map/reduce phases, and count the processed samples, only
+when the profiling is enabled. The disabled timers and counters cost a single flag check.
+
+    >>> from chemml.utils import profiling
+    >>> with profiling.profile('trace.json'):            # chrome://tracing or https://ui.perfetto.dev
+    ...     features = CoulombMatrix().represent(molecules)
+    >>> profiling.summary()
+
+The profiling can also be enabled for a whole run with the CHEMML_PROFILE environment variable, set to the path of the
+output file (a '.json' file is written in the Chrome trace format, and any other file as json lines).
+"""
+from __future__ import print_function
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+class _State(object):
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+
+_state = _State()
+
+
+class _NullTimer(object):
+    """
+    the shared timer of the disabled profiling: it does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer(object):
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _state.events.append({'name': self.name,
+                              'cat': self.category,
+                              'start': self.start - _state.origin,
+                              'duration': end - self.start,
+                              'pid': os.getpid(),
+                              'tid': threading.get_ident(),
+                              'args': self.args})
+        return False
+
+
+def enable():
+    """
+    enable the profiling. The recorded events are kept until reset is called.
+    """
+    _state.enabled = True
+
+
+def disable():
+    """
+    disable the profiling.
+    """
+    _state.enabled = False
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def reset():
+    """
+    remove all the recorded events and counters.
+    """
+    with _state.lock:
+        _state.events = []
+        _state.counters = {}
+        _state.origin = time.perf_counter()
+
+
+def timer(name, category='chemml', **args):
+    """
+    a context manager that records the wall time of its block, if the profiling is enabled.
+
+    Parameters
+    ----------
+    name: str
+        The name of the event, e.g. 'CoulombMatrix.map'.
+
+    category: str, optional (default='chemml')
+        The category of the event in the Chrome trace.
+
+    args:
+        The extra (json serializable) information of the event, e.g. the number of molecules.
+
+    Examples
+    --------
+    >>> with timer('parse', n_files=10):
+    ...     parse(files)
+    """
+    if not _state.enabled:
+        return _NULL_TIMER
+    return _Timer(name, category, args)
+
+
+def count(name, value=1):
+    """
+    add a value to a counter, if the profiling is enabled.
+
+    Parameters
+    ----------
+    name: str
+        The name of the counter, e.g. 'CoulombMatrix.molecules'.
+
+    value: int or float, optional (default=1)
+    """
+    if not _state.enabled:
+        return
+    with _state.lock:
+        _state.counters[name] = _state.counters.get(name, 0) + value
+        _state.events.append({'name': name, 'cat': 'counter', 'start': time.perf_counter() - _state.origin,
+                              'duration': None, 'pid': os.getpid(), 'tid': threading.get_ident(),
+                              'args': {'value': _state.counters[name]}})
+
+
+def profiled(name=None, category='chemml'):
+    """
+    a decorator that records the wall time of each call of a function or method, if the profiling is enabled.
+
+    Parameters
+    ----------
+    name: str, optional (default=None)
+        The name of the events. The qualified name of the function (e.g. 'CoulombMatrix.represent') by default.
+
+    category: str, optional (default='chemml')
+        The category of the events in the Chrome trace.
+    """
+    def decorator(func):
+        event = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with _Timer(event, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counters():
+    """
+    returns a copy of the counters.
+    """
+    with _state.lock:
+        return dict(_state.counters)
+
+
+def summary():
+    """
+    the total, mean and maximum wall time (seconds) and the number of calls of each recorded event.
+
+    Returns
+    -------
+    pandas dataframe
+        One row per event name, sorted by the total time.
+    """
+    timed = [e for e in _state.events if e['duration'] is not None]
+    if len(timed) == 0:
+        return pd.DataFrame(columns=['calls', 'total', 'mean', 'max'])
+    df = pd.DataFrame(timed)
+    stats = df.groupby('name')['duration'].agg(['count', 'sum', 'mean', 'max'])
+    stats.columns = ['calls', 'total', 'mean', 'max']
+    return stats.sort_values('total', ascending=False)
+
+
+def export_chrome_trace(filename):
+    """
+    write the recorded events in the Chrome trace event format, which can be opened with chrome://tracing or
+    https://ui.perfetto.dev.
+
+    Parameters
+    ----------
+    filename: str
+        The path to the json file.
+    """
+    trace = []
+    for e in list(_state.events):
+        item = {'name': e['name'], 'cat': e['cat'], 'ts': e['start'] * 1e6, 'pid': e['pid'], 'tid': e['tid'],
+                'args': e['args']}
+        if e['duration'] is None:
+            item['ph'] = 'C'
+        else:
+            item['ph'] = 'X'
+            item['dur'] = e['duration'] * 1e6
+        trace.append(item)
+    with open(filename, 'w') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+
+def export_log(filename):
+    """
+    write the recorded events as json lines (one event per line, the times in seconds), and the final values of the
+    counters as the last line.
+
+    Parameters
+    ----------
+    filename: str
+        The path to the log file.
+    """
+    with open(filename, 'w') as f:
+        for e in list(_state.events):
+            f.write(json.dumps(e) + '\n')
+        f.write(json.dumps({'counters': counters()}) + '\n')
+
+
+def export(filename):
+    """
+    write the recorded events as a Chrome trace if the filename ends with '.json', and as json lines otherwise.
+    """
+    if filename.endswith('.json'):
+        export_chrome_trace(filename)
+    else:
+        export_log(filename)
+
+
+class profile(object):
+    """
+    a context manager that enables the profiling in its block, and writes the recorded events to a file at the end.
+
+    Parameters
+    ----------
+    output: str, optional (default=None)
+        The path to the output file: a Chrome trace if it ends with '.json', and json lines otherwise.
+        Nothing is written if None.
+
+    reset: bool, optional (default=True)
+        If True, the events recorded before the block are removed.
+    """
+
+    def __init__(self, output=None, reset=True):
+        self.output = output
+        self.reset = reset
+
+    def __enter__(self):
+        self._was_enabled = _state.enabled
+        if self.reset:
+            reset()
+        enable()
+        return self
+
+    def __exit__(self, *exc):
+        if not self._was_enabled:
+            disable()
+        if self.output is not None:
+            export(self.output)
+        return False
+
+
+if os.environ.get('CHEMML_PROFILE'):
+    enable()
+    atexit.register(export, os.environ['CHEMML_PROFILE'])
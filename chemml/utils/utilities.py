@@ -2,6 +2,8 @@ from builtins import range
 import datetime
 import numpy as np
 import time
+import struct
+import zipfile
 # Todo: polish docstrings
 
 
@@ -281,4 +283,41 @@ def mol_shapes_to_dims(mol_tensors=None, mol_shapes=None):
     assert len(set(max_atoms_vals))==1, 'max_atoms does not match within tensors (found: {})'.format(max_atoms_vals)
     assert len(set(max_degree_vals))==1, 'max_degree does not match within tensors (found: {})'.format(max_degree_vals)
 
-    return max_atoms1, max_degree1, num_atom_features, num_bond_features, num_molecules1
\ No newline at end of file
+    return max_atoms1, max_degree1, num_atom_features, num_bond_features, num_molecules1
+
+
+def memmap_npz(filename, name):
+    """
+    memory-maps an array that is stored (without compression) in a numpy archive (e.g. created by numpy.savez).
+
+    Parameters
+    ----------
+    filename: str
+        The path to the archive file.
+
+    name: str
+        The name of the array in the archive.
+
+    Returns
+    -------
+    numpy memmap (read only)
+    """
+    with zipfile.ZipFile(filename) as archive:
+        info = archive.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        msg = "The array '%s' is compressed and can not be memory-mapped." % name
+        raise ValueError(msg)
+    with open(filename, 'rb') as f:
+        # skip the local file header of the zip member
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack('<HH', f.read(4))
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if int(np.prod(shape)) == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran_order else 'C')
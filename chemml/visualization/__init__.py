@@ -4,6 +4,9 @@ The cheml.visualization module includes (please click on links adjacent to funct
     - hist: :func:`~cheml.visualization.hist`
     - decorator: :func:`~cheml.visualization.decorator`
     - SavePlot: :func:`~cheml.visualization.SavePlot`
+    - hexbin_counts: :func:`~cheml.visualization.hexbin_counts`
+    - histogram2d_counts: :func:`~cheml.visualization.histogram2d_counts`
+    - rasterize_large_artists: :func:`~cheml.visualization.rasterize_large_artists`
 
 """
 
@@ -11,6 +14,9 @@ from .visualization import scatter2D
 from .visualization import hist
 from .visualization import SavePlot
 from .visualization import decorator
+from .visualization import hexbin_counts
+from .visualization import histogram2d_counts
+from .visualization import rasterize_large_artists
 
 
 __all__ = [
@@ -18,4 +24,7 @@ __all__ = [
     'hist',
     'decorator',
     'SavePlot',
+    'hexbin_counts',
+    'histogram2d_counts',
+    'rasterize_large_artists',
 ]
@@ -1,9 +1,193 @@
 from __future__ import print_function
 from builtins import range
 import os
+import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.colors import LogNorm
+
+# the file formats that store the artists as vector graphics
+VECTOR_FORMATS = ('pdf', 'eps', 'ps', 'svg', 'svgz', 'pgf')
+
+
+def _column(df, key, name):
+    """
+    returns the values of a column of the dataframe by its header (str) or position (int).
+    """
+    if isinstance(key, str):
+        return df[key].values
+    elif isinstance(key, int):
+        return df.iloc[:, key].values
+    else:
+        msg = '%s must be string for the header or integer for the postion of data in the df%s' % (name, name)
+        raise TypeError(msg)
+
+
+def _finite_range(chunks):
+    """
+    returns the min and max of the finite values of the chunks of an array (0 and 1 if there is no finite value).
+    """
+    low, high = np.inf, -np.inf
+    for chunk in chunks:
+        chunk = chunk[np.isfinite(chunk)]
+        if len(chunk) > 0:
+            low, high = min(low, chunk.min()), max(high, chunk.max())
+    if low > high:
+        return 0.0, 1.0
+    return low, high
+
+
+def _chunks(X, chunksize):
+    for start in range(0, len(X), chunksize):
+        yield np.asarray(X[start:start + chunksize], dtype=float)
+
+
+def hexbin_counts(X, Y, gridsize=100, extent=None, chunksize=1000000):
+    """
+    count the points in the hexagonal cells of the matplotlib.pyplot.hexbin grid, in chunks of points.
+
+    Parameters
+    ----------
+    X, Y: array-like
+        the coordinates of the points. The points with non-finite coordinates are ignored.
+
+    gridsize: int or tuple, optional (default=100)
+        the number of hexagons in the x direction, or the number of hexagons in the x and y directions.
+
+    extent: tuple, optional (default=None)
+        (xmin, xmax, ymin, ymax) of the grid. The range of the finite values by default.
+
+    chunksize: int, optional (default=1000000)
+        the number of points in each chunk.
+
+    Returns
+    -------
+    numpy array
+        the x coordinates of the centers of the non-empty cells.
+    numpy array
+        the y coordinates of the centers of the non-empty cells.
+    numpy array
+        the number of points in the non-empty cells.
+    tuple
+        the extent of the grid, to be passed to matplotlib.pyplot.hexbin with the same gridsize.
+    """
+    if isinstance(gridsize, (tuple, list)):
+        nx, ny = gridsize
+    else:
+        nx = gridsize
+        ny = int(nx / np.sqrt(3))
+    if extent is None:
+        xmin, xmax = _finite_range(_chunks(X, chunksize))
+        ymin, ymax = _finite_range(_chunks(Y, chunksize))
+        xmin, xmax = matplotlib.transforms.nonsingular(xmin, xmax, expander=0.1)
+        ymin, ymax = matplotlib.transforms.nonsingular(ymin, ymax, expander=0.1)
+        extent = (xmin, xmax, ymin, ymax)
+    xmin, xmax, ymin, ymax = extent
+    # the same padding and lattices as matplotlib.axes.Axes.hexbin
+    padding = 1.e-9 * (xmax - xmin)
+    xmin, xmax = xmin - padding, xmax + padding
+    sx = (xmax - xmin) / nx
+    sy = (ymax - ymin) / ny
+    nx1, ny1 = nx + 1, ny + 1
+    counts1 = np.zeros(1 + nx1 * ny1, dtype=np.int64)
+    counts2 = np.zeros(1 + nx * ny, dtype=np.int64)
+    for x, y in zip(_chunks(X, chunksize), _chunks(Y, chunksize)):
+        finite = np.isfinite(x) & np.isfinite(y)
+        ix = (x[finite] - xmin) / sx
+        iy = (y[finite] - ymin) / sy
+        ix1 = np.round(ix).astype(int)
+        iy1 = np.round(iy).astype(int)
+        ix2 = np.floor(ix).astype(int)
+        iy2 = np.floor(iy).astype(int)
+        # the flat indices plus one, so that the points out of the grid go to the position 0
+        i1 = np.where((0 <= ix1) & (ix1 < nx1) & (0 <= iy1) & (iy1 < ny1), ix1 * ny1 + iy1 + 1, 0)
+        i2 = np.where((0 <= ix2) & (ix2 < nx) & (0 <= iy2) & (iy2 < ny), ix2 * ny + iy2 + 1, 0)
+        first = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2 < (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        counts1 += np.bincount(i1[first], minlength=len(counts1))
+        counts2 += np.bincount(i2[~first], minlength=len(counts2))
+    cells1 = np.flatnonzero(counts1[1:])
+    cells2 = np.flatnonzero(counts2[1:])
+    cx = np.concatenate([xmin + (cells1 // ny1) * sx, xmin + (cells2 // ny + 0.5) * sx])
+    cy = np.concatenate([ymin + (cells1 % ny1) * sy, ymin + (cells2 % ny + 0.5) * sy])
+    counts = np.concatenate([counts1[1:][cells1], counts2[1:][cells2]])
+    return cx, cy, counts, extent
+
+
+def histogram2d_counts(X, Y, bins=100, extent=None, chunksize=1000000):
+    """
+    the 2D histogram of the points, computed in chunks of points.
+
+    Parameters
+    ----------
+    X, Y: array-like
+        the coordinates of the points. The points with non-finite coordinates are ignored.
+
+    bins: int or tuple, optional (default=100)
+        the number of bins in both directions, or in the x and y directions.
+
+    extent: tuple, optional (default=None)
+        (xmin, xmax, ymin, ymax) of the histogram. The range of the finite values by default.
+
+    chunksize: int, optional (default=1000000)
+        the number of points in each chunk.
+
+    Returns
+    -------
+    numpy array
+        the counts, shape: (n_xbins, n_ybins)
+    numpy array
+        the bin edges along the x axis.
+    numpy array
+        the bin edges along the y axis.
+    """
+    nx, ny = bins if isinstance(bins, (tuple, list)) else (bins, bins)
+    if extent is None:
+        extent = _finite_range(_chunks(X, chunksize)) + _finite_range(_chunks(Y, chunksize))
+    xedges = np.linspace(*matplotlib.transforms.nonsingular(extent[0], extent[1], expander=0.1), num=nx + 1)
+    yedges = np.linspace(*matplotlib.transforms.nonsingular(extent[2], extent[3], expander=0.1), num=ny + 1)
+    counts = np.zeros((nx, ny))
+    for x, y in zip(_chunks(X, chunksize), _chunks(Y, chunksize)):
+        finite = np.isfinite(x) & np.isfinite(y)
+        counts += np.histogram2d(x[finite], y[finite], bins=(xedges, yedges))[0]
+    return counts, xedges, yedges
+
+
+def rasterize_large_artists(figure, threshold=100000):
+    """
+    rasterize the artists of a figure with more than threshold points (lines, markers, cells or patches), so that the
+    vector file formats (e.g. pdf, eps and svg) embed them as an image instead of one vector path per point.
+    The axes, labels and texts remain vector graphics.
+
+    Parameters
+    ----------
+    figure: matplotlib.figure.Figure object or matplotlib.axes.Axes object
+
+    threshold: int, optional (default=100000)
+        the number of points of the largest artists that are kept as vector graphics.
+
+    Returns
+    -------
+    list
+        the rasterized artists.
+    """
+    if isinstance(figure, Axes):
+        figure = figure.figure
+    rasterized = []
+    for ax in figure.axes:
+        for line in ax.lines:
+            if len(line.get_xdata()) > threshold:
+                rasterized.append(line)
+        for collection in ax.collections:
+            if max(len(collection.get_offsets()), len(collection.get_paths())) > threshold:
+                rasterized.append(collection)
+        if len(ax.patches) > threshold:
+            rasterized.extend(ax.patches)
+    for artist in rasterized:
+        artist.set_rasterized(True)
+    return rasterized
 
 
 
@@ -71,10 +255,10 @@ class decorator(object):
         matplotlib.figure.Figure object
 
         """
-        if str(type(figure)) == "<class 'matplotlib.axes._subplots.AxesSubplot'>":
+        if isinstance(figure, Axes):
             ax = figure
             figure = figure.figure
-        elif str(type(figure)) == "<class 'matplotlib.figure.Figure'>":
+        elif isinstance(figure, Figure):
             ax = figure.axes[0]
         else:
             msg = 'object must be a matplotlib.AxesSubplot or matplotlib.Figure object'
@@ -141,6 +325,31 @@ class scatter2D(object):
         set line width
         check this link: https://matplotlib.org/api/_as_gen/matplotlib.lines.Line2D.html#matplotlib.lines.Line2D.set_linewidth
 
+    mode: string, optional (default='auto')
+        available options:
+            - 'points': plot all the points
+            - 'hexbin': plot the number of points in hexagonal cells (density plot)
+            - 'hist2d': plot the number of points in rectangular bins (density plot)
+            - 'auto': 'points' up to threshold points, and 'hexbin' for the larger data
+        The density plots are aggregated with numpy in chunks of points, so that only the non-empty cells are handed
+        to matplotlib.
+
+    gridsize: int or tuple, optional (default=100)
+        the number of cells in the x direction (or in the x and y directions) of the density plots.
+
+    log: boolean, optional (default=True)
+        if True, the colors of the density plots are on a logarithmic scale.
+
+    cmap: string, optional (default='viridis')
+        the colormap of the density plots.
+
+    threshold: int, optional (default=100000)
+        the number of points above which the 'auto' mode switches to a density plot, and the plotted points are
+        rasterized.
+
+    chunksize: int, optional (default=1000000)
+        the number of points that are binned at once in the density plots.
+
     Examples
     --------
     >>> from chemml.visualization import scatter2D
@@ -151,11 +360,21 @@ class scatter2D(object):
     >>> fig.show()
     """
 
-    def __init__(self, color='b', marker='.', linestyle='', linewidth=2):
+    def __init__(self, color='b', marker='.', linestyle='', linewidth=2, mode='auto', gridsize=100, log=True,
+                 cmap='viridis', threshold=100000, chunksize=1000000):
         self.color = color
         self.marker = marker
         self.linestyle = linestyle
         self.linewidth = linewidth
+        if mode not in ('auto', 'points', 'hexbin', 'hist2d'):
+            msg = "mode must be one of 'auto', 'points', 'hexbin' or 'hist2d'"
+            raise ValueError(msg)
+        self.mode = mode
+        self.gridsize = gridsize
+        self.log = log
+        self.cmap = cmap
+        self.threshold = threshold
+        self.chunksize = chunksize
 
     def plot(self,dfx,dfy,x,y):
         """
@@ -178,26 +397,31 @@ class scatter2D(object):
 
         """
         # check data
-        if isinstance(x,str):
-            X = dfx[x].values
-        elif isinstance(x,int):
-            X = dfx.iloc[:,x].values
-        else:
-            msg = 'x must be string for the header or integer for the postion of data in the dfx'
-            raise TypeError(msg)
-        
-        if isinstance(y, str):
-            Y = dfy[y].values
-        elif isinstance(y, int):
-            Y = dfy.iloc[:, y].values
-        else:
-            msg = 'y must be string for the header or integer for the postion of data in the dfy'
-            raise TypeError(msg)
+        X = _column(dfx, x, 'x')
+        Y = _column(dfy, y, 'y')
+        mode = self.mode
+        if mode == 'auto':
+            mode = 'points' if len(X) <= self.threshold else 'hexbin'
 
         # instantiate figure
         fig = plt.figure()
         ax = fig.add_subplot(111)
-        trash = ax.plot(X,Y,color=self.color, marker=self.marker, linestyle=self.linestyle, linewidth= self.linewidth)
+        if mode == 'points':
+            trash = ax.plot(X,Y,color=self.color, marker=self.marker, linestyle=self.linestyle, linewidth= self.linewidth,
+                            rasterized=len(X) > self.threshold)
+        elif mode == 'hexbin':
+            gridsize = self.gridsize if isinstance(self.gridsize, (tuple, list)) else (
+                self.gridsize, int(self.gridsize / np.sqrt(3)))
+            cx, cy, counts, extent = hexbin_counts(X, Y, gridsize, chunksize=self.chunksize)
+            # one point per non-empty cell, weighted by its number of points
+            trash = ax.hexbin(cx, cy, C=counts, reduce_C_function=np.sum, gridsize=gridsize, extent=extent,
+                              bins='log' if self.log else None, cmap=self.cmap,
+                              rasterized=len(counts) > self.threshold)
+        else:
+            counts, xedges, yedges = histogram2d_counts(X, Y, self.gridsize, chunksize=self.chunksize)
+            counts[counts == 0] = np.nan
+            trash = ax.pcolormesh(xedges, yedges, counts.T, cmap=self.cmap, norm=LogNorm() if self.log else None,
+                                  rasterized=True)
         return fig
 
 class hist(object):
@@ -220,6 +444,14 @@ class hist(object):
         provide keys in the form of a string.
         for example kwargs = {'key':value}
 
+    threshold: int, optional (default=100000)
+        for the data larger than threshold, the histogram is counted with numpy in chunks and only the counts are
+        handed to matplotlib. The 'auto' (or any other string) bins are estimated from an evenly spaced sample of
+        threshold values.
+
+    chunksize: int, optional (default=1000000)
+        the number of values that are counted at once.
+
     Examples
     --------
     >>> from chemml.visualization import hist
@@ -230,10 +462,12 @@ class hist(object):
     >>> fig.show()
 
     """
-    def __init__(self,bins=None, color=None, kwargs={}):
+    def __init__(self,bins=None, color=None, kwargs={}, threshold=100000, chunksize=1000000):
         self.bins = bins
         self.color = color
         self.kwargs = kwargs
+        self.threshold = threshold
+        self.chunksize = chunksize
 
     def plot(self, dfx, x):
         """
@@ -252,18 +486,32 @@ class hist(object):
 
         """
         # check data
-        if isinstance(x, str):
-            X = dfx[x].values
-        elif isinstance(x, int):
-            X = dfx.iloc[:, x].values
-        else:
-            msg = 'x must be string for the header or integer for the postion of data in the dfx'
-            raise TypeError(msg)
+        X = _column(dfx, x, 'x')
 
         # instantiate figure
         fig = plt.figure()
         ax = fig.add_subplot(111)
-        tash = ax.hist(X, bins= self.bins, color=self.color, **self.kwargs)
+        if len(X) <= self.threshold or 'weights' in self.kwargs:
+            tash = ax.hist(X, bins= self.bins, color=self.color, **self.kwargs)
+            return fig
+
+        # count in chunks, and plot the counts as the weights of the bins
+        kwargs = dict(self.kwargs)
+        hist_range = kwargs.pop('range', None)
+        if hist_range is None:
+            hist_range = _finite_range(_chunks(X, self.chunksize))
+        bins = matplotlib.rcParams['hist.bins'] if self.bins is None else self.bins
+        if isinstance(bins, str):
+            sample = np.asarray(X[::max(1, len(X) // self.threshold)], dtype=float)
+            edges = np.histogram_bin_edges(sample[np.isfinite(sample)], bins, hist_range)
+        elif np.ndim(bins) == 0:
+            edges = np.linspace(hist_range[0], hist_range[1], int(bins) + 1)
+        else:
+            edges = np.asarray(bins, dtype=float)
+        counts = np.zeros(len(edges) - 1)
+        for chunk in _chunks(X, self.chunksize):
+            counts += np.histogram(chunk[np.isfinite(chunk)], bins=edges)[0]
+        tash = ax.hist(edges[:-1], bins=edges, weights=counts, color=self.color, **kwargs)
         return fig
 
 class SavePlot(object):
@@ -290,6 +538,11 @@ class SavePlot(object):
         for example kwargs = {'key':value}
         https://matplotlib.org/api/_as_gen/matplotlib.figure.Figure.html#matplotlib.figure.Figure.savefig
 
+    rasterize_threshold: int, optional (default=100000)
+        for the vector formats (e.g. 'pdf', 'eps' and 'svg'), the artists with more than rasterize_threshold points
+        are rasterized (check the rasterize_large_artists function), while the axes and texts remain vector graphics.
+        If None, all the artists are stored as vector graphics.
+
     Example:
     --------
     >>> from chemml.datasets import load_cep_homo
@@ -301,11 +554,12 @@ class SavePlot(object):
     The Plot has been saved at:  project/plots/abc1.png
 
     """
-    def __init__(self,filename, output_directory = None, format ='png',kwargs={}):
+    def __init__(self,filename, output_directory = None, format ='png',kwargs={}, rasterize_threshold=100000):
         self.filename = filename
         self.output_directory = output_directory
         self.format = format
         self.kwargs=kwargs
+        self.rasterize_threshold = rasterize_threshold
 
     def save(self, obj, main_directory='.'):
         """
@@ -320,13 +574,15 @@ class SavePlot(object):
             specify the parent directory where the folder needs to be saved.
             
         """
-        if str(type(obj)) == "<class 'matplotlib.axes._subplots.AxesSubplot'>":
+        if isinstance(obj, Axes):
             obj = obj.figure
-        elif str(type(obj)) == "<class 'matplotlib.figure.Figure'>":
+        elif isinstance(obj, Figure):
             pass
         else:
             msg = 'object must be a matplotlib.AxesSubplot or matplotlib.Figure object'
             raise TypeError(msg)
+        if self.rasterize_threshold is not None and self.format.lower() in VECTOR_FORMATS:
+            rasterize_large_artists(obj, self.rasterize_threshold)
 
         if self.output_directory:
             self.output_directory = os.path.join(main_directory, self.output_directory)
@@ -28,7 +28,7 @@ if __name__ == "__main__":
             'Materials Science', 'Drug Discovery'
         ],
         license='BSD-3C',
-        packages=setuptools.find_packages(),
+        packages=setuptools.find_packages(exclude=['benchmarks', 'benchmarks.*']),
         include_package_data=True,
 
         install_requires=[
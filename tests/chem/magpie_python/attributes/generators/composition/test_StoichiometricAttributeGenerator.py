@@ -22,4 +22,5 @@ class testStoichiometricAttributeGenerator(unittest.TestCase):
         self.assertEqual(3, len(features.columns))
         self.assertEqual(3, features.values[0].size)
         np_tst.assert_array_almost_equal([2, sqrt(0.5), 0.25 ** (1.0 / 3)],
-                                         features.values[0])
\ No newline at end of file
+                                         features.values[0])
+        self.assertEqual("int64", str(features["NComp"].dtype))
\ No newline at end of file
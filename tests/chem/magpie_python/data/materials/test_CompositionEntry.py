@@ -248,4 +248,32 @@ class testCompositionEntry(unittest.TestCase):
                 if entries[e1].__cmp__(entries[e2]) == 0:
                     self.assertEqual(entries[e1].__hash__(), entries[
                         e2].__hash__())
-                    self.assertTrue(entries[e1].__eq__(entries[e2]))
\ No newline at end of file
+                    self.assertTrue(entries[e1].__eq__(entries[e2]))
+
+    def test_from_formulas(self):
+        formulas = ["NaCl", "Fe2O3", "Na2CO3-10H2O", "Ca(NO3)2", "NaCl"]
+        entries = CompositionEntry.from_formulas(formulas)
+        self.assertEqual(len(formulas), len(entries))
+        for formula, entry in zip(formulas, entries):
+            expected = CompositionEntry(composition=formula)
+            self.assertEqual(expected, entry)
+            self.assertEqual(expected.__str__(), entry.__str__())
+
+        # The entries of a repeated formula are independent copies.
+        self.assertIsNot(entries[0], entries[4])
+        entries[0].fractions[0] = 0.0
+        self.assertAlmostEqual(0.5, entries[4].fractions[0], delta=1e-6)
+
+        # Any iterable of formulas.
+        generated = CompositionEntry.from_formulas(f for f in formulas)
+        self.assertEqual(len(formulas), len(generated))
+        self.assertEqual(entries[1:], generated[1:])
+
+        # Parallel parsing.
+        parallel = CompositionEntry.from_formulas(formulas, n_jobs=2,
+                                                  batch_size=2)
+        for entry, other in zip(entries[1:], parallel[1:]):
+            self.assertEqual(entry, other)
+
+        self.assertRaises(ValueError, CompositionEntry.from_formulas,
+                          ["NaCl", "Xx2"])
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+import numpy.testing as np_tst
+
+from chemml.chem.magpie_python.data.materials.CompositionEntry import CompositionEntry
+from chemml.chem.magpie_python.data.materials.util.CompositionMatrix import CompositionMatrix
+from chemml.chem.magpie_python.data.materials.util.LookUpData import LookUpData
+
+class testCompositionMatrix(unittest.TestCase):
+    def setUp(self):
+        self.entries = [CompositionEntry("NaCl"), CompositionEntry("Fe2O3"),
+                        CompositionEntry("Fe"), CompositionEntry("HeNe")]
+        self.matrix = CompositionMatrix(self.entries)
+
+    def tearDown(self):
+        self.entries = None
+        self.matrix = None
+
+    def test_fractions(self):
+        self.assertEqual((4, len(LookUpData.element_names)),
+                         self.matrix.fractions.shape)
+        o = LookUpData.element_ids["O"]
+        self.assertAlmostEqual(0.6, self.matrix.fractions[1, o], delta=1e-6)
+        np_tst.assert_array_equal([2, 2, 1, 2], self.matrix.n_components())
+        np_tst.assert_array_almost_equal([np.sqrt(0.5), np.sqrt(0.52), 1.0],
+                                         self.matrix.norm(2)[:3])
+
+    def test_statistics(self):
+        values = LookUpData.load_property("Number")
+        for i, entry in enumerate(self.entries):
+            prop = [values[e] for e in entry.get_element_ids()]
+            fracs = entry.get_element_fractions()
+            mean = np.average(prop, weights=fracs)
+            self.assertAlmostEqual(mean, self.matrix.mean(values)[i],
+                                   delta=1e-6)
+            self.assertAlmostEqual(
+                np.average(np.abs(np.array(prop) - mean), weights=fracs),
+                self.matrix.deviation(values)[i], delta=1e-6)
+            self.assertEqual(max(prop), self.matrix.maximum(values)[i])
+            self.assertEqual(min(prop), self.matrix.minimum(values)[i])
+
+        # Fe2O3: O is the most common element; NaCl: the mean of both.
+        most = self.matrix.most(values)
+        self.assertAlmostEqual(8.0, most[1], delta=1e-6)
+        self.assertAlmostEqual(14.0, most[0], delta=1e-6)
+
+        means = self.matrix.means(np.column_stack([values, 2 * values]))
+        np_tst.assert_array_almost_equal(self.matrix.mean(values),
+                                         means[:, 0])
+        np_tst.assert_array_almost_equal(2 * means[:, 0], means[:, 1])
+
+    def test_missing(self):
+        values = LookUpData.load_property("Electronegativity")
+        rows, elements = self.matrix.missing(values)
+        np_tst.assert_array_equal([False, False, False, True], rows)
+        self.assertEqual(["He", "Ne"], [LookUpData.element_names[e] for e in
+                                        elements])
+        self.assertTrue(np.isnan(self.matrix.mean(values)[3]))
+        self.assertFalse(np.isnan(self.matrix.mean(values)[:3]).any())
+
+    def test_empty(self):
+        matrix = CompositionMatrix([])
+        self.assertEqual(0, len(matrix.mean(LookUpData.load_property(
+            "Number"))))
+        self.assertEqual(0, len(matrix.maximum(LookUpData.load_property(
+            "Number"))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import numpy.testing as np_tst
+
+from chemml.chem.magpie_python.data.materials.util.LookUpData import LookUpData
+from chemml.chem.magpie_python.data.materials.util.PropertyStore import PropertyStore
+
+class testPropertyStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_elemental_property(self):
+        en = LookUpData.load_property("Electronegativity")
+        self.assertEqual(len(LookUpData.element_names), len(en))
+        self.assertAlmostEqual(2.2, en[0], delta=1e-6)
+        self.assertTrue(np.isnan(en[1]))
+        self.assertAlmostEqual(0.98, en[2], delta=1e-6)
+
+    def test_pair_property(self):
+        values = LookUpData.load_pair_property("MiedemaLiquidDeltaHf")
+        li = LookUpData.element_ids["Li"]
+        h = LookUpData.element_ids["H"]
+        self.assertAlmostEqual(-25.0, values[li][h], delta=1e-6)
+        # The lower triangle of the table, as a ragged array.
+        self.assertEqual(len(LookUpData.element_names), len(values))
+        self.assertEqual(0, len(values[h]))
+        self.assertEqual(li, len(values[li]))
+        table = PropertyStore.get().pair_property("MiedemaLiquidDeltaHf")
+        self.assertAlmostEqual(-25.0, table[h, li], delta=1e-6)
+        self.assertEqual(0, table[h, h])
+
+    def test_special_property(self):
+        ox = LookUpData.load_property("OxidationStates")
+        self.assertEqual(len(LookUpData.element_names), len(ox))
+        np_tst.assert_array_equal([2, 3], ox[LookUpData.element_ids["Fe"]])
+        ie = LookUpData.load_special_property("IonizationEnergies")
+        self.assertEqual(104, len(ie))
+
+    def test_missing_property(self):
+        self.assertRaises(IOError, LookUpData.load_property, "NotAProperty")
+        self.assertRaises(IOError, LookUpData.load_pair_property,
+                          "NotAProperty")
+
+    def test_shared_read_only(self):
+        store = PropertyStore.get()
+        self.assertIs(store, PropertyStore.get())
+        a = store.property("CovalentRadius")
+        self.assertTrue(np.shares_memory(a, store.property("CovalentRadius")))
+        with self.assertRaises(ValueError):
+            a[0] = 0
+        with self.assertRaises(ValueError):
+            store.pair_property("B2Volume")[1, 0] = 0
+
+        # The public lookups return independent writable copies.
+        b = LookUpData.load_property("CovalentRadius")
+        self.assertFalse(np.shares_memory(a, b))
+        b[0] = 0
+        self.assertNotEqual(0, a[0])
+        pair = LookUpData.load_pair_property("B2Volume")
+        pair[1][0] = 0
+        ox = LookUpData.load_special_property("OxidationStates")
+        ox[LookUpData.element_ids["Fe"]][0] = 0
+        np_tst.assert_array_equal([2, 3], store.special_property(
+            "OxidationStates")[LookUpData.element_ids["Fe"]])
+
+    def test_use_cache(self):
+        old_env = os.environ.get("CHEMML_CACHE_DIR")
+        old_instance = PropertyStore._instance
+        os.environ["CHEMML_CACHE_DIR"] = self.tmp_dir
+        try:
+            # Nothing is written by default.
+            PropertyStore._instance = None
+            PropertyStore.get()
+            self.assertEqual([], os.listdir(self.tmp_dir))
+
+            PropertyStore.use_cache = True
+            PropertyStore._instance = None
+            store = PropertyStore.get()
+            files = os.listdir(self.tmp_dir)
+            self.assertEqual(1, len(files))
+            self.assertTrue(files[0].startswith("magpie_lookup-"))
+            self.assertIsInstance(store.arrays['elemental'], np.memmap)
+            np_tst.assert_array_equal(LookUpData.load_property("Number"),
+                                      store.property("Number"))
+        finally:
+            PropertyStore.use_cache = False
+            PropertyStore._instance = old_instance
+            if old_env is None:
+                del os.environ["CHEMML_CACHE_DIR"]
+            else:
+                os.environ["CHEMML_CACHE_DIR"] = old_env
+
+    def test_compile(self):
+        filename = os.path.join(self.tmp_dir, "lookup.npz")
+        PropertyStore.compile(filename)
+        store = PropertyStore.load(filename)
+        self.assertIsInstance(store.arrays['elemental'], np.memmap)
+        for prop in LookUpData.all_properties:
+            np_tst.assert_array_equal(PropertyStore.get().property(prop),
+                                      store.property(prop))
+        np_tst.assert_array_equal(
+            PropertyStore.get().pair_property("B2BondLength"),
+            store.pair_property("B2BondLength"))
+        for a, b in zip(PropertyStore.get().special_property(
+                "OxidationStates"), store.special_property("OxidationStates")):
+            np_tst.assert_array_equal(a, b)
+
+if __name__ == '__main__':
+    unittest.main()
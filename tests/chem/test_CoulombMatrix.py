@@ -109,3 +109,19 @@ def test_SC_mollist(mols2):
     features = cm.represent(mols2)
 
     assert features.shape == (4, cm.max_n_atoms_ * (cm.max_n_atoms_ + 1) / 2)
+
+
+def test_packed_geometries(mols):
+    from chemml.initialization import PackedGeometries
+    xyz = mols.xyz
+    packed = PackedGeometries(['h2o', 'h2o'], np.concatenate([xyz.atomic_numbers[:, 0]] * 2),
+                              np.concatenate([xyz.geometry] * 2), [0, 3, 6])
+    for cm_type in ['UM', 'E', 'SC']:
+        expected = CoulombMatrix(cm_type, n_jobs=1).represent(mols).values
+        cm = CoulombMatrix(cm_type, n_jobs=1)
+        features = cm.represent(packed)
+        assert features.shape == (2, expected.shape[1])
+        assert np.allclose(features.values, expected)
+    # XYZ objects
+    assert np.allclose(CoulombMatrix('UM', n_jobs=1).represent(xyz).values,
+                       CoulombMatrix('UM', n_jobs=1).represent(mols).values)
@@ -105,3 +105,90 @@ def test_run(setup_teardown):
         drg = Dragon(version=6, blocks=list(range(1, 30)))
         drg.script_wizard(script='new', output_directory=setup_teardown)
         drg.run()
+
+
+FAKE_DRAGON = """#!%s
+# a stand-in for the dragon7shell command: writes one descriptor row per molecule of the script
+import sys
+from lxml import etree
+script = etree.parse(sys.argv[2])
+molfile = script.find('MOLFILES/molFile').attrib['value']
+output = script.find('OUTPUT/SaveFilePath').attrib['value']
+smiles = [line.split()[0] for line in open(molfile) if line.strip()]
+with open(output, 'w') as f:
+    f.write('No.\\tNAME\\tMW\\tnAT\\n')
+    for i, smi in enumerate(smiles):
+        f.write('%%i\\t%%s\\t%%.3f\\t%%s\\n' %% (i + 1, smi, len(smi) * 1.5, 'na' if i %% 3 == 0 else str(len(smi))))
+"""
+
+
+def test_run_shards(setup_teardown, monkeypatch):
+    import sys
+    import numpy as np
+    bin_dir = os.path.join(setup_teardown, 'bin')
+    os.makedirs(bin_dir)
+    with open(os.path.join(bin_dir, 'dragon7shell'), 'w') as f:
+        f.write(FAKE_DRAGON % sys.executable)
+    os.chmod(os.path.join(bin_dir, 'dragon7shell'), 0o755)
+    monkeypatch.setenv('PATH', bin_dir + os.pathsep + os.environ['PATH'])
+
+    smiles = ['C' * (i + 1) for i in range(10)]
+    molfile = os.path.join(setup_teardown, 'molecules.smi')
+    with open(molfile, 'w') as f:
+        f.write('\n'.join(smiles) + '\n')
+    drg = Dragon(molFile=molfile)
+    drg.script_wizard(script='new', output_directory=os.path.join(setup_teardown, 'out', ''))
+    drg.run_shards(n_shards=3, n_jobs=2)
+    assert len(drg.data_path) == 3
+    df = drg.convert_to_csv(remove=False, chunksize=2)
+    assert list(df['NAME']) == smiles
+    assert list(df['No.']) == list(range(1, 11))
+    assert df['MW'].dtype == np.float64
+    assert drg.convert_to_csv(remove=False, dtype='float32')['MW'].dtype == np.float32
+    assert np.isnan(df['nAT'][0]) and df['nAT'][1] == 2
+
+    h5py = pytest.importorskip('h5py')
+    store = drg.convert_to_csv(remove=True, chunksize=3, store=os.path.join(setup_teardown, 'descriptors.h5'))
+    assert drg.data_path is None
+    with h5py.File(store, 'r') as h5:
+        assert h5['descriptors'].shape == (10, 2)
+        assert list(h5['descriptors'].attrs['columns']) == ['MW', 'nAT']
+        assert np.allclose(h5['descriptors'][:, 0], df['MW'].values)
+
+
+def test_shard_records(setup_teardown):
+    sdf = os.path.join(setup_teardown, 'molecules.sdf')
+    record = "mol%i\n  header\n\n  1  0  0  0  0  0  0  0  0  0999 V2000\nM  END\n$$$$\n"
+    with open(sdf, 'w') as f:
+        f.write(''.join(record % i for i in range(5)))
+    drg = Dragon(molFile=sdf)
+    shards = drg._shard_molFile(2, setup_teardown)
+    assert len(shards) == 2
+    contents = ''.join(open(shard).read() for shard in shards)
+    assert contents == ''.join(record % i for i in range(5))
+    assert open(shards[0]).read().count('$$$$') == 2
+
+    mol2 = os.path.join(setup_teardown, 'molecules.mol2')
+    record = "@<TRIPOS>MOLECULE\nmol%i\n 1 0 0 0 0\n\n@<TRIPOS>ATOM\n      1 C 0.0 0.0 0.0 C.3\n"
+    with open(mol2, 'w') as f:
+        f.write('# comment\n' + ''.join(record % i for i in range(4)))
+    drg = Dragon(molFile=mol2)
+    shards = drg._shard_molFile(3, setup_teardown)
+    assert [open(shard).read().count('@<TRIPOS>MOLECULE') for shard in shards] == [1, 1, 2]
+
+    # more shards than molecules: no empty shard is written
+    smi = os.path.join(setup_teardown, 'molecules.smi')
+    with open(smi, 'w') as f:
+        f.write('CCO\nc1ccccc1\n')
+    drg = Dragon(molFile=smi)
+    output = os.path.join(setup_teardown, 'small')
+    shards = drg._shard_molFile(4, output)
+    assert shards == [os.path.join(output, 'shard%i' % i, 'molecules.smi') for i in range(2)]
+    assert sorted(os.listdir(output)) == ['shard0', 'shard1']
+    assert [open(shard).read() for shard in shards] == ['CCO\n', 'c1ccccc1\n']
+    drg = Dragon(molFile={1: 'a.mol', 2: 'b.mol'})
+    assert drg._shard_molFile(4, output) == [{1: 'a.mol'}, {1: 'b.mol'}]
+
+    drg = Dragon(molFile=os.path.join(setup_teardown, 'molecules.hin'))
+    with pytest.raises(ValueError):
+        drg._shard_molFile(2, setup_teardown)
@@ -1,3 +1,7 @@
+import os
+import pytest
+import numpy as np
+
 from chemml.datasets import load_cep_homo
 from chemml.datasets import load_organic_density
 from chemml.datasets import load_xyz_polarizability
@@ -27,6 +31,20 @@ def test_load_xyz_polarizability():
     assert df.shape == (50, 1)
 
 
+def test_load_xyz_polarizability_packed(tmp_path):
+    molecules, df = load_xyz_polarizability()
+    packed, _ = load_xyz_polarizability(packed=True)
+    assert len(packed) == 50
+    assert '17_opt.xyz' in packed.files[16]
+    assert (packed[7][:, 0] == molecules[7].xyz.atomic_numbers[:, 0]).all()
+    archive = str(tmp_path / 'organic.npz')
+    created, _ = load_xyz_polarizability(packed=archive)
+    loaded, df = load_xyz_polarizability(packed=archive)
+    assert loaded.files == created.files == packed.files
+    assert (loaded.coordinates == packed.coordinates).all()
+    assert df.shape == (50, 1)
+
+
 def test_load_comp_energy():
     entries, df = load_comp_energy()
     assert len(entries) == 630
@@ -36,3 +54,56 @@ def test_load_comp_energy():
 def test_load_crystal_structures():
     entries = load_crystal_structures()
     assert len(entries) == 18
+
+
+def test_cache(tmp_path, monkeypatch):
+    from chemml.datasets import get_cache_dir, clear_cache
+    monkeypatch.setenv('CHEMML_CACHE_DIR', str(tmp_path))
+    assert get_cache_dir() == str(tmp_path)
+    smi, density, features = load_organic_density()
+    entries, df = load_comp_energy()
+    packed, _ = load_xyz_polarizability(packed=True)
+    cached = sorted(os.listdir(str(tmp_path)))
+    assert [f.split('-')[0] for f in cached] == ['comp_energy', 'organic_density', 'xyz_polarizability']
+    smi2, density2, features2 = load_organic_density()
+    assert features2.equals(features) and smi2.equals(smi)
+    entries2, _ = load_comp_energy()
+    assert [str(e) for e in entries2] == [str(e) for e in entries]
+    packed2, _ = load_xyz_polarizability(packed=True)
+    assert packed2.files == packed.files
+    assert (packed2.coordinates == packed.coordinates).all()
+    assert sorted(os.listdir(str(tmp_path))) == cached
+    # a corrupted cached file is rebuilt
+    path = [os.path.join(str(tmp_path), f) for f in cached if f.startswith('comp_energy')][0]
+    with open(path, 'wb') as f:
+        f.write(b'corrupted')
+    with pytest.warns(UserWarning):
+        entries3, _ = load_comp_energy()
+    assert [str(e) for e in entries3] == [str(e) for e in entries]
+    assert sorted(os.listdir(str(tmp_path))) == cached
+    assert len(clear_cache('comp_energy')) == 1
+    assert len(clear_cache()) == 2
+
+    # the cached files are invalidated by another version of chemml
+    from chemml.datasets import cache
+    h = cache.source_hash([__file__])
+    monkeypatch.setattr(cache, '__version__', 'other')
+    assert cache.source_hash([__file__]) != h
+
+
+def test_lazy(tmp_path, monkeypatch):
+    monkeypatch.setenv('CHEMML_CACHE_DIR', str(tmp_path))
+    smi, density, features = load_organic_density()
+    _, _, lazy_features = load_organic_density(lazy=True)
+    assert lazy_features.shape == (500, 200)
+    assert np.allclose(lazy_features.values, features.values.astype(float))
+    with pytest.raises(ValueError):
+        load_organic_density(cache=False, lazy=True)
+    entries, _ = load_comp_energy(cache=False)
+    lazy_entries, df = load_comp_energy(lazy=True)
+    assert len(lazy_entries) == 630
+    assert str(lazy_entries[-1]) == str(entries[-1])
+    assert [str(e) for e in lazy_entries[:3]] == [str(e) for e in entries[:3]]
+    molecules, df = load_xyz_polarizability(lazy=True)
+    assert len(molecules) == 50
+    assert '17_opt.xyz' in molecules[16].creator[1]
@@ -1,4 +1,8 @@
 import unittest
+import os
+import shutil
+import tempfile
+import pkg_resources
 from chemml.initialization import XYZreader
 from chemml.initialization import ConvertFile
 
@@ -14,6 +18,33 @@ class TestConvertFile(unittest.TestCase):
         # self.assertEqual(len(s) , 2)
         # self.assertEqual(s[1]['file'][-3:], 'cml')
 
+    def test_in_process(self):
+        data_path = pkg_resources.resource_filename('chemml', os.path.join('datasets', 'data', 'organic_xyz'))
+        tmp = tempfile.mkdtemp()
+        try:
+            for i in range(1, 6):
+                shutil.copy(os.path.join(data_path, '%i_opt.xyz' % i), tmp)
+            with open(os.path.join(tmp, '6_opt.xyz'), 'w') as f:
+                f.write('not an xyz file')
+            molecules = XYZreader(path_pattern='[1-6]_opt.xyz', path_root=tmp, path_only=True).read()
+            for n_jobs in [1, 2]:
+                s = ConvertFile(molecules, 'xyz', 'smi', n_jobs=n_jobs, batch_size=2).convert()
+                self.assertEqual(len(s), 6)
+                self.assertEqual([s[i]['status'] for i in s], ['converted'] * 5 + ['failed'])
+                self.assertTrue(os.path.exists(s[3]['file']) and s[3]['file'].endswith('3_opt.smi'))
+                self.assertIsNone(s[6]['file'])
+                self.assertIsNotNone(s[6]['error'])
+            # single multi-molecule output
+            output = os.path.join(tmp, 'all.smi')
+            s = ConvertFile(molecules, 'xyz', 'smi', output=output, n_jobs=2, batch_size=2).convert()
+            self.assertEqual(s[1]['file'], output)
+            with open(output) as f:
+                self.assertEqual(len(f.read().splitlines()), 5)
+            with self.assertRaises(ValueError):
+                ConvertFile(molecules, 'cml', 'smi').convert()
+        finally:
+            shutil.rmtree(tmp)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,9 @@ import pytest
 import os
 import pkg_resources
 
-from chemml.initialization import XYZreader
+import numpy as np
+
+from chemml.initialization import XYZreader, PackedGeometries, pack_xyz
 
 
 @pytest.fixture()
@@ -43,3 +45,57 @@ def test_notxyz_exception(data_path):
     with pytest.raises(ValueError):
         reader = XYZreader('[2-3].opt')
         reader.read()
+
+
+def test_read_packed(data_path, tmp_path):
+    reader = XYZreader(
+        path_pattern=['[2-3]_opt.xyz', '[1-2][1-2]_opt.xyz'],
+        path_root=data_path,
+        reader='manual',
+        skip_lines=[2, 0])
+    molecules = reader.read()
+    for n_jobs in [1, 2]:
+        packed = reader.read_packed(n_jobs=n_jobs, batch_size=2)
+        assert isinstance(packed, PackedGeometries)
+        assert len(packed) == 6
+        assert packed.offsets[-1] == len(packed.atomic_numbers) == len(packed.coordinates)
+        assert reader.max_n_atoms_ == max(len(molecules[i]['mol']) for i in molecules)
+        for i in molecules:
+            assert packed.files[i - 1] == molecules[i]['file']
+            assert np.allclose(packed[i - 1], molecules[i]['mol'])
+    # slicing
+    assert np.allclose(packed[1:3][1], packed[2])
+    assert np.allclose(packed[[4, 0]][0], packed[4])
+    assert packed[::2].files == packed.files[::2]
+
+    # multi-XYZ stream with Mathematica style exponents
+    with open(os.path.join(str(tmp_path), 'multi.xyz'), 'w') as f:
+        f.write("2\ncomment\nH 0.0 0.0 0.0\nH 0.0 0.0 7.4*^-1\n\n3\nwater\nO 0 0 0 -0.1\nH 0.9 0 0 0.05\n8 0 0.9 0 0.05\n")
+    packed = XYZreader('multi.xyz', path_root=str(tmp_path)).read_packed()
+    assert list(packed.n_atoms) == [2, 3]
+    assert list(packed.atomic_numbers) == [1, 1, 8, 1, 8]
+    assert packed[0][1, 3] == 0.74
+
+
+def test_packed_archive(data_path, tmp_path):
+    archive = os.path.join(str(tmp_path), 'organic.npz')
+    packed = pack_xyz(['[1-9]_opt.xyz', '[1-9][0-9]_opt.xyz'], archive, path_root=data_path, n_jobs=2)
+    assert len(packed) == 50
+    loaded = PackedGeometries.load(archive)
+    assert isinstance(loaded.coordinates, np.memmap)
+    assert loaded.files == packed.files
+    assert list(loaded.offsets) == list(packed.offsets)
+    for i in [0, 17, 49]:
+        assert np.array_equal(loaded[i], packed[i])
+    # a slice of an archive can be stored again
+    loaded[10:20].save(os.path.join(str(tmp_path), 'part.npz'))
+    part = PackedGeometries.load(os.path.join(str(tmp_path), 'part.npz'), mmap=False)
+    assert part.files == packed.files[10:20]
+    assert np.array_equal(part[3], packed[13])
+
+    # the XYZreader reads the archives directly
+    reader = XYZreader(['organic.npz', 'part.npz'], path_root=str(tmp_path))
+    molecules = reader.read()
+    assert len(molecules) == 60
+    assert np.array_equal(molecules[51]['mol'], packed[10])
+    assert reader.read_packed().files == packed.files + part.files
@@ -4,12 +4,13 @@ import warnings
 import pkg_resources
 import pandas as pd
 import numpy as np
+from sklearn.preprocessing import StandardScaler
 
 from tensorflow.keras.layers import Input, Dense, Concatenate
 from tensorflow.keras.models import Model
 from tensorflow.keras.optimizers import Adam
 
-from chemml.optimization import ActiveLearning
+from chemml.optimization import ActiveLearning, TargetLayerExtractor
 from chemml.datasets import load_organic_density
 
 
@@ -265,3 +266,280 @@ def test_model_single_input():
     # visualize
     # plots = al.visualize(density)
     # assert len(plots) == 3
+
+
+def test_deposit_bookkeeping():
+    U = np.random.random((5000, 3))
+    Y = np.random.random((5000, 1))
+    al = ActiveLearning(
+        model_creator=model_creator_one_input,
+        U=U,
+        target_layer='l3',
+        train_size=100,
+        test_size=50)
+    qtr, qte = al.initialize(random_state=7)
+
+    # ignore a few training candidates
+    al.ignore(qtr[:10])
+    assert len(al.queries[0][1]) == 90
+
+    # partial deposits keep the order of indices and labels
+    assert al.deposit(qtr[10:40], Y[qtr[10:40]])
+    assert al.deposit(qte, Y[qte])
+    assert al.deposit(qtr[40:], Y[qtr[40:]])
+    assert len(al.queries) == 0
+    assert (al.train_indices == qtr[10:]).all()
+    assert (al.Y_train == Y[qtr[10:]]).all()
+    assert (al.test_indices == qte).all()
+    assert (al.initial_test_indices == qte).all()
+    assert (al.Y_test == Y[qte]).all()
+
+    # remaining pool
+    inds = [i for i in range(U.shape[0]) if i not in al.train_indices and i not in al.test_indices]
+    assert (al.U_indices == np.array(inds)).all()
+    assert al.U_indices.shape[0] == U.shape[0] - 90 - 50
+
+
+def test_bemcm_selection():
+    rng = np.random.RandomState(0)
+    m, d, n_ensemble = 300, 5, 4
+    deviations = rng.randn(m, n_ensemble)
+    lin_layer = rng.randn(m, d)
+    alpha = 0.01
+    former_queries = [3, 10, 50]
+
+    al = ActiveLearning(
+        model_creator=model_creator_one_input,
+        U=rng.random_sample((m, 2)),
+        target_layer='l3',
+        train_size=10,
+        test_size=10,
+        batch_size=[6, 2, 1])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        selected = al._bemcm(deviations, lin_layer, alpha, False, former_queries)
+
+    # naive B_EMCM with full (m,d) correlation terms
+    expected = []
+    correlation_term = np.zeros((n_ensemble, m, d))
+    while len(expected) < 6:
+        if len(expected) > 0:
+            s = expected[-1]
+            for it in range(n_ensemble):
+                correlation_term[it] += np.dot(lin_layer, deviations[s, it] * lin_layer[s]).reshape(-1, 1) * lin_layer
+        norms = np.mean([np.linalg.norm(deviations[:, it].reshape(-1, 1) * lin_layer - alpha * correlation_term[it], axis=1)
+                         for it in range(n_ensemble)], axis=0)
+        norms[former_queries + expected] = -np.inf
+        expected.append(int(np.argmax(norms)))
+
+    assert selected == expected
+
+
+def test_streaming_pool(tmp_path):
+    U = np.random.random((1000, 200))
+    Y = np.random.random((1000, 1))
+    mm = np.memmap(str(tmp_path / 'U.dat'), dtype=U.dtype, mode='w+', shape=U.shape)
+    mm[:] = U
+    mm.flush()
+
+    def U_chunks():
+        for i in range(0, U.shape[0], 77):
+            yield U[i:i + 77]
+
+    for pool in [np.memmap(str(tmp_path / 'U.dat'), dtype=U.dtype, mode='r', shape=U.shape), U_chunks]:
+        al = ActiveLearning(
+            model_creator=model_creator_one_input,
+            U=pool,
+            target_layer='l3',
+            train_size=50,
+            test_size=40,
+            chunk_size=64)
+        assert al.U_size == U.shape[0]
+        qtr, qte = al.initialize(random_state=7)
+        al.deposit(qtr, Y[qtr])
+        al.deposit(qte, Y[qte])
+        assert (al.X_train == U[qtr]).all()
+        assert (al.X_test == U[qte]).all()
+
+        # chunked mapping over the remaining candidates
+        out = al._map_U(lambda X: X.sum(axis=1).reshape(-1, 1), al.U_indices)
+        assert np.allclose(out, U[al.U_indices].sum(axis=1).reshape(-1, 1))
+
+        # pre-filter
+        candidates = al._pool_filter(100, 'random', None, [0, 1], 7)
+        assert len(candidates) in (100, 101, 102)
+        assert len(np.unique(candidates)) == len(candidates)
+
+    # the scaler of a memory-mapped pool is fitted chunk by chunk, even without a chunk_size
+    class Scaler(StandardScaler):
+        def fit(self, X, y=None):
+            raise AssertionError("the pool must not be loaded at once")
+    al = ActiveLearning(
+        model_creator=model_creator_one_input,
+        U=np.memmap(str(tmp_path / 'U.dat'), dtype=U.dtype, mode='r', shape=U.shape),
+        target_layer='l3',
+        train_size=50,
+        test_size=40)
+    scaler = al._fit_X_scaler(Scaler())
+    assert np.allclose(scaler.mean_, U.mean(axis=0))
+
+    # exceptions
+    with pytest.raises(ValueError):
+        al = ActiveLearning(
+            model_creator=model_creator_one_input,
+            U=U,
+            target_layer='l3',
+            train_size=50,
+            chunk_size=0)
+
+
+def model_creator_small():
+    inp = Input(shape=(20,), name='inp1')
+    l1 = Dense(4, name='l1', activation='relu')(inp)
+    out = Dense(1, name='outp', activation='linear')(l1)
+    model = Model(inputs=inp, outputs=out)
+    model.compile(optimizer=Adam(learning_rate=0.01), loss='mean_squared_error')
+    return model
+
+
+def test_search_pool_filter():
+    U = np.random.random((300, 20))
+    Y = U.sum(axis=1).reshape(-1, 1)
+    for pool_filter in ['random', 'uncertainty']:
+        al = ActiveLearning(
+            model_creator=model_creator_small,
+            U=U,
+            target_layer='l1',
+            train_size=30,
+            test_size=20,
+            batch_size=[0, 4, 4])
+        qtr, qte = al.initialize(random_state=7)
+        al.deposit(qtr, Y[qtr])
+        al.deposit(qte, Y[qte])
+
+        # record the filtered pool of candidates
+        filtered = []
+        pool_filter_method = al._pool_filter
+
+        def record(*args):
+            candidates = pool_filter_method(*args)
+            filtered.append(al.U_indices[candidates])
+            return candidates
+        al._pool_filter = record
+
+        queries = al.search(n_evaluation=2, ensemble='kfold', n_ensemble=2, pool_size=40, pool_filter=pool_filter,
+                            epochs=2, verbose=0)
+        assert len(filtered) == 1
+        # the pool_size candidates and the queries of the distance-based approach
+        assert 40 <= len(filtered[0]) <= 44
+        assert set(filtered[0]) <= set(al.U_indices)
+        assert len(queries) == 8
+        assert set(queries) <= set(filtered[0])
+        for _, indices in al.queries:
+            assert set(indices) <= set(filtered[0])
+
+    with pytest.raises(ValueError):
+        al.search(pool_size=7)
+    with pytest.raises(ValueError):
+        al.search(pool_size=40, pool_filter='best')
+
+
+def test_checkpoint(tmp_path):
+    U = np.random.random((500, 200))
+    Y = np.random.random((500, 1))
+    np.save(str(tmp_path / 'U.npy'), U)
+    pool = np.load(str(tmp_path / 'U.npy'), mmap_mode='r')
+    al = ActiveLearning(
+        model_creator=model_creator_one_input,
+        U=pool,
+        target_layer='l3',
+        train_size=50,
+        test_size=40,
+        batch_size=[2, 1, 2])
+    qtr, qte = al.initialize(random_state=7)
+    al.deposit(qtr[:20], Y[qtr[:20]])
+    al.deposit(qte, Y[qte])
+    filename = str(tmp_path / 'checkpoint.npz')
+    # the numpy integers are stored as json
+    al.query_number = np.int64(al.query_number)
+    al.batch_size = [2, np.int64(1), 2]
+    al.save(filename)
+
+    # restore from the referenced memory-mapped pool
+    al2 = ActiveLearning.load(filename, model_creator_one_input)
+    assert isinstance(al2.U, np.memmap)
+    assert (al2.U == U).all()
+    assert al2.target_layer == 'l3'
+    assert al2.batch_size == [2, 1, 2]
+    assert type(al2.history) is int and al2.history == al.history
+    assert type(al2.query_number) is int and al2.query_number == al.query_number
+    assert (al2.last_deposited_indices_ == al.last_deposited_indices_).all()
+    assert (al2.train_indices == al.train_indices).all()
+    assert (al2.test_indices == al.test_indices).all()
+    assert (al2.initial_test_indices == al.initial_test_indices).all()
+    assert (al2.U_indices == al.U_indices).all()
+    assert (al2.Y_train == al.Y_train).all()
+    assert (al2.Y_test == al.Y_test).all()
+    assert len(al2.queries) == 1
+    assert (al2.queries[0][1] == al.queries[0][1]).all()
+
+    # a second round trip through the memory-mapped pool
+    filename2 = str(tmp_path / 'checkpoint2.npz')
+    al2.save(filename2)
+    al3 = ActiveLearning.load(filename2, model_creator_one_input)
+    assert al3.U.filename == al2.U.filename
+    assert (al3.U_indices == al.U_indices).all()
+    assert (al3.last_deposited_indices_ == al.last_deposited_indices_).all()
+    assert (al3.queries[0][1] == al.queries[0][1]).all()
+
+    # resume the deposits
+    assert al2.deposit(qtr[20:], Y[qtr[20:]])
+    assert len(al2.queries) == 0
+    assert (al2.Y_train == Y[qtr]).all()
+
+    # a different pool
+    with pytest.raises(ValueError):
+        ActiveLearning.load(filename, model_creator_one_input, U=np.random.random((500, 200)))
+
+
+def test_target_layer_extractor():
+    b1_in = Input(shape=(20,), name='inp1')
+    l1 = Dense(6, name='l1', activation='relu')(b1_in)
+    l2 = Dense(3, name='l2', activation='relu')(l1)
+    out = Dense(1, name='outp')(l2)
+    model = Model(inputs=b1_in, outputs=out)
+    X = np.random.random((105, 20)).astype('float32')
+
+    extractor = TargetLayerExtractor(model, ['l1', 'l2'], batch_size=10)
+    features = extractor.transform(X)
+    assert features.shape == (105, 9)
+    full = Model(inputs=b1_in, outputs=[l1, l2]).predict(X, verbose=0)
+    assert np.allclose(features, np.concatenate(full, axis=-1), atol=1e-5)
+
+    # preallocated output
+    out = np.zeros((105, 9), dtype='float32')
+    assert extractor.transform(X, out=out) is out
+    assert np.allclose(out, features)
+
+    # exceptions
+    with pytest.raises(ValueError):
+        extractor.transform([X, X])
+    with pytest.raises(ValueError):
+        TargetLayerExtractor(model, 'l1', batch_size=0)
+
+    # cached by ActiveLearning
+    al = ActiveLearning(
+        model_creator=model_creator_one_input,
+        U=np.random.random((200, 20)),
+        target_layer='l2',
+        train_size=50,
+        test_size=40)
+    assert np.allclose(al.get_target_layer(model, X), features[:, 6:], atol=1e-5)
+    extractor = al._extractors[model]
+    al.get_target_layer(model, X[:5])
+    assert al._extractors[model] is extractor
+    # a different target layer with the same model
+    al.target_layer = 'l1'
+    assert np.allclose(al.get_target_layer(model, X), features[:, :6], atol=1e-5)
+    al.target_layer = ['l1', 'l2']
+    assert np.allclose(al.get_target_layer(model, X), features, atol=1e-5)
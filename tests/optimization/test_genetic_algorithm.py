@@ -1,5 +1,7 @@
 import pytest
-from chemml.optimization import GeneticAlgorithm
+import numpy as np
+from chemml.optimization import GeneticAlgorithm, IslandGeneticAlgorithm, EvaluationCache
+from chemml.optimization.genetic_algorithm import DiscreteSpace
 
 space = ({'alpha': {'uniform': [-20, 0], 
                         'mutation': [0, 2]}}, 
@@ -52,3 +54,276 @@ def test_crossovers():
         _, best_individual = ga_search.search(n_generations=4)
         assert sum([best_individual[i] for i in best_individual]) <= 200
 
+
+def test_parallel_evaluation():
+    from concurrent.futures import ThreadPoolExecutor
+    ga_search = GeneticAlgorithm(
+        evaluate,
+        space=space,
+        pop_size=10,
+        mutation_size=4,
+        crossover_size=4,
+        algorithm=3,
+        n_jobs=2)
+    best_ind_df, best_individual = ga_search.search(n_generations=3)
+    assert best_ind_df.shape[0] == 3
+    assert sum([best_individual[i] for i in best_individual]) <= 200
+    for ind in ga_search.fitness_dict:
+        assert ga_search.fitness_dict[ind] == evaluate(ind)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        ga_search = GeneticAlgorithm(
+            evaluate,
+            space=space,
+            pop_size=10,
+            mutation_size=4,
+            crossover_size=4,
+            algorithm=1,
+            n_jobs=3,
+            executor=executor)
+        _, best_individual = ga_search.search(n_generations=3)
+    assert sum([best_individual[i] for i in best_individual]) <= 200
+
+    with pytest.raises(Exception):
+        GeneticAlgorithm(evaluate, space=space, n_jobs=0)
+
+def test_steady_state():
+    for n_jobs in [1, 2]:
+        ga_search = GeneticAlgorithm(
+            evaluate,
+            space=space,
+            pop_size=10,
+            mutation_size=4,
+            crossover_size=4,
+            n_jobs=n_jobs)
+        best_ind_df, best_individual = ga_search.search(n_generations=4, steady_state=True)
+        assert best_ind_df.shape[0] == 4
+        assert len(ga_search.population) == 10
+        assert len(ga_search.fitness_dict) == 10 + 4 * 8
+        # the population holds the best individuals
+        best = sorted(ga_search.fitness_dict.values(), reverse=True)[:10]
+        assert sorted([ga_search.fitness_dict[i] for i in ga_search.population], reverse=True) == best
+
+def test_evaluation_cache(tmp_path):
+    import random
+    calls = []
+
+    def counted_evaluate(individual):
+        calls.append(individual)
+        return sum(individual)
+
+    path = str(tmp_path / 'cache.db')
+    random.seed(1)
+    ga_search = GeneticAlgorithm(counted_evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4,
+                                 cache=path)
+    ga_search.search(n_generations=2)
+    n_evaluated = len(ga_search.fitness_dict)
+    assert len(calls) == n_evaluated
+    assert len(EvaluationCache(path, counted_evaluate)) == n_evaluated
+
+    # restart the same search: all the individuals are found in the cache
+    random.seed(1)
+    ga_search = GeneticAlgorithm(counted_evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4,
+                                 cache=EvaluationCache(path))
+    ga_search.search(n_generations=2)
+    assert len(calls) == n_evaluated
+    assert ga_search.cache.get(list(ga_search.fitness_dict)[0]) == ga_search.fitness_dict[list(ga_search.fitness_dict)[0]]
+
+    # a different objective doesn't share the results
+    assert len(EvaluationCache(path, evaluate)) == 0
+
+def test_evaluation_cache_keys(tmp_path):
+    import numpy as np
+    from chemml.optimization.genetic_algorithm import objective_fingerprint
+    cache = EvaluationCache(str(tmp_path / 'cache.db'), evaluate)
+    cache.set((np.float64(1.5), np.int64(2), 'a'), 3.5)
+    assert cache.get((1.5, 2, 'a')) == 3.5
+    assert len(cache) == 1
+
+    # the values captured in a closure are part of the fingerprint
+    def make_objective(scale):
+        def objective(individual):
+            return scale * sum(individual)
+        return objective
+    assert objective_fingerprint(make_objective(1)) == objective_fingerprint(make_objective(1))
+    assert objective_fingerprint(make_objective(1)) != objective_fingerprint(make_objective(2))
+
+def test_select_and_rank():
+    import random
+    ga_search = GeneticAlgorithm(evaluate, space=space, fitness=("min", ))
+    population = [(float(i), i, i) for i in range(20)]
+    fitness_dict = {ind: evaluate(ind) for ind in population}
+
+    best = ga_search.select(population, fitness_dict, 5, choice="best")
+    assert best == population[:5]
+    random.seed(0)
+    roulette = ga_search.select(population, fitness_dict, 10)
+    assert len(roulette) == 10
+    assert set(roulette) <= set(population)
+
+    # ranks follow the fitness and are updated when individuals are added
+    assert [ga_search.rank(ind, fitness_dict) for ind in population] == list(range(20))
+    fitness_dict[(-1.0, 0, 0)] = -1.0
+    assert ga_search.rank((-1.0, 0, 0), fitness_dict) == 0
+    assert ga_search.rank(population[0], fitness_dict) == 1
+
+    # multiple objectives
+    ga_search = GeneticAlgorithm(evaluate, space=space, fitness=("max", "min"))
+    fitness_dict = {ind: (ind[1], -ind[1]) for ind in population}
+    assert ga_search.select(population, fitness_dict, 3, choice="best") == population[::-1][:3]
+    assert ga_search.rank(population[-1], fitness_dict) == 0
+    # the weighted mode ranks among all the fitness_dict, even during a search
+    ga_search._rank_population = population[:5]
+    assert ga_search.rank(population[4], fitness_dict) == 15
+    ga_search._rank_population = None
+
+def evaluate_two(individual):
+    return individual[0] + individual[2], individual[1]
+
+def test_nsga2():
+    from chemml.optimization.genetic_algorithm import non_dominated_sort, crowding_distance
+    F = [[1, 5], [2, 4], [3, 3], [1, 1], [2, 2], [0, 0]]
+    assert list(non_dominated_sort(F)) == [0, 0, 0, 2, 1, 3]
+    assert list(non_dominated_sort(F, chunk_size=2)) == [0, 0, 0, 2, 1, 3]
+    assert list(crowding_distance([[1, 5], [2, 4], [3, 3]])) == [np.inf, 2.0, np.inf]
+
+    ga_search = GeneticAlgorithm(evaluate_two, space=space, fitness=("max", "min"), multi_objective="nsga2",
+                                 pop_size=10, mutation_size=4, crossover_size=4)
+    best_ind_df, _ = ga_search.search(n_generations=3)
+    assert len(ga_search.pareto_fronts) == best_ind_df.shape[0]
+    front = ga_search.pareto_front
+    assert front.shape[1] == 5
+    # no evaluated individual dominates a member of the Pareto front
+    fits = np.array(list(ga_search.fitness_dict.values())) * np.array([1, -1])
+    for f in front[['Fitness_0', 'Fitness_1']].values * np.array([1, -1]):
+        assert not ((fits >= f).all(axis=1) & (fits > f).any(axis=1)).any()
+
+    with pytest.raises(Exception):
+        GeneticAlgorithm(evaluate_two, space=space, multi_objective="fake")
+
+    # during an nsga2 search, the rank is computed among the current population only
+    ga_search._rank_population = ga_search.population
+    ranks = [ga_search.rank(ind, ga_search.fitness_dict) for ind in ga_search.population]
+    assert sorted(ranks) == list(range(len(ga_search.population)))
+    outsider = next(i for i in ga_search.fitness_dict if i not in ga_search.population)
+    assert 0 <= ga_search.rank(outsider, ga_search.fitness_dict) <= len(ga_search.population)
+    ga_search._rank_population = None
+
+    islands = [GeneticAlgorithm(evaluate_two, space=space, fitness=("max", "min"), multi_objective="nsga2", pop_size=10,
+                                mutation_size=4, crossover_size=4) for _ in range(2)]
+    model = IslandGeneticAlgorithm(islands, migration_interval=1, n_jobs=1)
+    _, best_individual = model.search(n_generations=2)
+    front = model.pareto_front
+    values = front[list(best_individual)].values.astype(float)
+    assert np.isclose(values, list(best_individual.values())).all(axis=1).any()
+
+def test_island_model():
+    islands = [GeneticAlgorithm(evaluate, space=space, crossover_type=c, pop_size=10, mutation_size=4, crossover_size=4)
+               for c in ['Blend', 'SinglePoint', 'Uniform']]
+    for n_jobs in [1, 3]:
+        model = IslandGeneticAlgorithm(islands, migration_interval=2, n_migrants=2, n_jobs=n_jobs)
+        best_ind_df, best_individual = model.search(n_generations=5)
+        assert best_ind_df.shape[0] == 15
+        assert list(best_ind_df.columns[:2]) == ['Island', 'Generation']
+        assert best_ind_df['Generation'].max() == 4
+        best = max(model.fitness_dict.values())
+        assert sum([best_individual[i] for i in best_individual]) == best
+        for ga in model.islands:
+            assert 0 < len(ga.population) <= 10
+            assert set(ga.fitness_dict) <= set(model.fitness_dict)
+
+    with pytest.raises(Exception):
+        IslandGeneticAlgorithm(islands, migration_interval=0)
+
+
+def test_surrogate_and_budget():
+    for surrogate in ['RandomForest', 'GaussianProcess']:
+        calls = []
+        def counted(individual):
+            calls.append(individual)
+            return sum(individual)
+        ga_search = GeneticAlgorithm(counted, space=space, pop_size=10, mutation_size=4, crossover_size=4,
+                                     surrogate=surrogate, surrogate_ratio=4)
+        best_ind_df, best_individual = ga_search.search(n_generations=3)
+        assert len(calls) == ga_search.n_evaluations == len(ga_search.fitness_dict)
+        assert len(calls) <= 10 + 3 * (4 + 4)
+        assert tuple(best_individual.values()) in ga_search.fitness_dict
+
+    # evaluation budget
+    ga_search = GeneticAlgorithm(evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4)
+    best_ind_df, _ = ga_search.search(n_generations=20, max_evaluations=25)
+    assert ga_search.n_evaluations == 25
+    assert best_ind_df.shape[0] < 20
+    ga_search = GeneticAlgorithm(evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4)
+    _, best_individual = ga_search.search(n_generations=20, max_evaluations=5)
+    assert ga_search.n_evaluations == 5 and len(ga_search.population) == 5
+    ga_search = GeneticAlgorithm(evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4)
+    ga_search.search(n_generations=20, max_evaluations=25, steady_state=True)
+    assert ga_search.n_evaluations == 25
+    # time budget
+    ga_search = GeneticAlgorithm(evaluate, space=space, pop_size=10, mutation_size=4, crossover_size=4)
+    best_ind_df, _ = ga_search.search(n_generations=20, max_time=0)
+    assert best_ind_df.shape[0] == 1 and ga_search.n_evaluations == 10
+
+    with pytest.raises(Exception):
+        GeneticAlgorithm(evaluate, space=space, surrogate='SVM')
+    with pytest.raises(Exception):
+        ga_search.search(max_evaluations=0)
+
+
+def test_discrete_space():
+    space = DiscreteSpace([range(0, 3), ['a', 'b'], [0.1, 0.2, 0.3, 0.4]])
+    assert space.size == 24
+    for i in range(space.size):
+        assert space.encode(space.decode(i)) == i
+    assert space.encode((5, 'a', 0.1)) is None
+    visited = set()
+    while not space.exhausted:
+        new = space.sample()
+        assert new not in visited
+        visited.add(new)
+        assert space.visit(new) and not space.visit(new)
+    assert space.sample() is None and len(visited) == 24
+
+    discrete = ({'layers': {'int': [1, 3]}}, {'act': {'choice': ['relu', 'tanh']}}, {'neurons': {'choice': range(0, 50, 10)}})
+    ga_search = GeneticAlgorithm(lambda x: (x[0] * x[2], ), space=discrete, pop_size=6, mutation_size=3,
+                                 crossover_size=3, crossover_type='Uniform')
+    _, best_individual = ga_search.search(n_generations=50)
+    assert len(ga_search.fitness_dict) <= 30
+    assert ga_search.custom_mutate(ga_search.population[0], {i: 0 for i in ga_search.discrete_space.sample_many(30)}) is None
+    single = GeneticAlgorithm(evaluate, space=({'neurons': {'int': [0, 10]}}, ), pop_size=4, mutation_size=2,
+                              crossover_size=2)
+    single.search(n_generations=2)
+    assert all(0 <= i[0] <= 10 for i in single.fitness_dict)
+
+    # a large space (10 ** 20 individuals) keeps the visited individuals in a set
+    large = DiscreteSpace([range(10)] * 20)
+    assert isinstance(large._visited, set)
+    chromosomes = large.sample_many(5)
+    assert len(set(chromosomes)) == 5
+    assert large.visit(chromosomes[0]) and not large.visit(chromosomes[0]) and large.n_visited == 1
+    assert large.sample() not in chromosomes[:1]
+    ga_search = GeneticAlgorithm(evaluate, space=tuple({'x%i' % i: {'int': [0, 9]}} for i in range(20)), pop_size=6,
+                                 mutation_size=3, crossover_size=3, crossover_type='Uniform')
+    ga_search.search(n_generations=2)
+    assert len(ga_search.fitness_dict) > 6 and 0 < ga_search.discrete_space.n_visited <= len(ga_search.fitness_dict)
+
+    # the mutation stops drawing when the unvisited individuals are exhausted
+    tiny = GeneticAlgorithm(evaluate, space=({'x': {'int': [0, 5]}}, ), pop_size=4, mutation_size=4, crossover_size=0)
+    calls = []
+    draw = tiny.custom_mutate
+    tiny.custom_mutate = lambda ind, fitness_dict: calls.append(ind) or draw(ind, fitness_dict)
+    tiny.search(n_generations=1)
+    assert len(tiny.fitness_dict) == 6 and len(calls) < 100
+
+
+def test_mutation_population_size():
+    discrete = ({'a': {'int': [0, 100]}}, {'b': {'int': [0, 100]}})
+    ga_search = GeneticAlgorithm(lambda x: (x[0] + x[1], ), space=discrete, pop_size=10, mutation_size=6,
+                                 crossover_size=2, algorithm=3)
+    # every mutant is drawn twice in a row
+    draws = iter([(i // 2, 100 - i // 2) for i in range(1000)])
+    ga_search.custom_mutate = lambda ind, fitness_dict: next(draws)
+    for _ in range(3):
+        ga_search.search(n_generations=1, init_ratio=0.1, crossover_ratio=0.1)
+        assert len(ga_search.population) == 8
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 
 from chemml.preprocessing import ConstantColumns
@@ -23,6 +24,14 @@ class TestConstantColumns(unittest.TestCase):
         ff = cc.transform(df)
         self.assertEqual(3, (ff == f).sum()[0])
 
+    def test_array(self):
+        X = np.array([[1, 7, 5.], [2, 7, 5.], [3, 7, 5.]])
+        cc = ConstantColumns()
+        f = cc.fit_transform(X)
+        self.assertEqual(f.shape, (3, 1))
+        np.testing.assert_array_equal(cc.removed_columns_, [1, 2])
+        np.testing.assert_array_equal(cc.transform(X), f)
+
 
 if __name__ == '__main__':
     unittest.main()
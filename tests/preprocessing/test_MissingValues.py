@@ -23,3 +23,35 @@ class TestConstantColumns(unittest.TestCase):
         self.assertEqual(0.0, f[2][1])
         self.assertEqual(0.0, f[1][0])
 
+
+    def test_copy_and_array(self):
+        data = df.copy()
+        for strategy in ['zero', 'ignore_row', 'ignore_column']:
+            mv = MissingValues(strategy=strategy, string_as_null=True)
+            mv.fit_transform(data)
+            self.assertTrue(data.equals(df))
+        mv = MissingValues(strategy='ignore_row')
+        X = np.array([[1., 2.], [np.nan, 3.], [4., np.inf]])
+        self.assertEqual((1, 2), mv.fit_transform(X).shape)
+        np.testing.assert_array_equal([True, False, False], mv.mask)
+        self.assertEqual((1, 2), mv.transform(X).shape)
+        mv = MissingValues(strategy='zero', copy=False)
+        self.assertIs(X, mv.fit_transform(X))
+        self.assertEqual(0, X[1, 0])
+
+        # the column mask covers the dropped null columns of an array
+        X = np.array([[1., np.nan, 3.], [4., np.nan, np.nan]])
+        mv = MissingValues(strategy='ignore_column')
+        f = mv.fit_transform(X)
+        np.testing.assert_array_equal([True, False, False], mv.mask)
+        np.testing.assert_array_equal(f, mv.transform(X))
+        X = np.array([[1, None, 'a'], [4, None, None]], dtype=object)
+        f = mv.fit_transform(X)
+        np.testing.assert_array_equal([True, False, False], mv.mask)
+        np.testing.assert_array_equal(f, mv.transform(X))
+
+    def test_dtypes(self):
+        data = pd.DataFrame({'a': [1, 2, 3], 'b': [4, np.nan, 6]})
+        for strategy in ['zero', 'ignore_row']:
+            f = MissingValues(strategy=strategy).fit_transform(data)
+            self.assertEqual([np.dtype('int64'), np.dtype('float64')], list(f.dtypes))
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pandas as pd
 
 from chemml.preprocessing import Outliers
@@ -25,6 +26,13 @@ class TestOutliers(unittest.TestCase):
         self.assertEqual(1, f.index[0])
         self.assertEqual(1, (ff == f).sum()[0])
 
+    def test_array(self):
+        ro = Outliers(m=1., strategy='median')
+        f = ro.fit_transform(df.values)
+        self.assertEqual(f.shape, (1, 4))
+        np.testing.assert_array_equal(ro.removed_rows_, [0, 2])
+        np.testing.assert_array_equal(ro.transform(df.values), f)
+
 
 if __name__ == '__main__':
     unittest.main()
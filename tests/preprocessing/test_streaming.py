@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from chemml.preprocessing import ColumnStatistics, iter_chunks
+from chemml.preprocessing import MissingValues, ConstantColumns, Outliers
+
+
+@pytest.fixture()
+def table():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(rng.normal(size=(1000, 6)), columns=['a', 'b', 'c', 'd', 'e', 'f'])
+    df['c'] = 3.0
+    df.loc[[5, 500], 'a'] = 50.0
+    df.loc[[10, 700], 'b'] = np.nan
+    df['f'] = np.nan
+    return df
+
+
+def test_column_statistics(table):
+    stats = ColumnStatistics(reservoir_size=2000)
+    for chunk in iter_chunks(table, chunksize=97):
+        stats.update(chunk.values)
+    assert stats.n_rows == 1000
+    assert list(stats.nan_count) == [0, 2, 0, 0, 0, 1000]
+    np.testing.assert_allclose(stats.mean[:5], table.mean().values[:5])
+    np.testing.assert_allclose(stats.std[:5], table.std(ddof=0).values[:5])
+    np.testing.assert_allclose(stats.median[:5], table.median().values[:5])
+    np.testing.assert_allclose(stats.min[:5], table.min().values[:5])
+    assert np.isnan(stats.mean[5]) and np.isnan(stats.median[5])
+    # the sampled medians are close
+    sampled = ColumnStatistics(reservoir_size=300, random_state=1)
+    for chunk in iter_chunks(table.values, chunksize=128):
+        sampled.update(chunk.values)
+    assert np.abs(sampled.median[:2] - table.median().values[:2]).max() < 0.2
+
+
+def test_iter_chunks(table, tmp_path):
+    path = str(tmp_path / 'table.csv')
+    table.to_csv(path, index=False)
+    chunks = list(iter_chunks(path, chunksize=300))
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    assert list(chunks[1].index[:2]) == [300, 301]
+    np.save(str(tmp_path / 'table.npy'), table.values)
+    chunks = list(iter_chunks(str(tmp_path / 'table.npy'), chunksize=400))
+    assert [len(c) for c in chunks] == [400, 400, 200]
+    assert list(chunks[2].index[:1]) == [800]
+
+
+def test_chunked_transformers(table, tmp_path):
+    path = str(tmp_path / 'table.csv')
+    table.to_csv(path, index=False)
+
+    mv = MissingValues(strategy='ignore_row').fit(path, chunksize=150)
+    cleaned = pd.concat(mv.transform_chunks(path, chunksize=150))
+    expected = MissingValues(strategy='ignore_row').fit_transform(table.copy())
+    assert cleaned.shape == expected.shape == (998, 5)
+    assert mv.mask.sum() == 998 and not mv.mask[700]
+    mv = MissingValues(strategy='ignore_column').fit(path, chunksize=150)
+    assert pd.concat(mv.transform_chunks(path, chunksize=150)).shape == (1000, 4)
+    mv = MissingValues(strategy='zero').fit(path, chunksize=150)
+    assert pd.concat(mv.transform_chunks(path, chunksize=150)).isnull().sum().sum() == 0
+    with pytest.raises(ValueError):
+        MissingValues(strategy='interpolate').fit(path)
+
+    cc = ConstantColumns().fit(path, chunksize=150)
+    assert list(cc.removed_columns_) == ['c']
+
+    data = table.drop(['c', 'f'], axis=1).fillna(0)
+    for strategy in ['mean', 'median']:
+        ro = Outliers(m=3.0, strategy=strategy).fit(data.values, chunksize=150)
+        chunked = pd.concat(ro.transform_chunks(data.values, chunksize=150))
+        expected = Outliers(m=3.0, strategy=strategy).fit_transform(data)
+        assert list(chunked.index) == list(expected.index)
+        assert 5 in ro.removed_rows_ and 500 in ro.removed_rows_
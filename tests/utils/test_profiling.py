@@ -0,0 +1,63 @@
+import json
+import pytest
+
+from chemml.utils import profiling
+
+
+@pytest.fixture()
+def clean():
+    profiling.disable()
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled(clean):
+    @profiling.profiled()
+    def f(x):
+        return x + 1
+
+    with profiling.timer('block'):
+        assert f(1) == 2
+    profiling.count('items', 3)
+    assert profiling.summary().shape[0] == 0
+    assert profiling.counters() == {}
+
+
+def test_profile(clean, tmp_path):
+    @profiling.profiled('f')
+    def f(x):
+        with profiling.timer('inner', x=x):
+            profiling.count('items', x)
+        return x
+
+    trace = str(tmp_path / 'trace.json')
+    with profiling.profile(trace):
+        for i in range(3):
+            f(i)
+    assert not profiling.is_enabled()
+    summary = profiling.summary()
+    assert summary.loc['f', 'calls'] == 3
+    assert summary.loc['inner', 'calls'] == 3
+    assert profiling.counters() == {'items': 3}
+    with open(trace) as fp:
+        events = json.load(fp)['traceEvents']
+    assert sorted(set(e['ph'] for e in events)) == ['C', 'X']
+    inner = [e for e in events if e['name'] == 'inner']
+    assert [e['args']['x'] for e in inner] == [0, 1, 2]
+
+    log = str(tmp_path / 'trace.log')
+    profiling.export(log)
+    with open(log) as fp:
+        lines = [json.loads(line) for line in fp]
+    assert lines[-1] == {'counters': {'items': 3}}
+    assert len(lines) == len(events) + 1
+
+
+def test_featurizer(clean):
+    from chemml.chem import Molecule, RDKitFingerprint
+    with profiling.profile():
+        RDKitFingerprint().represent([Molecule('CCO', 'smiles'), Molecule('CCN', 'smiles')])
+    assert 'RDKitFingerprint.represent' in profiling.summary().index
+    assert profiling.counters()['RDKitFingerprint.molecules'] == 2
@@ -71,3 +71,48 @@ def test_SavePlot(dummy_data, setup_teardown):
         'bbox_inches': 'tight'
     })
     sp.save(fig)
+
+
+@pytest.fixture()
+def large_data():
+    rng = np.random.RandomState(0)
+    x = pd.DataFrame(rng.randn(5000))
+    y = pd.DataFrame(0.8 * x.values + 0.3 * rng.randn(5000, 1))
+    return (x, y)
+
+
+def test_hexbin_counts(large_data):
+    import matplotlib.pyplot as plt
+    from chemml.visualization import hexbin_counts
+    x, y = large_data
+    cx, cy, counts, extent = hexbin_counts(x.values[:, 0], y.values[:, 0], (30, 17), chunksize=777)
+    assert counts.sum() == 5000
+    # the same cells as matplotlib
+    fig, ax = plt.subplots()
+    ref = np.asarray(ax.hexbin(x.values[:, 0], y.values[:, 0], gridsize=(30, 17)).get_array())
+    assert sorted(ref[ref > 0]) == sorted(counts)
+
+
+def test_density_modes(large_data, setup_teardown):
+    x, y = large_data
+    for mode in ['hexbin', 'hist2d']:
+        fig = scatter2D(mode=mode, gridsize=20, chunksize=1000).plot(x, y, 0, 0)
+        fig = decorator('density', xlabel='x', ylabel='y').fit(fig.axes[0])
+        SavePlot('density_%s' % mode, setup_teardown, 'pdf').save(fig)
+    # the auto mode switches to hexbin above the threshold
+    fig = scatter2D(threshold=1000).plot(x, y, 0, 0)
+    assert len(fig.axes[0].lines) == 0 and len(fig.axes[0].collections) == 1
+    fig = scatter2D().plot(x, y, 0, 0)
+    assert len(fig.axes[0].lines) == 1
+
+
+def test_chunked_hist_and_rasterization(large_data, setup_teardown):
+    from chemml.visualization import rasterize_large_artists
+    x, y = large_data
+    small = hist(20, 'g').plot(y, 0).axes[0].patches
+    large = hist(20, 'g', threshold=100, chunksize=1000).plot(y, 0).axes[0].patches
+    assert [p.get_height() for p in small] == [p.get_height() for p in large]
+    fig = scatter2D(mode='points').plot(x, y, 0, 0)
+    assert rasterize_large_artists(fig, threshold=10000) == []
+    assert len(rasterize_large_artists(fig, threshold=1000)) == 1
+    assert fig.axes[0].lines[0].get_rasterized()